@@ -0,0 +1,21 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Query
+from utils.responses import FastJSONResponse
+
+from utils.llm_usage import get_usage_summary
+from utils.cache_manager import get_cache_stats, sweep_cache
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/admin/llm-usage")
+def get_llm_usage(window_seconds: Optional[int] = Query(None, ge=1, description="집계 구간 (초), 기본값은 LLM_USAGE_WINDOW_SECONDS")):
+    """엔드포인트/호출 위치별 LLM 토큰 사용량 및 예상 비용 집계"""
+    return FastJSONResponse(content=get_usage_summary(window_seconds))
+
+@router.get("/admin/cache")
+def get_cache_status(sweep: bool = Query(False, description="true면 즉시 정리를 실행한 뒤 결과 반환")):
+    """cache_data/ 디렉터리 크기와 sweeper 삭제 통계"""
+    stats = sweep_cache() if sweep else get_cache_stats()
+    return FastJSONResponse(content=stats)
@@ -1,6 +1,6 @@
 import logging
 from fastapi import APIRouter, HTTPException
-from starlette.responses import JSONResponse
+from utils.responses import FastJSONResponse
 
 from core.schemas import JobAnalysisRequest, IndustryKeywordAnalysisRequest
 from services.openai_service import get_job_industry_summary, generate_industry_based_answer, generate_comparison_answer
@@ -61,7 +61,7 @@ async def analyze_job_industry(request: JobAnalysisRequest):
 
         if not summary:
             logger.warning(f"⚠️ 직무/산업 요약 결과 없음 또는 오류 발생 for query: {user_job_role}")
-            return JSONResponse(status_code=500, content={"error": "직무/산업 정보를 분석할 수 없습니다. 더 구체적인 질문을 해주세요."})
+            return FastJSONResponse(status_code=500, content={"error": "직무/산업 정보를 분석할 수 없습니다. 더 구체적인 질문을 해주세요."})
 
         logger.info(f"✅ 직무/산업 분석 완료. 요약 길이: {len(summary)}")
         return {
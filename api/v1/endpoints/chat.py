@@ -1,7 +1,7 @@
 import logging
 
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse
+from utils.responses import FastJSONResponse
 
 from core.schemas import TrendRequest
 from services.openai_service import extract_keyword_and_industry, generate_industry_based_answer, get_current_weekly_keywords, generate_keyword_trend_answer, generate_comparison_answer, generate_contextual_answer, get_gpt_commentary
@@ -16,10 +16,10 @@ async def chat(request: Request):
         data = await request.json()
         question = data.get("question") or data.get("message") or ""
         if not question:
-            return JSONResponse(content={"answer": "질문을 입력해주세요."})
+            return FastJSONResponse(content={"answer": "질문을 입력해주세요."})
         
-        keyword_info = extract_keyword_and_industry(question)
-        current_weekly_keywords = get_current_weekly_keywords() 
+        current_weekly_keywords = get_current_weekly_keywords()
+        keyword_info = extract_keyword_and_industry(question, current_weekly_keywords)
 
         answer = "답변을 생성할 수 없습니다."
 
@@ -43,10 +43,10 @@ async def chat(request: Request):
         else:
             answer = await generate_contextual_answer(question, current_weekly_keywords) 
 
-        return JSONResponse(content={"answer": answer})
+        return FastJSONResponse(content={"answer": answer})
     except Exception as e:
         logger.error(f"/chat 오류: {e}", exc_info=True)
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "answer": "챗봇 서비스에 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
         }, status_code=500)
 
@@ -56,7 +56,7 @@ async def generate_commentary_endpoint(req: TrendRequest):
     try:
         commentary = await get_gpt_commentary(req)
 
-        return JSONResponse(content={"comment": commentary})
+        return FastJSONResponse(content={"comment": commentary})
     except Exception as e:
         logger.error(f"Error in /api/v1/gpt-commentary endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to generate commentary.") 
\ No newline at end of file
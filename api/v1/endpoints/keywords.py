@@ -1,17 +1,19 @@
 import logging
-from typing import List
-from fastapi import APIRouter, Query, HTTPException
-from fastapi.responses import JSONResponse
+from typing import Any, Dict, List
+from fastapi import APIRouter, Query, HTTPException, Request
+from utils.responses import FastJSONResponse, cached_json_response
 
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from services.deepsearch_service import search_articles_by_keyword, search_global_keyword_articles, collect_it_news_from_deepsearch, fetch_tech_articles, fetch_global_tech_articles
-from services.openai_service import extract_keywords_with_gpt, extract_global_keywords_with_gpt, extract_keywords_with_gpt4o, analyze_keyword_dynamically
+from services.deepsearch_service import search_articles_by_keyword, search_global_keyword_articles, collect_it_news_from_deepsearch
+from services.openai_service import extract_keywords_with_gpt4o, analyze_keyword_dynamically
 from services.sample_service import get_sample_keywords_by_date, get_global_sample_keywords_by_date
-from utils.helpers import get_cache, set_cache
-from services.trending_service import get_news
+from utils.helpers import get_cache, get_cache_version, CACHE_MISS, CACHE_STALE
+from services.trending_service import get_news, get_trending_status
+from services import weekly_keywords_service
+from core.config import TRENDING_CACHE_CONTROL, WEEKLY_KEYWORDS_CACHE_CONTROL
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -63,7 +65,7 @@ async def get_keyword_articles_legacy(
         }
     except Exception as e:
         logger.error(f"/keyword-articles 오류: {e}", exc_info=True)
-        return JSONResponse(status_code=500, content={
+        return FastJSONResponse(status_code=500, content={
             "error": str(e),
             "keyword": keyword,
             "articles": [],
@@ -90,11 +92,11 @@ async def get_global_keyword_articles(
             "status": "success"
         }
         
-        return JSONResponse(content=response_data, media_type="application/json; charset=utf-8")
+        return FastJSONResponse(content=response_data, media_type="application/json; charset=utf-8")
         
     except Exception as e:
         logger.error(f"❌ 해외 키워드별 기사 검색 오류: {e}")
-        return JSONResponse(status_code=500, content={
+        return FastJSONResponse(status_code=500, content={
             "error": str(e),
             "keyword": keyword,
             "articles": [],
@@ -110,7 +112,7 @@ async def get_articles(start_date: str = "2025-07-14", end_date: str = "2025-07-
         articles = await collect_it_news_from_deepsearch(start_date, end_date)
         if not articles:
             logger.warning("기사 없음: DeepSearch API 결과 없음")
-            return JSONResponse(status_code=200, content={"articles": [], "message": "기사 없음", "total": 0})
+            return FastJSONResponse(status_code=200, content={"articles": [], "message": "기사 없음", "total": 0})
         summarized_articles = []
         for article in articles[:limit]:
             content = article.get("content", "")
@@ -131,7 +133,7 @@ async def get_articles(start_date: str = "2025-07-14", end_date: str = "2025-07-
         }
     except Exception as e:
         logger.error(f"/api/articles 오류: {e}", exc_info=True)
-        return JSONResponse(status_code=500, content={"error": str(e), "articles": [], "total": 0})
+        return FastJSONResponse(status_code=500, content={"error": str(e), "articles": [], "total": 0})
 
 @router.get("/keywords")
 async def get_weekly_keywords_endpoint(start_date: str = "2025-07-14", end_date: str = "2025-07-18"):
@@ -189,58 +191,53 @@ async def get_weekly_keywords_endpoint(start_date: str = "2025-07-14", end_date:
             ]
         }
 
+def _weekly_keywords_response(request: Request, region: str, start_date: str, end_date: str,
+                              result: Dict[str, Any], response_data: Dict[str, Any]):
+    """주별 캐시 버전이 그대로면 직렬화된 본문을 재사용하고 If-None-Match 일치 시 304
+
+    ETag는 주별 캐시 버전으로 만든 약한 ETag라서, 처음 계산한 응답(cached=false)과 이후 캐시 응답이 같은 값을 가집니다.
+    """
+    week_versions = tuple(get_cache_version(f"{region}_week_{week}") for week in result["weeks"])
+    if None in week_versions or result["sample_weeks"]:  # 캐시 저장 실패, 샘플 데이터 - 재사용 없이 그대로 응답
+        return FastJSONResponse(content=response_data, media_type="application/json; charset=utf-8")
+    stale = result["cache_state"] == CACHE_STALE
+    return cached_json_response(
+        request, f"weekly:{region}:{start_date}:{end_date}", (week_versions, result["cache_state"]),
+        lambda: response_data,
+        cache_control="no-cache" if stale else WEEKLY_KEYWORDS_CACHE_CONTROL,
+        weak_etag_seed=(region, start_date, end_date, week_versions, stale)
+    )
+
 @router.get("/weekly-keywords-by-date")
-async def get_weekly_keywords_by_date(start_date: str = Query(..., description="시작일 (YYYY-MM-DD)"),
+async def get_weekly_keywords_by_date(request: Request, start_date: str = Query(..., description="시작일 (YYYY-MM-DD)"),
                                end_date: str = Query(..., description="종료일 (YYYY-MM-DD)")):
-    """국내 날짜별 주간 키워드 반환 (프론트에서 요청하는 엔드포인트) - 캐싱 적용"""
+    """국내 날짜별 주간 키워드 반환 (프론트에서 요청하는 엔드포인트) - ISO 주 단위 캐싱 적용"""
     region = "domestic"
-    cache_key = f"{region}_{start_date}_{end_date}"
-    cached_result = get_cache(cache_key)
-
-    if cached_result:
-        logger.info(f"✅ 캐시된 국내 키워드 결과 사용: {cache_key}")
-        return JSONResponse(content={
-            "keywords": cached_result,
-            "date_range": f"{start_date} ~ {end_date}",
-            "total_count": len(cached_result),
-            "tech_articles_count": 0,
-            "region": region,
-            "status": "success",
-            "cached": True
-        }, media_type="application/json; charset=utf-8")
-
     try:
-        logger.info(f"📅 날짜별 국내 키워드 요청 (DeepSearch & GPT): {start_date} ~ {end_date}")
-        tech_articles = await fetch_tech_articles(start_date, end_date)
-        tech_articles_count = len(tech_articles)
-
-        if not tech_articles:
-            logger.warning(f"❌ 국내 Tech 기사 없음: {start_date} ~ {end_date}, 샘플 데이터 사용")
-            keywords = get_sample_keywords_by_date(start_date, end_date)
-        else:
-            extracted_keywords = await extract_keywords_with_gpt(tech_articles)
-            if extracted_keywords:
-                keywords = extracted_keywords[:5]
-            else:
-                logger.warning("❌ 국내 GPT 키워드 추출 실패, 샘플 데이터 사용")
-                keywords = get_sample_keywords_by_date(start_date, end_date)
-        
-        set_cache(cache_key, keywords)
+        result = await weekly_keywords_service.get_weekly_keywords(region, start_date, end_date)
+        keywords = result["keywords"]
+        if result["cache_state"] != CACHE_MISS:
+            logger.info(f"✅ 캐시된 국내 키워드 결과 사용 ({result['cache_state']}): {', '.join(result['weeks'])}")
 
         response_data = {
             "keywords": keywords,
             "date_range": f"{start_date} ~ {end_date}",
+            "canonical_range": result["canonical_range"],
+            "weeks": result["weeks"],
             "total_count": len(keywords),
-            "tech_articles_count": tech_articles_count,
+            "tech_articles_count": result["articles_count"],
             "region": region,
             "status": "success",
-            "cached": False
+            "cached": result["cache_state"] != CACHE_MISS,
+            "stale": result["cache_state"] == CACHE_STALE
         }
-        return JSONResponse(content=response_data, media_type="application/json; charset=utf-8")
+        return _weekly_keywords_response(request, region, start_date, end_date, result, response_data)
+    except weekly_keywords_service.InvalidDateRange as e:
+        return FastJSONResponse(status_code=400, content={"detail": str(e)})
     except Exception as e:
         logger.error(f"날짜별 국내 키워드 요청 오류: {e}", exc_info=True)
         keywords_on_error = get_sample_keywords_by_date(start_date, end_date)
-        return JSONResponse(status_code=500, content={
+        return FastJSONResponse(status_code=500, content={
             "error": str(e),
             "keywords": keywords_on_error,
             "date_range": f"{start_date} ~ {end_date}",
@@ -251,57 +248,35 @@ async def get_weekly_keywords_by_date(start_date: str = Query(..., description="
         })
 
 @router.get("/global-weekly-keywords-by-date")
-async def get_global_weekly_keywords_by_date(start_date: str = Query(..., description="시작일 (YYYY-MM-DD)"), 
+async def get_global_weekly_keywords_by_date(request: Request, start_date: str = Query(..., description="시작일 (YYYY-MM-DD)"), 
                                end_date: str = Query(..., description="종료일 (YYYY-MM-DD)")):
-    """해외 날짜별 주간 키워드 반환 (프론트에서 요청하는 엔드포인트) - 캐싱 적용"""
+    """해외 날짜별 주간 키워드 반환 (프론트에서 요청하는 엔드포인트) - ISO 주 단위 캐싱 적용"""
     region = "global"
-    cache_key = f"{region}_{start_date}_{end_date}"
-    cached_result = get_cache(cache_key)
-
-    if cached_result:
-        logger.info(f"✅ 캐시된 해외 키워드 결과 사용: {cache_key}")
-        return JSONResponse(content={
-            "keywords": cached_result,
-            "date_range": f"{start_date} ~ {end_date}",
-            "total_count": len(cached_result),
-            "global_tech_articles_count": 0,
-            "region": region,
-            "status": "success",
-            "cached": True
-        }, media_type="application/json; charset=utf-8")
-
     try:
-        logger.info(f"🌍 해외 날짜별 키워드 요청 (DeepSearch & GPT): {start_date} ~ {end_date}")
-        global_tech_articles = await fetch_global_tech_articles(start_date, end_date)
-        global_tech_articles_count = len(global_tech_articles)
-
-        if not global_tech_articles:
-            logger.warning(f"❌ 해외 Tech 기사 없음: {start_date} ~ {end_date}, 샘플 데이터 사용")
-            keywords = get_global_sample_keywords_by_date(start_date, end_date)
-        else:
-            extracted_keywords = await extract_global_keywords_with_gpt(global_tech_articles)
-            if extracted_keywords:
-                keywords = extracted_keywords[:5]
-            else:
-                logger.warning("❌ 해외 GPT 키워드 추출 실패, 샘플 데이터 사용")
-                keywords = get_global_sample_keywords_by_date(start_date, end_date)
-        
-        set_cache(cache_key, keywords)
+        result = await weekly_keywords_service.get_weekly_keywords(region, start_date, end_date)
+        keywords = result["keywords"]
+        if result["cache_state"] != CACHE_MISS:
+            logger.info(f"✅ 캐시된 해외 키워드 결과 사용 ({result['cache_state']}): {', '.join(result['weeks'])}")
 
         response_data = {
             "keywords": keywords,
             "date_range": f"{start_date} ~ {end_date}",
+            "canonical_range": result["canonical_range"],
+            "weeks": result["weeks"],
             "total_count": len(keywords),
-            "global_tech_articles_count": global_tech_articles_count,
+            "global_tech_articles_count": result["articles_count"],
             "region": region,
             "status": "success",
-            "cached": False
+            "cached": result["cache_state"] != CACHE_MISS,
+            "stale": result["cache_state"] == CACHE_STALE
         }
-        return JSONResponse(content=response_data, media_type="application/json; charset=utf-8")
+        return _weekly_keywords_response(request, region, start_date, end_date, result, response_data)
+    except weekly_keywords_service.InvalidDateRange as e:
+        return FastJSONResponse(status_code=400, content={"detail": str(e)})
     except Exception as e:
         logger.error(f"해외 날짜별 키워드 요청 오류: {e}", exc_info=True)
         keywords_on_error = get_global_sample_keywords_by_date(start_date, end_date)
-        return JSONResponse(status_code=500, content={
+        return FastJSONResponse(status_code=500, content={
             "error": str(e),
             "keywords": keywords_on_error,
             "date_range": f"{start_date} ~ {end_date}",
@@ -319,13 +294,13 @@ def get_weekly_keywords():
             "keywords": ["인공지능", "반도체", "기술혁신"],
             "week_info": "7월 3주차 (2025.07.14~07.18) - AI 뉴스 분석"
         }
-        return JSONResponse(content=response_data, media_type="application/json; charset=utf-8")
+        return FastJSONResponse(content=response_data, media_type="application/json; charset=utf-8")
     except Exception as e:
         response_data = {
             "keywords": ["인공지능", "반도체", "기업"],
             "week_info": "7월 3주차 (2025.07.14~07.18) - AI 뉴스 분석"
         }
-        return JSONResponse(content=response_data, media_type="application/json; charset=utf-8")
+        return FastJSONResponse(content=response_data, media_type="application/json; charset=utf-8")
 
 @router.post("/keyword-analysis")
 def post_keyword_analysis(request: dict):
@@ -333,21 +308,32 @@ def post_keyword_analysis(request: dict):
     return analyze_keyword_dynamically(request) 
 
 @router.get("/trending")
-def get_trending_keywords():
+def get_trending_keywords(request: Request):
     """실시간 트렌딩 키워드 반환 (캐시된 데이터)"""
-    cached_data = get_cache(TRENDING_CACHE_KEY)
+    # 트렌딩 스냅샷은 변경이 있을 때만 다시 쓰이므로 파일 TTL로 만료시키지 않음
+    # 스냅샷 버전과 상태가 같으면 이전에 직렬화/압축한 본문을 그대로 전송
+    version = get_cache_version(TRENDING_CACHE_KEY)
+    # 버전 확인 후 sweeper 등으로 스냅샷이 지워졌을 수 있으므로 값도 확인
+    snapshot = get_cache(TRENDING_CACHE_KEY, expiry_seconds=None) if version is not None else None
 
-    if cached_data:
-        return JSONResponse(content=cached_data)
+    if snapshot is not None:
+        status = get_trending_status()
+        # ETag는 스냅샷 버전으로만 만듦 (shard 갱신마다 바뀌는 stale/refreshing 표시로 304 재검증이 깨지지 않도록)
+        return cached_json_response(
+            request, "trending", (version, status["stale"], status["refreshing"]),
+            lambda: {**snapshot, "stale": status["stale"], "refreshing": status["refreshing"]},
+            cache_control="no-cache" if status["stale"] else TRENDING_CACHE_CONTROL,
+            weak_etag_seed=("trending", version)
+        )
     else:
-        return JSONResponse(content={"status": "caching", "data": []}, status_code=202)
+        return FastJSONResponse(content={"status": "caching", "data": []}, status_code=202, headers={"Cache-Control": "no-store"})
 
 @router.get("/news")
-def get_news_endpoint(country: str, keyword: str):
+async def get_news_endpoint(country: str, keyword: str):
     """특정 국가 및 키워드에 대한 뉴스 기사 반환"""
     try:
-        articles = get_news(country, keyword)
-        return JSONResponse(content={"news": articles})
+        articles = await get_news(country, keyword)
+        return FastJSONResponse(content={"news": articles})
     except Exception as e:
         logger.error(f"Error in /api/v1/news endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch news articles.")
\ No newline at end of file
@@ -1,11 +1,20 @@
-import logging
 import asyncio
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from utils.responses import FastJSONResponse
 
-from core.schemas import SubscriptionRequest, EmailInsightRequest
-from services.email_service import load_subscribers, save_subscribers, send_email, get_weekly_keywords_data
-from services.openai_service import generate_weekly_insight
+from core.schemas import SubscriptionRequest, SegmentUpdateRequest, EmailInsightRequest
+from services.email_service import send_email
+from services.subscriber_store import (
+    add_subscriber, get_subscriber, update_subscriber_segments, list_subscribers, iter_subscribers, iter_active_subscribers,
+    count_subscribers, SUBSCRIBERS_PAGE_MAX
+)
+from services.digest_service import (
+    DIGEST_SEGMENTS, DEFAULT_DIGEST_SEGMENTS, segment_variant, get_weekly_digest, render_digest,
+    build_digest_contents, prepare_weekly_digest_in_background
+)
+from services.email_outbox import start_email_job, get_email_job
 from core.config import EMAIL_USER, EMAIL_PASSWORD
 
 logger = logging.getLogger(__name__)
@@ -15,60 +24,92 @@ router = APIRouter()
 async def subscribe_email_endpoint(subscription: SubscriptionRequest):
     """이메일 구독 API"""
     try:
-        email = subscription.email
-        subscribers = load_subscribers()
-        
-        for subscriber in subscribers:
-            if subscriber.get("email") == email:
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": "이미 구독된 이메일입니다."}
-                )
-        
-        from datetime import datetime
-        new_subscriber = {
-            "email": email,
-            "subscribed_at": datetime.now().isoformat(),
-            "active": True
-        }
-        
-        subscribers.append(new_subscriber)
-        
-        if save_subscribers(subscribers):
-            logger.info(f"✅ 새 구독자 추가: {email}")
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "message": "구독이 완료되었습니다!",
-                    "email": email
-                }
+        try:
+            subscriber = await asyncio.to_thread(add_subscriber, subscription.email, subscription.segments)
+        except ValueError as e:
+            return FastJSONResponse(status_code=400, content={"detail": str(e)})
+        if subscriber is None:
+            return FastJSONResponse(
+                status_code=400,
+                content={"detail": "이미 구독된 이메일입니다."}
             )
-        else:
-            raise HTTPException(status_code=500, detail="구독 저장 중 오류가 발생했습니다.")
+        
+        logger.info(f"✅ 새 구독자 추가: {subscriber['email']}")
+        return FastJSONResponse(
+            status_code=200,
+            content={
+                "message": "구독이 완료되었습니다!",
+                "email": subscriber["email"],
+                "segments": subscriber["segments"]
+            }
+        )
             
     except Exception as e:
         logger.error(f"❌ 구독 오류: {e}")
         raise HTTPException(status_code=500, detail=f"구독 처리 중 오류: {str(e)}")
 
+@router.get("/digest-segments")
+async def get_digest_segments():
+    """구독 시 선택할 수 있는 관심 분야 목록"""
+    return {
+        "segments": [{"key": key, "title": segment.title} for key, segment in DIGEST_SEGMENTS.items()],
+        "default": list(DEFAULT_DIGEST_SEGMENTS)
+    }
+
+@router.put("/subscribers/{email}/segments")
+async def update_segments(email: str, request: SegmentUpdateRequest):
+    """구독자의 관심 분야 변경"""
+    try:
+        subscriber = await asyncio.to_thread(update_subscriber_segments, email, request.segments)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if subscriber is None:
+        raise HTTPException(status_code=404, detail="구독 정보를 찾을 수 없습니다.")
+    return subscriber
+
 @router.get("/subscribers")
-async def get_subscribers():
-    """구독자 목록 조회 API"""
+async def get_subscribers(
+    limit: Optional[int] = Query(None, ge=1, le=SUBSCRIBERS_PAGE_MAX),
+    cursor: Optional[int] = Query(None, ge=0, description="이전 페이지의 next_cursor")
+):
+    """구독자 목록 조회 API
+
+    기본은 예전과 같은 전체 구독자 배열이고, limit 또는 cursor를 주면 id 순 페이지
+    ({"subscribers", "next_cursor", "total"})로 반환합니다.
+    """
     try:
-        subscribers = load_subscribers()
-        return JSONResponse(
+        if limit is None and cursor is None:
+            subscribers = await asyncio.to_thread(lambda: list(iter_subscribers()))
+            return FastJSONResponse(status_code=200, content=subscribers)
+
+        subscribers, next_cursor = await asyncio.to_thread(list_subscribers, limit or 100, cursor or 0)
+        total = await asyncio.to_thread(count_subscribers)
+        return FastJSONResponse(
             status_code=200,
-            content=subscribers
+            content={
+                "subscribers": subscribers,
+                "next_cursor": next_cursor,
+                "total": total
+            }
         )
     except Exception as e:
         logger.error(f"❌ 구독자 목록 조회 오류: {e}")
         raise HTTPException(status_code=500, detail=f"구독자 목록 조회 중 오류: {str(e)}")
 
+def _digest_not_ready_response():
+    prepare_weekly_digest_in_background()
+    return FastJSONResponse(
+        status_code=503,
+        headers={"Retry-After": "60"},
+        content={"detail": "이번 주 다이제스트를 준비 중입니다. 잠시 후 다시 시도해주세요."}
+    )
+
 @router.post("/send-insights")
 async def send_weekly_insights(request: EmailInsightRequest):
-    """주간 인사이트 이메일 발송 API (수동 발송용)"""
+    """주간 인사이트 이메일 발송 API (수동 발송용, 미리 준비된 다이제스트 사용)"""
     try:
         if not EMAIL_USER or not EMAIL_PASSWORD:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=500,
                 content={
                     "error": "이메일 설정이 필요합니다",
@@ -77,15 +118,20 @@ async def send_weekly_insights(request: EmailInsightRequest):
                 }
             )
         
+        digest = await asyncio.to_thread(get_weekly_digest)
+        if digest is None:
+            return _digest_not_ready_response()
+
         email = request.email
-        keywords_data = await get_weekly_keywords_data()
-        insight_content = await generate_weekly_insight(keywords_data)
-        success = await send_email(email, "📊 주간 AI 뉴스 인사이트", insight_content)
+        subscriber = await asyncio.to_thread(get_subscriber, email)
+        segments = subscriber["segments"] if subscriber else DEFAULT_DIGEST_SEGMENTS
+        content = render_digest(segment_variant(segments).split(","), digest)
+        success = await send_email(email, "📊 주간 AI 뉴스 인사이트", content)
         
         if success:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=200,
-                content={"message": f"인사이트가 {email}로 발송되었습니다."}
+                content={"message": f"인사이트가 {email}로 발송되었습니다.", "week": digest["week"]}
             )
         else:
             raise HTTPException(status_code=500, detail="이메일 발송 실패")
@@ -96,50 +142,58 @@ async def send_weekly_insights(request: EmailInsightRequest):
 
 @router.post("/send-to-all-subscribers")
 async def send_to_all_subscribers():
-    """모든 구독자에게 주간 인사이트 발송"""
+    """모든 구독자에게 주간 인사이트 발송 (outbox에 등록 후 작업 ID를 바로 반환)
+
+    스케줄러가 미리 만들어 둔 다이제스트의 분야별 섹션을 구독자마다 선택한 분야대로 조합해 보냅니다.
+    """
     try:
-        subscribers = load_subscribers()
-        active_subscribers = [s for s in subscribers if s.get("active", True)]
+        if not EMAIL_USER or not EMAIL_PASSWORD:
+            return FastJSONResponse(
+                status_code=500,
+                content={
+                    "error": "이메일 설정이 필요합니다",
+                    "detail": ".env 파일에 EMAIL_USER와 EMAIL_PASSWORD를 설정해주세요."
+                }
+            )
+
+        digest = await asyncio.to_thread(get_weekly_digest)
+        if digest is None:
+            return _digest_not_ready_response()
+
+        recipients = await asyncio.to_thread(
+            lambda: [(s["email"], segment_variant(s["segments"])) for s in iter_active_subscribers()]
+        )
         
-        if not active_subscribers:
-            return JSONResponse(
+        if not recipients:
+            return FastJSONResponse(
                 status_code=200,
                 content={"message": "활성 구독자가 없습니다.", "sent_count": 0}
             )
         
-        keywords_data = await get_weekly_keywords_data()
-        insight_content = await generate_weekly_insight(keywords_data)
-        
-        sent_count = 0
-        failed_count = 0
-        
-        for subscriber in active_subscribers:
-            email = subscriber.get("email")
-            try:
-                success = await send_email(email, "📊 주간 AI 뉴스 인사이트", insight_content)
-                if success:
-                    sent_count += 1
-                    logger.info(f"✅ 발송 성공: {email}")
-                else:
-                    failed_count += 1
-                    logger.warning(f"❌ 발송 실패: {email}")
-                    
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"❌ {email} 발송 오류: {e}")
+        async def prepare_contents():
+            return build_digest_contents((variant for _, variant in recipients), digest)
+
+        job_id = start_email_job("📊 주간 AI 뉴스 인사이트", recipients, prepare_contents)
         
-        return JSONResponse(
-            status_code=200,
+        return FastJSONResponse(
+            status_code=202,
             content={
-                "message": f"발송 완료: 성공 {sent_count}건, 실패 {failed_count}건",
-                "sent_count": sent_count,
-                "failed_count": failed_count,
-                "total_subscribers": len(active_subscribers)
+                "message": "발송 작업이 등록되었습니다.",
+                "job_id": job_id,
+                "week": digest["week"],
+                "status_url": f"/api/v1/email-jobs/{job_id}",
+                "total_subscribers": len(recipients)
             }
         )
         
     except Exception as e:
         logger.error(f"❌ 전체 발송 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"전체 발송 중 오류: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"전체 발송 중 오류: {str(e)}")
+
+@router.get("/email-jobs/{job_id}")
+async def get_email_job_status(job_id: str):
+    """발송 작업 진행 상황 조회 (수신자 상태별 건수와 실패한 수신자)"""
+    job = await asyncio.to_thread(get_email_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="발송 작업을 찾을 수 없습니다.")
+    return job
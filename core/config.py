@@ -33,6 +33,14 @@ EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+# STARTTLS 필수 여부 (false는 로컬 테스트 서버용, 계정 정보가 설정되어 있으면 항상 STARTTLS 사용)
+EMAIL_SMTP_REQUIRE_TLS = os.getenv("EMAIL_SMTP_REQUIRE_TLS", "true").lower() != "false"
+# 재사용할 SMTP 연결 수(= 동시 발송 수), 연결당 최대 발송 건수, 일시적 오류 재시도 횟수, 속도 제한 시 최대 발송 간격(초)
+EMAIL_SMTP_POOL_SIZE = int(os.getenv("EMAIL_SMTP_POOL_SIZE", 4))
+EMAIL_SMTP_TIMEOUT_SECONDS = int(os.getenv("EMAIL_SMTP_TIMEOUT_SECONDS", 30))
+EMAIL_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("EMAIL_MAX_MESSAGES_PER_CONNECTION", 100))
+EMAIL_SEND_MAX_RETRIES = int(os.getenv("EMAIL_SEND_MAX_RETRIES", 3))
+EMAIL_PACING_MAX_DELAY_SECONDS = float(os.getenv("EMAIL_PACING_MAX_DELAY_SECONDS", 30))
 
 # Azure AI Search (NCS) 설정
 AZURE_SEARCH_ENDPOINT_NCS = os.getenv("AZURE_SEARCH_ENDPOINT")
@@ -87,7 +95,91 @@ DEEPSEARCH_GLOBAL_KEYWORD_URL = "https://api-v2.deepsearch.com/v1/global-article
 
 # 캐시 설정
 CACHE_EXPIRY_MINUTES = 30
-MAX_CACHE_SIZE = 1000
+MAX_CACHE_SIZE = 1000  # cache_data/ 안의 최대 캐시 파일 개수
+# stale-while-revalidate: 만료 후 이 시간(초)까지는 이전 값을 즉시 제공하고 백그라운드에서 갱신
+CACHE_MAX_STALE_SECONDS = int(os.getenv("CACHE_MAX_STALE_SECONDS", 6 * 60 * 60))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 256 * 1024 * 1024))
+CACHE_SWEEP_INTERVAL_SECONDS = int(os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", 5 * 60))
+# 임베딩 벡터 캐시(cache_data/embeddings/, 캐시 백엔드와 무관하게 로컬 디스크) 최대 용량(바이트) 및 메모리 보관 개수
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+EMBEDDING_MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_MEMORY_CACHE_MAX_ENTRIES", 10000))
+# 주간 키워드 캐시는 ISO 주(월~일) 단위로 저장
+# 요청 기간과 이 일수 이상 겹치는 주만 사용 (가장자리에 하루만 걸친 주는 제외), 한 번에 조회 가능한 최대 주 수
+WEEK_BUCKET_MIN_OVERLAP_DAYS = int(os.getenv("WEEK_BUCKET_MIN_OVERLAP_DAYS", 2))
+WEEKLY_KEYWORDS_MAX_WEEKS = int(os.getenv("WEEKLY_KEYWORDS_MAX_WEEKS", 8))
+# 캐시 저장소: file (cache_data/, 한 호스트) / redis (여러 API 노드가 공유, redis 패키지 필요)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file").lower()
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_REDIS_PREFIX = os.getenv("CACHE_REDIS_PREFIX", "news_gpt:")
+# 캐시 파일 포맷: json (orjson 설치 시 사용) / msgpack (msgpack 설치 필요)
+CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "json").lower()
+# 압축: none / gzip / zstd (zstandard 설치 필요), 이 크기(바이트) 이상인 값만 압축
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "gzip").lower()
+CACHE_COMPRESSION_MIN_BYTES = int(os.getenv("CACHE_COMPRESSION_MIN_BYTES", 64 * 1024))
 
-# 구독자 파일
-SUBSCRIBERS_FILE = "subscribers.json" 
\ No newline at end of file
+# 예전 구독자 파일 (최초 사용 시 DATABASE_PATH의 subscribers 테이블로 한 번 이전)
+SUBSCRIBERS_FILE = "subscribers.json" 
+
+# SQLite 데이터베이스 (이메일 outbox 등, 여러 워커가 WAL 모드로 공유)
+DATABASE_PATH = os.getenv("DATABASE_PATH", "news_gpt.db")
+# 이메일 outbox: 워커 폴링 주기(초), 한 번에 점유할 메시지 수, 점유 후 이 시간(초)이 지나면 중단된 것으로 보고 재발송
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 5))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+# 일시적 오류 시 수신자별 최대 시도 횟수 및 재시도 대기(초, 시도마다 두 배)
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 60))
+# HTTP 응답 압축: 이 크기(바이트) 이상인 텍스트/JSON 응답만 압축 (brotli는 brotli 패키지 설치 시 사용)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", 1024))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 5))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", 4))
+# 정적 페이지/스냅샷 JSON처럼 한 번 압축해 메모리에 두는 본문은 높은 압축률 사용
+PRECOMPRESSED_GZIP_LEVEL = int(os.getenv("PRECOMPRESSED_GZIP_LEVEL", 9))
+PRECOMPRESSED_BROTLI_QUALITY = int(os.getenv("PRECOMPRESSED_BROTLI_QUALITY", 9))
+
+# 폴링되는 엔드포인트의 Cache-Control (ETag로 재검증, stale 데이터는 no-cache로 바로 재검증하게 함)
+TRENDING_CACHE_CONTROL = os.getenv("TRENDING_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=300")
+WEEKLY_KEYWORDS_CACHE_CONTROL = os.getenv("WEEKLY_KEYWORDS_CACHE_CONTROL", "public, max-age=300, stale-while-revalidate=3600")
+
+# 주간 다이제스트 사전 생성 시각 (매주 이 요일/시각에 지난주 다이제스트 준비) 및 보관 주 수
+DIGEST_PREPARE_DAY_OF_WEEK = os.getenv("DIGEST_PREPARE_DAY_OF_WEEK", "mon")
+DIGEST_PREPARE_HOUR = int(os.getenv("DIGEST_PREPARE_HOUR", 6))
+DIGEST_KEEP_WEEKS = int(os.getenv("DIGEST_KEEP_WEEKS", 4))
+# 지난주 다이제스트가 없을 때(준비 실패 등) 다시 시도하는 간격(초)
+DIGEST_RETRY_INTERVAL_SECONDS = int(os.getenv("DIGEST_RETRY_INTERVAL_SECONDS", 30 * 60))
+
+# LLM 사용량 집계 설정 (비용 단가: 100만 토큰당 USD)
+LLM_USAGE_WINDOW_SECONDS = int(os.getenv("LLM_USAGE_WINDOW_SECONDS", 3600))
+LLM_USAGE_MAX_RECORDS = int(os.getenv("LLM_USAGE_MAX_RECORDS", 10000))
+LLM_PROMPT_COST_PER_1M = float(os.getenv("LLM_PROMPT_COST_PER_1M", 2.5))
+LLM_CACHED_PROMPT_COST_PER_1M = float(os.getenv("LLM_CACHED_PROMPT_COST_PER_1M", 1.25))
+LLM_COMPLETION_COST_PER_1M = float(os.getenv("LLM_COMPLETION_COST_PER_1M", 10.0))
+
+# Google Trends 크롤링 설정
+# 수집 국가 (쉼표 구분), shard 크기, shard별 시간 예산(초)
+TRENDING_COUNTRY_CODES = [c.strip().upper() for c in os.getenv("TRENDING_COUNTRY_CODES", "KR,US,MX,GB,IN,ZA,AU").split(",") if c.strip()]
+TRENDING_SHARD_SIZE = int(os.getenv("TRENDING_SHARD_SIZE", 8))
+TRENDING_SHARD_BUDGET_SECONDS = int(os.getenv("TRENDING_SHARD_BUDGET_SECONDS", 120))
+TRENDING_BROWSER_POOL_SIZE = int(os.getenv("TRENDING_BROWSER_POOL_SIZE", 2))
+TRENDING_PAGE_TIMEOUT_SECONDS = int(os.getenv("TRENDING_PAGE_TIMEOUT_SECONDS", 15))
+# 트렌딩 수집 방식: "http" (RSS 우선, 실패 시 브라우저) 또는 "browser" (Selenium만 사용)
+TRENDING_FETCH_MODE = os.getenv("TRENDING_FETCH_MODE", "http").lower()
+TRENDING_RSS_URL = os.getenv("TRENDING_RSS_URL", "https://trends.google.com/trending/rss")
+# 마지막 갱신 성공 후 이 시간(초)이 지나면 스냅샷을 stale로 표시
+TRENDING_STALE_SECONDS = int(os.getenv("TRENDING_STALE_SECONDS", 2 * 60 * 60))
+
+# 임베딩 모델 설정 (Tesla/테슬라 같은 다국어 표기를 비교하므로 다국어 모델 사용)
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
+
+# 공유 키워드 탐지 임계값 (코사인 유사도)
+# ACCEPT 초과: 자동 병합 / REVIEW~ACCEPT: LLM 판정 후보 / REVIEW 이하: 무시
+SHARED_KEYWORD_ACCEPT_THRESHOLD = float(os.getenv("SHARED_KEYWORD_ACCEPT_THRESHOLD", 0.85))
+SHARED_KEYWORD_REVIEW_THRESHOLD = float(os.getenv("SHARED_KEYWORD_REVIEW_THRESHOLD", 0.5))
+SHARED_KEYWORD_MAX_LLM_PAIRS = int(os.getenv("SHARED_KEYWORD_MAX_LLM_PAIRS", 60))
+
+# Google News RSS 설정
+# 트렌딩 키워드 뉴스는 shard 갱신(매시간)마다 새로 받아 캐시하므로 TTL은 갱신 주기보다 길게 유지
+NEWS_CACHE_TTL_SECONDS = int(os.getenv("NEWS_CACHE_TTL_SECONDS", 2 * 60 * 60))
+NEWS_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", 2000))
+NEWS_FETCH_TIMEOUT_SECONDS = int(os.getenv("NEWS_FETCH_TIMEOUT_SECONDS", 10))
+NEWS_PREFETCH_CONCURRENCY = int(os.getenv("NEWS_PREFETCH_CONCURRENCY", 10))
@@ -0,0 +1,65 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from core.config import DATABASE_PATH
+
+_schema_lock = threading.Lock()
+_initialized_schemas = set()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DATABASE_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    # WAL: 읽기와 쓰기가 서로 막지 않음, 여러 워커가 같은 파일을 공유
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+@contextmanager
+def get_connection():
+    """SQLite 연결 (autocommit, 필요하면 transaction()으로 묶어서 사용)"""
+    conn = _connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, immediate: bool = False):
+    """BEGIN ... COMMIT 트랜잭션 (immediate=True 면 시작 시점에 쓰기 잠금을 잡아 다른 워커와 경합 방지)"""
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def ensure_schema(name: str, statements: str):
+    """모듈별 테이블/인덱스를 프로세스당 한 번 생성"""
+    if name in _initialized_schemas:
+        return
+    with _schema_lock:
+        if name in _initialized_schemas:
+            return
+        with get_connection() as conn:
+            conn.executescript(statements)
+        _initialized_schemas.add(name)
+
+
+def ensure_column(table: str, column: str, definition: str):
+    """기존 DB에 없는 컬럼을 추가 (스키마 확장 시 이미 만들어진 테이블용)"""
+    with get_connection() as conn:
+        columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column in columns:
+            return
+        try:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        except sqlite3.OperationalError as e:
+            if "duplicate column" not in str(e):  # 다른 워커가 먼저 추가
+                raise
@@ -3,6 +3,10 @@ from typing import List, Optional
 
 class SubscriptionRequest(BaseModel):
     email: str
+    segments: Optional[List[str]] = None  # 관심 분야 (없으면 국내/해외)
+
+class SegmentUpdateRequest(BaseModel):
+    segments: List[str]
 
 class EmailInsightRequest(BaseModel):
     email: str
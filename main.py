@@ -1,13 +1,24 @@
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from api.api_router import router as api_router
-from services.trending_service import cache_google_tranding
+from services.trending_service import cache_google_tranding, get_country_shards, get_trending_status, close_news_client
+from core.config import (
+    TRENDING_COUNTRY_CODES, TRENDING_SHARD_SIZE, TRENDING_SHARD_BUDGET_SECONDS, CACHE_SWEEP_INTERVAL_SECONDS,
+    DIGEST_PREPARE_DAY_OF_WEEK, DIGEST_PREPARE_HOUR, DIGEST_RETRY_INTERVAL_SECONDS,
+)
+from services.browser_pool import close_browser_pool
+from services.smtp_pool import close_smtp_sender
+from services.email_outbox import start_outbox_worker, stop_outbox_worker
+from services.digest_service import prepare_weekly_digest_job, prepare_missing_weekly_digest_job
+from utils.llm_usage import current_request_scope
+from utils.cache_manager import sweep_cache
+from utils.responses import FastJSONResponse, CompressionMiddleware, static_page_response
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,24 +33,67 @@ async def lifespan(_: FastAPI):
     # 서버 시작 시 실행
     logger.info("🚀 서버 시작: 스케줄러를 가동합니다.")
     
-    country_codes = ['KR', 'US', 'MX', 'GB', 'IN', 'ZA', 'AU']
-    cache_google_tranding(country_codes)
-
+    # 초기 트렌딩 수집은 백그라운드에서 실행하고, 그동안은 저장된 스냅샷을 stale로 제공
     scheduler = BackgroundScheduler()
-    scheduler.add_job(cache_google_tranding, trigger="cron", minute=0, args=[country_codes])
+    scheduler.add_job(cache_google_tranding, args=[TRENDING_COUNTRY_CODES], id="trending_initial_refresh")
+
+    # 국가를 shard로 나눠 한 시간 동안 고르게 분산 갱신 (shard별 시간 예산 적용)
+    shards = get_country_shards(TRENDING_COUNTRY_CODES, TRENDING_SHARD_SIZE)
+    for i, shard in enumerate(shards):
+        scheduler.add_job(
+            cache_google_tranding,
+            trigger="cron",
+            minute=i * 60 // len(shards),
+            args=[shard],
+            kwargs={"time_budget": TRENDING_SHARD_BUDGET_SECONDS},
+            id=f"trending_shard_{i}",
+        )
+    logger.info(f"🗺️ 트렌딩 갱신: {len(TRENDING_COUNTRY_CODES)}개 국가, {len(shards)}개 shard")
+
+    # cache_data/ 크기 제한: 만료 → LRU 순으로 주기적으로 정리
+    scheduler.add_job(sweep_cache, trigger="interval", seconds=CACHE_SWEEP_INTERVAL_SECONDS, id="cache_sweeper")
+
+    # 주간 다이제스트는 발송 전에 미리 생성
+    # 지난주 것이 없으면 시작 직후, 그리고 준비에 실패했으면 DIGEST_RETRY_INTERVAL_SECONDS마다 다시 시도
+    scheduler.add_job(
+        prepare_weekly_digest_job,
+        trigger="cron",
+        day_of_week=DIGEST_PREPARE_DAY_OF_WEEK,
+        hour=DIGEST_PREPARE_HOUR,
+        id="weekly_digest_prepare",
+    )
+    scheduler.add_job(
+        prepare_missing_weekly_digest_job,
+        trigger="interval",
+        seconds=DIGEST_RETRY_INTERVAL_SECONDS,
+        next_run_time=datetime.now(),
+        id="weekly_digest_retry",
+    )
     scheduler.start()
+
+    # 구독자 메일 outbox 발송 워커 (재시작 시 마지막으로 확인된 메시지 이후부터 재개)
+    start_outbox_worker()
     
     yield
-    # 서버 종료 시 실행 (필요 시 추가)
+    # 서버 종료 시 실행
+    scheduler.shutdown(wait=False)
+    await stop_outbox_worker()
+    close_browser_pool()
+    close_smtp_sender()
+    await close_news_client()
     logger.info("✅ 서버 종료")
 
 # FastAPI 앱 인스턴스 생성
 app = FastAPI(
     title="News GPT v2 Backend", 
     description="AI 뉴스 키워드 분석 백엔드 API 서버", 
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# 응답 압축 (gzip, brotli 설치 시 br) - 일정 크기 이상의 텍스트/JSON만
+app.add_middleware(CompressionMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -49,40 +103,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def tag_llm_usage_endpoint(request: Request, call_next):
+    """LLM 사용량 집계를 위해 현재 요청을 컨텍스트에 기록"""
+    token = current_request_scope.set(request.scope)
+    try:
+        return await call_next(request)
+    finally:
+        current_request_scope.reset(token)
+
+# ============================================================================
+# 헬스 체크 (liveness / readiness)
+# ============================================================================
+
+@app.get("/health/live")
+async def liveness():
+    """프로세스 생존 여부 (항상 200)"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """트래픽 수신 가능 여부: ready(최신) / stale(이전 스냅샷 제공 중) / not_ready(스냅샷 없음)"""
+    status = get_trending_status()
+    if not status["has_snapshot"]:
+        return FastJSONResponse(status_code=503, content={"status": "not_ready", **status})
+    return {"status": "stale" if status["stale"] else "ready", **status}
+
 # ============================================================================
 # LEGACY: 프론트엔드 정적 파일 서빙 (TODO: 제거 예정)
 # 프론트엔드는 별도 저장소로 분리되었습니다: https://github.com/J1STAR/news-gpt-frontend
 # ============================================================================
 
 @app.get("/")
-async def serve_home():
+async def serve_home(request: Request):
     """LEGACY: 메인 페이지 제공 (프론트엔드 분리로 인해 제거 예정)"""
     logger.warning("LEGACY: 프론트엔드 파일 서빙 - 별도 저장소로 분리됨")
-    return FileResponse("index.html")
+    return static_page_response(request, "index.html")
 
 @app.get("/analysis.html")
-async def serve_analysis():
+async def serve_analysis(request: Request):
     """LEGACY: 상세 분석 페이지 제공 (프론트엔드 분리로 인해 제거 예정)"""
     logger.warning("LEGACY: 프론트엔드 파일 서빙 - 별도 저장소로 분리됨")
-    return FileResponse("analysis.html")
+    return static_page_response(request, "analysis.html")
 
 @app.get("/news-detail.html")
-async def serve_news_detail():
+async def serve_news_detail(request: Request):
     """LEGACY: 뉴스 상세 페이지 제공 (프론트엔드 분리로 인해 제거 예정)"""
     logger.warning("LEGACY: 프론트엔드 파일 서빙 - 별도 저장소로 분리됨")
-    return FileResponse("news-detail.html")
+    return static_page_response(request, "news-detail.html")
 
 @app.get("/trending.html")
-async def serve_trending():
+async def serve_trending(request: Request):
     """LEGACY: 트렌딩 페이지 제공 (프론트엔드 분리로 인해 제거 예정)"""
     logger.warning("LEGACY: 프론트엔드 파일 서빙 - 별도 저장소로 분리됨")
-    return FileResponse("trending.html")
+    return static_page_response(request, "trending.html")
 
 @app.get("/admin.html")
-async def serve_admin():
+async def serve_admin(request: Request):
     """LEGACY: 관리자 페이지 제공 (프론트엔드 분리로 인해 제거 예정)"""
     logger.warning("LEGACY: 프론트엔드 파일 서빙 - 별도 저장소로 분리됨")
-    return FileResponse("admin.html")
+    return static_page_response(request, "admin.html")
 
 # ============================================================================
 # API 라우터 포함
@@ -0,0 +1,147 @@
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List
+
+from core.config import TRENDING_BROWSER_POOL_SIZE
+from utils.lazy_import import lazy_import
+
+logger = logging.getLogger(__name__)
+
+# selenium/webdriver_manager는 브라우저를 처음 만들 때 로드 (앱 시작 시간 단축)
+webdriver = lazy_import("selenium.webdriver")
+selenium_exceptions = lazy_import("selenium.common.exceptions")
+chrome_options = lazy_import("selenium.webdriver.chrome.options")
+chrome_service = lazy_import("selenium.webdriver.chrome.service")
+webdriver_manager_chrome = lazy_import("webdriver_manager.chrome")
+
+
+@lru_cache(maxsize=1)
+def get_chromedriver_path() -> str:
+    """ChromeDriver 경로를 프로세스당 한 번만 확인"""
+    path = webdriver_manager_chrome.ChromeDriverManager().install()
+    logger.info(f"🧭 ChromeDriver 경로 확인: {path}")
+    return path
+
+
+def _build_options() -> "chrome_options.Options":
+    options = chrome_options.Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    return options
+
+
+class BrowserPool:
+    """재사용 가능한 headless Chrome 인스턴스 풀 (필요할 때 생성, 실패 시 교체)
+
+    풀이 가득 차면 다른 스레드가 브라우저를 반납하거나 폐기할 때까지 기다립니다.
+    (폐기되면 빈 자리에 새 브라우저를 만들고, 풀이 닫히면 대기 중인 스레드도 깨어나 오류를 받음)
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._idle: "List[webdriver.Chrome]" = []  # LIFO: 최근에 쓴 브라우저부터 재사용
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _create(self) -> "webdriver.Chrome":
+        driver = webdriver.Chrome(service=chrome_service.Service(get_chromedriver_path()), options=_build_options())
+        logger.info("🌐 headless Chrome 인스턴스 생성")
+        return driver
+
+    def _take(self) -> "webdriver.Chrome":
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("브라우저 풀이 종료되었습니다.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self._cond.wait()
+
+        try:
+            return self._create()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self):
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _give_back(self, driver: "webdriver.Chrome"):
+        with self._cond:
+            if not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        self._discard(driver)
+
+    def _discard(self, driver: "webdriver.Chrome"):
+        self._release_slot()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def browser(self):
+        """풀에서 브라우저를 빌려오고, 사용 후 반납 (타임아웃 외 WebDriver 오류 시 폐기)"""
+        driver = self._take()
+        healthy = True
+        try:
+            yield driver
+        except selenium_exceptions.TimeoutException:
+            raise
+        except selenium_exceptions.WebDriverException:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._give_back(driver)
+            else:
+                self._discard(driver)
+
+    def close(self):
+        """풀의 모든 브라우저 종료 (대여 중인 브라우저는 반납될 때 종료)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+        logger.info("🧹 브라우저 풀 종료")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """프로세스 전역 브라우저 풀 반환"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = BrowserPool(TRENDING_BROWSER_POOL_SIZE)
+        return _pool
+
+
+def close_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+atexit.register(close_browser_pool)
@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import html
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from core.config import DIGEST_KEEP_WEEKS
+from services.email_service import get_weekly_keywords_data
+from services.openai_service import generate_segment_insight
+from services.weekly_keywords_service import WeekBucket, previous_iso_week
+from utils.helpers import (
+    get_cache, set_cache, get_or_fill_cache, cache_update_lock, register_persistent_cache_key, run_coroutine_sync
+)
+
+logger = logging.getLogger(__name__)
+
+# ISO 주 라벨 → 준비된 다이제스트 (발송 엔드포인트는 이 값만 읽음)
+DIGEST_CACHE_KEY = "weekly_digests"
+register_persistent_cache_key(DIGEST_CACHE_KEY)
+
+
+class DigestSegment(NamedTuple):
+    """주간 다이제스트의 관심 분야 (분야마다 LLM 섹션 하나)"""
+    title: str
+    focus: str
+
+
+# 순서 = 메일 안의 섹션 순서
+DIGEST_SEGMENTS: Dict[str, DigestSegment] = {
+    "domestic": DigestSegment("📈 국내 기술 동향", "국내 TOP 키워드 중심으로 가장 주목받은 키워드와 배경, 국내 산업/기업에 미치는 영향"),
+    "global": DigestSegment("🌍 글로벌 기술 트렌드", "해외 TOP 키워드 중심으로 해외에서 화제가 된 이슈, 국내 시장에 미칠 영향, 글로벌 vs 국내 비교"),
+    "ai": DigestSegment("🤖 AI/소프트웨어", "이번 주 키워드를 AI·소프트웨어 산업 관점에서 해석"),
+    "semiconductor": DigestSegment("🔌 반도체", "이번 주 키워드를 반도체·하드웨어 산업 관점에서 해석"),
+    "mobility": DigestSegment("🚗 모빌리티/배터리", "이번 주 키워드를 자동차·배터리·모빌리티 산업 관점에서 해석"),
+    "finance": DigestSegment("💳 금융/핀테크", "이번 주 키워드를 금융·핀테크 산업 관점에서 해석"),
+    "bio": DigestSegment("🧬 바이오/헬스케어", "이번 주 키워드를 바이오·헬스케어 산업 관점에서 해석"),
+}
+DEFAULT_DIGEST_SEGMENTS = ("domestic", "global")
+
+
+
+class DigestNotReady(Exception):
+    """다이제스트를 실제 데이터로 만들지 못함 (샘플 키워드, 섹션 생성 실패) - 저장하지 않고 다음 준비 때 재시도"""
+
+
+def normalize_segments(segments: Iterable[str]) -> List[str]:
+    """관심 분야 목록을 중복 제거 후 섹션 순서로 정렬 (알 수 없는 분야가 있으면 ValueError)"""
+    selected = {s.strip().lower() for s in segments if s and s.strip()}
+    unknown = selected - DIGEST_SEGMENTS.keys()
+    if unknown:
+        raise ValueError(f"알 수 없는 관심 분야: {', '.join(sorted(unknown))} (가능: {', '.join(DIGEST_SEGMENTS)})")
+    if not selected:
+        raise ValueError("관심 분야를 하나 이상 선택해주세요.")
+    return [key for key in DIGEST_SEGMENTS if key in selected]
+
+
+def segment_variant(segments: Iterable[str]) -> str:
+    """같은 분야 조합의 구독자가 같은 본문을 공유하도록 쓰는 키 (예: "domestic,semiconductor")
+
+    저장된 구독 정보용이라 더 이상 없는 분야는 무시하고, 남는 게 없으면 기본 분야를 사용합니다.
+    """
+    known = [s for s in segments if s in DIGEST_SEGMENTS] or DEFAULT_DIGEST_SEGMENTS
+    return ",".join(normalize_segments(known))
+
+
+def _keywords_digest(keywords_data: Dict[str, Any]) -> str:
+    payload = json.dumps(keywords_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+async def build_segment_sections(segments: Iterable[str], keywords_data: Dict[str, Any]) -> Dict[str, str]:
+    """분야별 섹션 텍스트를 동시에 생성 (같은 키워드 데이터의 섹션은 캐시에서 재사용)
+
+    실패한 섹션이 있으면 DigestNotReady를 던집니다. 성공한 섹션은 캐시되므로 재시도 때는 실패한 섹션만 다시 생성합니다.
+    """
+    data_digest = _keywords_digest(keywords_data)
+
+    async def build_section(key: str):
+        segment = DIGEST_SEGMENTS[key]
+
+        async def fill_section():
+            logger.info(f"✍️ 다이제스트 섹션 생성: {key} ({keywords_data.get('period')})")
+            return await generate_segment_insight(segment.title, segment.focus, keywords_data)
+
+        content, _ = await get_or_fill_cache(f"digest_section_{key}_{data_digest}", fill_section)
+        return key, content.strip()
+
+    keys = normalize_segments(segments)
+    results = await asyncio.gather(*[build_section(key) for key in keys], return_exceptions=True)
+    failed = []
+    for key, result in zip(keys, results):
+        if isinstance(result, BaseException):
+            logger.error(f"❌ 다이제스트 섹션 생성 실패 ({key}): {result}")
+            failed.append(key)
+    if failed:
+        raise DigestNotReady(f"섹션 생성 실패: {', '.join(failed)}")
+    return dict(results)
+
+
+def _text_to_html(text: str) -> str:
+    return "<br>".join(html.escape(line) for line in text.splitlines())
+
+
+def render_section_html(key: str, content: str) -> str:
+    return (
+        f'<h3 style="margin:24px 0 8px">{html.escape(DIGEST_SEGMENTS[key].title)}</h3>'
+        f'<p style="margin:0;line-height:1.6">{_text_to_html(content)}</p>'
+    )
+
+
+async def prepare_weekly_digest(week: Optional[WeekBucket] = None) -> Dict[str, Any]:
+    """주간 다이제스트를 미리 만들어 저장 (모든 분야의 섹션 HTML 포함)
+
+    구독자의 분야 조합과 상관없이 분야 수만큼만 LLM을 호출하며, 발송 시에는 저장된 섹션을 이어 붙이기만 합니다.
+    샘플 키워드나 실패한 섹션으로는 저장하지 않고 DigestNotReady를 던져 다음 준비 때 다시 시도합니다.
+    """
+    week = week or previous_iso_week()
+    keywords_data = await get_weekly_keywords_data(week.start, week.end)
+    if keywords_data.get("is_sample"):
+        raise DigestNotReady(f"{week.label} 키워드를 수집하지 못해 샘플 데이터만 있음")
+    sections = await build_segment_sections(DIGEST_SEGMENTS, keywords_data)
+
+    digest = {
+        "week": week.label,
+        "period": keywords_data["period"],
+        "generated_at": datetime.now().isoformat(),
+        "keywords": keywords_data,
+        "sections": {key: render_section_html(key, content) for key, content in sections.items()},
+    }
+    with cache_update_lock(DIGEST_CACHE_KEY):
+        digests = dict(get_cache(DIGEST_CACHE_KEY, expiry_seconds=None) or {})
+        digests[week.label] = digest
+        # 최근 DIGEST_KEEP_WEEKS주만 보관 (라벨은 "YYYY-Www" 라 문자열 정렬 = 시간 순)
+        set_cache(DIGEST_CACHE_KEY, {label: digests[label] for label in sorted(digests)[-DIGEST_KEEP_WEEKS:]})
+    logger.info(f"📰 주간 다이제스트 준비 완료: {week.label} ({digest['period']}), 섹션 {len(sections)}개")
+    return digest
+
+
+def prepare_weekly_digest_job():
+    """스케줄러(BackgroundScheduler)용 동기 래퍼"""
+    try:
+        run_coroutine_sync(prepare_weekly_digest())
+    except DigestNotReady as e:
+        logger.warning(f"⚠️ 주간 다이제스트 준비 보류, 다음 준비 때 재시도: {e}")
+    except Exception as e:
+        logger.error(f"❌ 주간 다이제스트 준비 실패: {e}", exc_info=True)
+
+
+def prepare_missing_weekly_digest_job():
+    """지난주 다이제스트가 아직 없을 때만 준비 (시작 직후 및 주기적 재시도용)"""
+    if get_weekly_digest() is None:
+        prepare_weekly_digest_job()
+
+
+_background_prepare: Optional[asyncio.Task] = None
+
+
+def prepare_weekly_digest_in_background():
+    """다이제스트가 없을 때 요청을 기다리게 하지 않고 백그라운드에서 한 번만 준비"""
+    global _background_prepare
+    if _background_prepare is not None and not _background_prepare.done():
+        return
+
+    async def prepare():
+        try:
+            await prepare_weekly_digest()
+        except DigestNotReady as e:
+            logger.warning(f"⚠️ 주간 다이제스트 준비 보류, 다음 준비 때 재시도: {e}")
+        except Exception as e:
+            logger.error(f"❌ 주간 다이제스트 준비 실패: {e}", exc_info=True)
+
+    _background_prepare = asyncio.ensure_future(prepare())
+
+
+def get_weekly_digest(week_label: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """미리 준비된 주간 다이제스트 (기본: 지난주, 없으면 None)"""
+    digests = get_cache(DIGEST_CACHE_KEY, expiry_seconds=None) or {}
+    return digests.get(week_label or previous_iso_week().label)
+
+
+def render_digest(segments: Iterable[str], digest: Dict[str, Any]) -> str:
+    """구독자가 선택한 분야의 섹션을 이어 붙여 메일 본문(HTML) 구성"""
+    body = "".join(digest["sections"][key] for key in normalize_segments(segments))
+    return (
+        '<div style="font-family:sans-serif;max-width:640px">'
+        f'<h2 style="margin:0">🔍 이번 주 AI 뉴스 하이라이트</h2>'
+        f'<p style="color:#666;margin:4px 0 0">{html.escape(digest["period"])}</p>'
+        f'{body}'
+        '<p style="margin-top:32px;color:#666">📧 News GPT v2 팀 드림</p>'
+        '</div>'
+    )
+
+
+def build_digest_contents(variants: Iterable[str], digest: Dict[str, Any]) -> Dict[str, str]:
+    """분야 조합(variant)별 메일 본문 - LLM 호출 없이 준비된 섹션만 조합"""
+    return {variant: render_digest(variant.split(","), digest) for variant in set(variants)}
@@ -0,0 +1,359 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.config import (
+    EMAIL_USER, EMAIL_PASSWORD,
+    EMAIL_OUTBOX_BATCH_SIZE, EMAIL_OUTBOX_POLL_SECONDS, EMAIL_OUTBOX_LEASE_SECONDS,
+    EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+)
+from core.database import ensure_column, ensure_schema, get_connection, transaction
+from services.smtp_pool import TransientSmtpError, get_smtp_sender
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태: preparing(본문 생성 중) → queued(발송 중) → done / failed
+# 메시지 상태: pending → sending(워커가 점유) → sent / failed
+# 본문은 작업별 variant(예: 구독 분야 조합)마다 한 번만 저장하고 메시지는 variant로 참조
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_jobs (
+    id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    total INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS email_job_contents (
+    job_id TEXT NOT NULL REFERENCES email_jobs(id),
+    variant TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (job_id, variant)
+);
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES email_jobs(id),
+    recipient TEXT NOT NULL,
+    variant TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    last_error TEXT,
+    sent_at REAL,
+    UNIQUE (job_id, recipient)
+);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_job ON email_outbox (job_id, status);
+"""
+
+# 준비 중인 작업과 점유한 메시지는 lease의 1/3마다 갱신 (lease 동안 갱신이 없으면 중단된 것으로 봄)
+HEARTBEAT_SECONDS = EMAIL_OUTBOX_LEASE_SECONDS / 3
+
+_WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+_wakeup: Optional[asyncio.Event] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_task: Optional[asyncio.Task] = None
+_prepare_tasks = set()
+_schema_ready = False
+
+
+def _migrate_legacy_job_contents():
+    """variant 도입 전 DB: email_jobs.content에 있던 본문을 variant ''의 본문으로 복사 (발송 중이던 작업 계속 진행)"""
+    with get_connection() as conn:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(email_jobs)")}
+        if "content" not in columns:
+            return
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO email_job_contents (job_id, variant, content) "
+            "SELECT id, '', content FROM email_jobs WHERE content IS NOT NULL"
+        )
+    if cur.rowcount:
+        logger.info(f"📦 이전 형식 이메일 작업 본문 {cur.rowcount}건 이전")
+
+
+def _init_schema():
+    global _schema_ready
+    if not _schema_ready:
+        ensure_schema("email_outbox", OUTBOX_SCHEMA)
+        ensure_column("email_outbox", "variant", "TEXT NOT NULL DEFAULT ''")  # variant 도입 전에 만들어진 DB
+        _migrate_legacy_job_contents()
+        _schema_ready = True
+
+
+def create_email_job(subject: str) -> str:
+    """본문 준비 중인 발송 작업 생성 후 작업 ID 반환"""
+    _init_schema()
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT INTO email_jobs (id, subject, status, created_at, updated_at) VALUES (?, ?, 'preparing', ?, ?)",
+            (job_id, subject, now, now),
+        )
+    return job_id
+
+
+def enqueue_email_job(job_id: str, contents: Dict[str, str], recipients: Iterable[Tuple[str, str]]) -> int:
+    """variant별 본문을 저장하고 (수신자, variant) 메시지를 outbox에 넣음 (같은 작업 내 중복 수신자는 한 번만)"""
+    _init_schema()
+    now = time.time()
+    rows = [(job_id, email, variant, now) for email, variant in dict(r for r in recipients if r[0]).items()]
+    missing = {variant for _, _, variant, _ in rows} - contents.keys()
+    if missing:
+        raise ValueError(f"본문이 없는 variant: {', '.join(sorted(missing))}")
+
+    with get_connection() as conn, transaction(conn, immediate=True):
+        conn.executemany(
+            "INSERT OR REPLACE INTO email_job_contents (job_id, variant, content) VALUES (?, ?, ?)",
+            [(job_id, variant, content) for variant, content in contents.items()],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO email_outbox (job_id, recipient, variant, next_attempt_at) VALUES (?, ?, ?, ?)", rows
+        )
+        total = conn.execute("SELECT COUNT(*) FROM email_outbox WHERE job_id = ?", (job_id,)).fetchone()[0]
+        conn.execute(
+            "UPDATE email_jobs SET status = ?, total = ?, updated_at = ? WHERE id = ?",
+            ("queued" if total else "done", total, now, job_id),
+        )
+    _notify_worker()
+    logger.info(f"📥 이메일 작업 등록: {job_id} ({total}명)")
+    return total
+
+
+def touch_email_job(job_id: str):
+    """본문 준비 중인 작업의 heartbeat (updated_at 갱신)"""
+    with get_connection() as conn:
+        conn.execute("UPDATE email_jobs SET updated_at = ? WHERE id = ? AND status = 'preparing'", (time.time(), job_id))
+
+
+async def _heartbeat(beat: Callable[[], None]):
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        try:
+            await asyncio.to_thread(beat)
+        except Exception as e:
+            logger.warning(f"⚠️ 이메일 outbox heartbeat 실패: {e}")
+
+
+def fail_email_job(job_id: str, error: str):
+    with get_connection() as conn:
+        conn.execute(
+            "UPDATE email_jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+            (error, time.time(), job_id),
+        )
+
+
+def start_email_job(subject: str, recipients: List[Tuple[str, str]],
+                    prepare_contents: Callable[[], Awaitable[Dict[str, str]]]) -> str:
+    """작업 ID를 바로 반환하고, 본문 생성과 outbox 등록은 백그라운드에서 진행
+
+    recipients: (이메일, variant) 목록, prepare_contents: variant → 본문을 만드는 코루틴 함수
+    """
+    job_id = create_email_job(subject)
+
+    async def prepare():
+        heartbeat = asyncio.ensure_future(_heartbeat(lambda: touch_email_job(job_id)))
+        try:
+            contents = await prepare_contents()
+            await asyncio.to_thread(enqueue_email_job, job_id, contents, recipients)
+        except Exception as e:
+            logger.error(f"❌ 이메일 작업 준비 실패 ({job_id}): {e}", exc_info=True)
+            await asyncio.to_thread(fail_email_job, job_id, str(e))
+        finally:
+            heartbeat.cancel()
+
+    task = asyncio.ensure_future(prepare())
+    _prepare_tasks.add(task)
+    task.add_done_callback(_prepare_tasks.discard)
+    return job_id
+
+
+def get_email_job(job_id: str, failed_limit: int = 100) -> Optional[Dict[str, Any]]:
+    """작업 상태와 수신자 상태별 건수, 실패한 수신자 목록"""
+    _init_schema()
+    with get_connection() as conn:
+        job = conn.execute(
+            "SELECT id, subject, status, error, total, created_at, updated_at FROM email_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if job is None:
+            return None
+        counts = {row["status"]: row["n"] for row in conn.execute(
+            "SELECT status, COUNT(*) AS n FROM email_outbox WHERE job_id = ? GROUP BY status", (job_id,)
+        )}
+        failed = [dict(row) for row in conn.execute(
+            "SELECT recipient, attempts, last_error FROM email_outbox WHERE job_id = ? AND status = 'failed' LIMIT ?",
+            (job_id, failed_limit),
+        )]
+
+    result = dict(job)
+    result["counts"] = {status: counts.get(status, 0) for status in ("pending", "sending", "sent", "failed")}
+    result["failed_recipients"] = failed
+    return result
+
+
+def _recover_interrupted_jobs():
+    """본문 생성 중 프로세스가 종료된 작업은 실패로 표시 (outbox에 들어간 메시지는 lease 만료 후 재개)
+
+    준비 중인 작업은 heartbeat로 updated_at을 갱신하므로, lease 동안 갱신이 없으면 준비하던 프로세스가 종료된 것입니다.
+    """
+    cutoff = time.time() - EMAIL_OUTBOX_LEASE_SECONDS
+    with get_connection() as conn:
+        cur = conn.execute(
+            "UPDATE email_jobs SET status = 'failed', error = '본문 준비 중 서버가 종료되었습니다.', updated_at = ? "
+            "WHERE status = 'preparing' AND updated_at < ?",
+            (time.time(), cutoff),
+        )
+    if cur.rowcount:
+        logger.warning(f"⚠️ 준비 중 중단된 이메일 작업 {cur.rowcount}건을 실패로 표시")
+
+
+def _claim_due_messages(limit: int) -> List[Dict[str, Any]]:
+    """발송할 메시지를 점유 (다른 워커가 점유 중인 메시지는 lease가 지나야 다시 가져감)"""
+    now = time.time()
+    lease_cutoff = now - EMAIL_OUTBOX_LEASE_SECONDS
+    with get_connection() as conn, transaction(conn, immediate=True):
+        rows = conn.execute(
+            """
+            SELECT o.id, o.job_id, o.recipient, o.attempts, j.subject, c.content
+            FROM email_outbox o
+            JOIN email_jobs j ON j.id = o.job_id
+            JOIN email_job_contents c ON c.job_id = o.job_id AND c.variant = o.variant
+            WHERE (o.status = 'pending' AND o.next_attempt_at <= ?)
+               OR (o.status = 'sending' AND o.claimed_at < ?)
+            ORDER BY o.id
+            LIMIT ?
+            """,
+            (now, lease_cutoff, limit),
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE email_outbox SET status = 'sending', claimed_by = ?, claimed_at = ? WHERE id = ?",
+                [(_WORKER_ID, now, row["id"]) for row in rows],
+            )
+    return [dict(row) for row in rows]
+
+
+def _renew_leases(message_ids: List[int]):
+    """발송 중인 메시지의 lease 연장 (SMTP 재시도로 배치가 길어져도 다른 워커가 다시 가져가지 않게 함)"""
+    now = time.time()
+    with get_connection() as conn:
+        conn.executemany(
+            "UPDATE email_outbox SET claimed_at = ? WHERE id = ? AND claimed_by = ? AND status = 'sending'",
+            [(now, message_id, _WORKER_ID) for message_id in message_ids],
+        )
+
+
+def _record_result(message: Dict[str, Any], error: Optional[Exception]):
+    """메시지 한 건의 발송 결과 반영 (성공 시 즉시 확정되어 재시작 후에도 다시 보내지 않음)"""
+    now = time.time()
+    attempts = message["attempts"] + 1
+    with get_connection() as conn, transaction(conn, immediate=True):
+        if error is None:
+            cur = conn.execute(
+                "UPDATE email_outbox SET status = 'sent', attempts = ?, sent_at = ?, last_error = NULL "
+                "WHERE id = ? AND claimed_by = ?",
+                (attempts, now, message["id"], _WORKER_ID),
+            )
+        elif isinstance(error, TransientSmtpError) and attempts < EMAIL_OUTBOX_MAX_ATTEMPTS:
+            delay = EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+            cur = conn.execute(
+                "UPDATE email_outbox SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ? "
+                "WHERE id = ? AND claimed_by = ?",
+                (attempts, now + delay, str(error), message["id"], _WORKER_ID),
+            )
+        else:
+            cur = conn.execute(
+                "UPDATE email_outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ? AND claimed_by = ?",
+                (attempts, str(error), message["id"], _WORKER_ID),
+            )
+        if cur.rowcount == 0:
+            logger.warning(f"⚠️ lease가 만료되어 다른 워커가 가져간 메시지, 결과 기록 생략 ({message['recipient']})")
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM email_outbox WHERE job_id = ? AND status IN ('pending', 'sending')",
+            (message["job_id"],),
+        ).fetchone()[0]
+        if remaining == 0:
+            conn.execute(
+                "UPDATE email_jobs SET status = 'done', updated_at = ? WHERE id = ? AND status = 'queued'",
+                (now, message["job_id"]),
+            )
+
+
+async def _deliver(message: Dict[str, Any]):
+    from services.email_service import build_email_message
+
+    error = None
+    try:
+        await get_smtp_sender().send(build_email_message(message["recipient"], message["subject"], message["content"]))
+    except Exception as e:
+        error = e
+        logger.warning(f"⚠️ outbox 발송 실패 ({message['recipient']}, {message['attempts'] + 1}회차): {e}")
+    await asyncio.to_thread(_record_result, message, error)
+
+
+async def run_outbox_worker():
+    """outbox의 대기 메시지를 계속 발송하는 백그라운드 루프"""
+    global _wakeup, _worker_loop
+    _worker_loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    _init_schema()
+    logger.info(f"📤 이메일 outbox 워커 시작: {_WORKER_ID}")
+
+    while True:
+        try:
+            await asyncio.to_thread(_recover_interrupted_jobs)
+            if not EMAIL_USER or not EMAIL_PASSWORD:
+                messages = []
+            else:
+                messages = await asyncio.to_thread(_claim_due_messages, EMAIL_OUTBOX_BATCH_SIZE)
+            if messages:
+                # SMTP 재시도/간격 조절로 배치가 lease보다 길어질 수 있으므로 발송하는 동안 lease를 계속 연장
+                message_ids = [message["id"] for message in messages]
+                renewal = asyncio.ensure_future(_heartbeat(lambda: _renew_leases(message_ids)))
+                try:
+                    await asyncio.gather(*[_deliver(message) for message in messages])
+                finally:
+                    renewal.cancel()
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ 이메일 outbox 처리 오류: {e}", exc_info=True)
+
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=EMAIL_OUTBOX_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _notify_worker():
+    """새 작업이 등록되면 폴링 간격을 기다리지 않고 워커를 깨움 (스레드에서 호출 가능)"""
+    if _wakeup is None or _worker_loop is None or _worker_loop.is_closed():
+        return
+    _worker_loop.call_soon_threadsafe(_wakeup.set)
+
+
+def start_outbox_worker() -> asyncio.Task:
+    """서버 이벤트 루프에서 outbox 워커 시작"""
+    global _worker_task
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.ensure_future(run_outbox_worker())
+    return _worker_task
+
+
+async def stop_outbox_worker():
+    global _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+        _worker_task = None
@@ -1,61 +1,34 @@
-import smtplib
-import json
-import os
+import asyncio
 import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from typing import Dict, Iterable, Optional
 
-from core.config import EMAIL_HOST, EMAIL_PORT, EMAIL_USER, EMAIL_PASSWORD, SUBSCRIBERS_FILE
+from core.config import EMAIL_USER, EMAIL_PASSWORD
+from services.smtp_pool import get_smtp_sender
 from services.openai_service import generate_weekly_insight
-from services.deepsearch_service import fetch_tech_articles, fetch_global_tech_articles
+from services.weekly_keywords_service import get_weekly_keywords, previous_iso_week
 
 logger = logging.getLogger(__name__)
 
-def load_subscribers():
-    """구독자 목록 로드"""
-    try:
-        if os.path.exists(SUBSCRIBERS_FILE):
-            with open(SUBSCRIBERS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
-    except Exception as e:
-        logger.error(f"구독자 로드 오류: {e}")
-        return []
-
-def save_subscribers(subscribers):
-    """구독자 목록 저장"""
-    try:
-        with open(SUBSCRIBERS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(subscribers, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception as e:
-        logger.error(f"구독자 저장 오류: {e}")
-        return False
+def build_email_message(to_email: str, subject: str, content: str) -> MIMEMultipart:
+    """HTML 이메일 메시지 생성"""
+    msg = MIMEMultipart()
+    msg['From'] = EMAIL_USER
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(content, 'html'))
+    return msg
 
 async def send_email(to_email: str, subject: str, content: str):
-    """이메일 발송 (HTML 형식)"""
+    """이메일 발송 (HTML 형식, 풀링된 SMTP 연결 재사용)"""
     if not EMAIL_USER or not EMAIL_PASSWORD:
         logger.error("이메일 설정이 비어 있습니다. .env 파일을 확인하세요.")
         return False
     
     try:
-        # 이메일 메시지 생성
-        msg = MIMEMultipart()
-        msg['From'] = EMAIL_USER
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # HTML 본문 추가
-        msg.attach(MIMEText(content, 'html'))
-        
-        # SMTP 서버 연결 및 발송
-        server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
-        server.starttls()  # TLS 암호화
-        server.login(EMAIL_USER, EMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-        
+        await get_smtp_sender().send(build_email_message(to_email, subject, content))
         logger.info(f"✅ 이메일 발송 성공: {to_email}")
         return True
         
@@ -63,26 +36,38 @@ async def send_email(to_email: str, subject: str, content: str):
         logger.error(f"❌ 이메일 발송 실패 ({to_email}): {e}", exc_info=True)
         return False
 
-async def get_weekly_keywords_data():
-    """주간 키워드 데이터 수집"""
-    from services.openai_service import extract_keywords_with_gpt, extract_global_keywords_with_gpt
+async def send_bulk_email(recipients: Iterable[str], subject: str, content: str) -> Dict[str, Optional[str]]:
+    """여러 수신자에게 동시에 발송 (연결 재사용, 동시 발송 수 제한, 서버 응답에 따른 간격 조절)
+
+    반환: 수신자 → None(성공) 또는 오류 메시지
+    """
+    recipients = list(recipients)
+    if not EMAIL_USER or not EMAIL_PASSWORD:
+        logger.error("이메일 설정이 비어 있습니다. .env 파일을 확인하세요.")
+        return {email: "이메일 설정이 비어 있습니다." for email in recipients}
+
+    messages = [build_email_message(email, subject, content) for email in recipients]
+    results = await get_smtp_sender().send_many(messages)
+    sent = sum(1 for error in results.values() if error is None)
+    logger.info(f"📬 대량 발송 완료: 성공 {sent}건, 실패 {len(results) - sent}건")
+    return results
+
+async def get_weekly_keywords_data(start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """주간 키워드 데이터 수집 (기본: 지난주, 국내/해외를 주별 캐시에서 동시에 조회)"""
+    if start_date is None or end_date is None:
+        week = previous_iso_week()
+        start_date, end_date = week.start, week.end
     try:
-        # 현재 주차 키워드 가져오기
-        start_date = "2025-07-14"
-        end_date = "2025-07-21"
-        
-        # 국내 키워드
-        domestic_articles = await fetch_tech_articles(start_date, end_date)
-        domestic_keywords = await extract_keywords_with_gpt(domestic_articles)
-        
-        # 해외 키워드
-        global_articles = await fetch_global_tech_articles(start_date, end_date)
-        global_keywords = await extract_global_keywords_with_gpt(global_articles)
-        
+        domestic, global_ = await asyncio.gather(
+            get_weekly_keywords("domestic", start_date, end_date),
+            get_weekly_keywords("global", start_date, end_date),
+        )
         return {
-            "domestic_keywords": domestic_keywords[:5],
-            "global_keywords": global_keywords[:5],
-            "period": f"{start_date} ~ {end_date}"
+            "domestic_keywords": domestic["keywords"][:5],
+            "global_keywords": global_["keywords"][:5],
+            "period": f"{start_date} ~ {end_date}",
+            "weeks": domestic["weeks"],
+            "is_sample": bool(domestic["sample_weeks"] or global_["sample_weeks"])
         }
     except Exception as e:
         logger.error(f"키워드 데이터 수집 오류: {e}")
@@ -95,5 +80,6 @@ async def get_weekly_keywords_data():
                 {"keyword": "AI Technology", "count": 30, "rank": 1, "reason": "오류로 인한 샘플 데이터"},
                 {"keyword": "Innovation", "count": 25, "rank": 2, "reason": "오류로 인한 샘플 데이터"}
             ],
-            "period": "2025-07-14 ~ 2025-07-21"
-        } 
\ No newline at end of file
+            "period": f"{start_date} ~ {end_date}",
+            "is_sample": True
+        }
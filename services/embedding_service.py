@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from core.config import EMBEDDING_MODEL_NAME, EMBEDDING_MEMORY_CACHE_MAX_ENTRIES
+from utils.cache_backend import EMBEDDING_CACHE_ROOT
+from utils.lazy_import import lazy_import
+
+logger = logging.getLogger(__name__)
+
+# torch/transformers를 끌어오는 모델 라이브러리와 scipy는 첫 사용 시점에 로드 (앱 시작 시간/메모리 절감)
+sentence_transformers = lazy_import("sentence_transformers")
+scipy_sparse = lazy_import("scipy.sparse")
+scipy_csgraph = lazy_import("scipy.sparse.csgraph")
+
+EMBEDDING_CACHE_DIR = os.path.join(EMBEDDING_CACHE_ROOT, EMBEDDING_MODEL_NAME.replace("/", "_"))
+SIMILARITY_BLOCK_SIZE = 1024
+
+_model = None
+_model_lock = threading.Lock()
+# 텍스트 해시 → 벡터 LRU (EMBEDDING_MEMORY_CACHE_MAX_ENTRIES개까지)
+_memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+def get_embedding_model() -> "sentence_transformers.SentenceTransformer":
+    """임베딩 모델을 프로세스당 한 번만 로드하여 재사용"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                logger.info(f"🧠 임베딩 모델 로드: {EMBEDDING_MODEL_NAME}")
+                _model = sentence_transformers.SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return _model
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _remember(digest: str, vector: np.ndarray):
+    with _memory_cache_lock:
+        _memory_cache[digest] = vector
+        _memory_cache.move_to_end(digest)
+        while len(_memory_cache) > EMBEDDING_MEMORY_CACHE_MAX_ENTRIES:
+            _memory_cache.popitem(last=False)
+
+
+def _load_cached(digest: str):
+    with _memory_cache_lock:
+        vector = _memory_cache.get(digest)
+        if vector is not None:
+            _memory_cache.move_to_end(digest)
+            return vector
+    path = os.path.join(EMBEDDING_CACHE_DIR, f"{digest}.npy")
+    try:
+        vector = np.load(path)
+    except (OSError, ValueError):
+        return None
+    _remember(digest, vector)
+    return vector
+
+
+def _store_cached(digest: str, vector: np.ndarray):
+    _remember(digest, vector)
+    path = os.path.join(EMBEDDING_CACHE_DIR, f"{digest}.npy")
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.save(f, vector)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ 임베딩 캐시 저장 실패 ({digest}): {e}")
+
+
+def encode_texts(texts: Sequence[str]) -> np.ndarray:
+    """L2 정규화된 임베딩 행렬 반환 (텍스트 해시 기준으로 디스크에 메모이즈)"""
+    digests = [_text_hash(text) for text in texts]
+    vectors: List[np.ndarray] = [None] * len(texts)
+
+    missing = []
+    for i, digest in enumerate(digests):
+        vectors[i] = _load_cached(digest)
+        if vectors[i] is None:
+            missing.append(i)
+
+    if missing:
+        encoded = get_embedding_model().encode([texts[i] for i in missing], normalize_embeddings=True)
+        for i, vector in zip(missing, encoded):
+            vector = np.asarray(vector, dtype=np.float32)
+            _store_cached(digests[i], vector)
+            vectors[i] = vector
+        logger.info(f"🧮 임베딩 계산 {len(missing)}개, 캐시 재사용 {len(texts) - len(missing)}개")
+
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    matrix = np.vstack(vectors).astype(np.float32, copy=False)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def similar_pairs(embeddings: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """정규화된 임베딩에서 코사인 유사도 > threshold 인 (i < j) 쌍과 유사도 반환"""
+    n = embeddings.shape[0]
+    row_parts, col_parts, score_parts = [], [], []
+    # 블록 단위로 계산해 n x n 유사도 행렬 전체를 메모리에 올리지 않음
+    for start in range(0, n, SIMILARITY_BLOCK_SIZE):
+        block = embeddings[start:start + SIMILARITY_BLOCK_SIZE] @ embeddings.T
+        rows, cols = np.nonzero(block > threshold)
+        scores = block[rows, cols]
+        rows += start
+        upper = cols > rows
+        row_parts.append(rows[upper])
+        col_parts.append(cols[upper])
+        score_parts.append(scores[upper])
+    if not row_parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+    return np.concatenate(row_parts), np.concatenate(col_parts), np.concatenate(score_parts)
+
+
+def label_components(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """(rows[k], cols[k]) 간선으로 연결된 노드들의 연결 요소 라벨 반환"""
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    graph = scipy_sparse.coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    _, labels = scipy_csgraph.connected_components(graph, directed=False)
+    return labels
+
+
+def cluster_by_similarity(embeddings: np.ndarray, threshold: float) -> np.ndarray:
+    """정규화된 임베딩에서 코사인 유사도 > threshold 인 쌍을 연결하고 연결 요소 라벨 반환"""
+    rows, cols, _ = similar_pairs(embeddings, threshold)
+    return label_components(embeddings.shape[0], rows, cols)
@@ -4,6 +4,8 @@ import asyncio
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException
 from core.config import openai_client, openai_keyword_explainer_client, ncs_search_client, AZURE_OPENAI_DEPLOYMENT, AZURE_OPENAI_DEPLOYMENT_NCS, AZURE_OPENAI_KEYWORD_EXPLAINER_DEPLOYMENT
+from services.question_router import get_question_router
+from utils.llm_usage import chat_completion
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +48,8 @@ async def get_job_industry_summary(query: str) -> str:
         system_msg = "너는 직무/산업 관련 전문가 AI야."
         user_prompt = f"'{query}'에 대해 간략하게 요약해줘."
         try:
-            response = openai_client.chat.completions.create(
+            response = chat_completion(
+                openai_client, "get_job_industry_summary",
                 model=AZURE_OPENAI_DEPLOYMENT_NCS,
                 messages=[
                     {"role": "system", "content": system_msg},
@@ -83,7 +86,8 @@ async def get_job_industry_summary(query: str) -> str:
     """
 
     try:
-        response = openai_client.chat.completions.create(
+        response = chat_completion(
+            openai_client, "get_job_industry_summary",
             model=AZURE_OPENAI_DEPLOYMENT_NCS,
             messages=[
                 {"role": "system", "content": system_msg},
@@ -122,7 +126,8 @@ async def extract_keywords_with_gpt(articles: List[Dict[str, Any]]) -> List[Dict
 키워드4: 선정 이유4
 키워드5: 선정 이유5
 """
-        response = openai_client.chat.completions.create(
+        response = chat_completion(
+            openai_client, "extract_keywords_with_gpt",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": "IT기술 키워드 추출 전문가. 각 키워드를 선정한 핵심 이유를 간결하게 설명합니다. 마크다운 헤더 사용 금지."},
@@ -233,7 +238,8 @@ Keyword3: Reason3
 Keyword4: Reason4
 Keyword5: Reason5
 """
-        response = openai_client.chat.completions.create(
+        response = chat_completion(
+            openai_client, "extract_global_keywords_with_gpt",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": "You are an expert at extracting English tech keywords from global news. Provide concise reasons for each keyword. Use plain text only, no markdown headers."},
@@ -329,7 +335,8 @@ async def extract_keywords_with_gpt4o(articles):
 주요 키워드:
 """
         
-        response = openai_client.chat.completions.create(
+        response = chat_completion(
+            openai_client, "extract_keywords_with_gpt4o",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": "뉴스 키워드 분석 전문가입니다. 기사에서 중요한 키워드를 추출합니다."},
@@ -372,77 +379,11 @@ async def extract_keywords_with_gpt4o(articles):
         logger.error(f"❌ GPT-4o 오류: {e}")
         return []
 
-def extract_keyword_and_industry(question: str) -> Dict[str, Any]:
+def extract_keyword_and_industry(question: str, current_keywords: Optional[List[str]] = None) -> Dict[str, Any]:
     """질문에서 키워드와 산업 분류, 그리고 간단한 키워드 선정 이유를 추출"""
-    
-    industry_keywords = {
-        "사회": ["사회", "교육", "일자리", "복지", "정책", "제도", "시민", "공공"],
-        "경제": ["경제", "시장", "투자", "금융", "주가", "비용", "수익", "매출", "기업"],
-        "IT/과학": ["기술", "개발", "혁신", "연구", "과학", "IT", "소프트웨어", "하드웨어", "플랫폼", "인공지능", "반도체", "클라우드", "메타버스", "블록체인", "AI", "ChatGPT", "머신러닝", "딥러닝", "로봇", "데이터 과학"],
-        "생활/문화": ["생활", "문화", "라이프스타일", "소비", "트렌드", "일상", "여가", "엔터테인먼트", "영화", "음악", "게임"],
-        "세계": ["글로벌", "국제", "세계", "해외", "수출", "협력", "경쟁", "표준"]
-    }
-    
-    question_lower = question.lower()
-    
-    detected_industry = None
-    for industry, keywords in industry_keywords.items():
-        if any(keyword in question_lower for keyword in keywords):
-            detected_industry = industry
-            break
-    
-    current_keywords = get_current_weekly_keywords()
-    detected_keyword = None
-    
-    detected_keyword_reason = None
-
-    for keyword in current_keywords:
-        if keyword in question:
-            detected_keyword = keyword
-            match_reason = re.search(f"(최근|새로운|발전|증가|하락|인해|따라|관련하여|대해)\s*(?:{re.escape(keyword)})\s*(.*)", question)
-            if match_reason:
-                context_word = match_reason.group(1).strip()
-                trailing_text = match_reason.group(2).strip()
-                if trailing_text:
-                    detected_keyword_reason = f"{context_word} {trailing_text}"[:50].strip()
-                else:
-                    detected_keyword_reason = f"{context_word} 언급"
-            else:
-                detected_keyword_reason = "질문 내 명시된 이유 없음"
-            break
-        elif keyword.lower() in question_lower:
-            detected_keyword = keyword
-            detected_keyword_reason = "질문 내 간접적으로 언급됨"
-            break
-
-    question_type = "general"
-
-    comparison_keywords = []
-    if "vs" in question_lower or "비교" in question_lower or "차이" in question_lower:
-        question_type = "comparison"
-        comparison_keywords = [kw for kw in current_keywords if kw.lower() in question_lower]
-        if not comparison_keywords and detected_keyword:
-            comparison_keywords = [detected_keyword]
-        
-        if not comparison_keywords:
-            match = re.search(r'(.+?)\s*(?:와|와도)\s*(.+?)\s*비교', question_lower)
-            if match:
-                comparison_keywords = [match.group(1).strip(), match.group(2).strip()]
-            else:
-                comparison_keywords = current_keywords[:2]
-
-    elif detected_industry and detected_keyword:
-        question_type = "industry_analysis"
-    elif detected_keyword:
-        question_type = "keyword_trend"
-
-    return {
-        "type": question_type,
-        "keyword": detected_keyword,
-        "keywords": comparison_keywords,
-        "industry": detected_industry or "사회",
-        "reason": detected_keyword_reason
-    }
+    if current_keywords is None:
+        current_keywords = get_current_weekly_keywords()
+    return get_question_router(current_keywords).classify(question)
 
 def get_current_weekly_keywords():
     """현재 주간 키워드 가져오기"""
@@ -508,7 +449,9 @@ async def generate_industry_based_answer(question, keyword, industry, current_ke
 """
 
         completion = await asyncio.to_thread( # await asyncio.to_thread 추가
-            openai_client.chat.completions.create,
+            chat_completion,
+            openai_client,
+            "generate_industry_based_answer",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": system_message_content},
@@ -545,7 +488,8 @@ async def generate_keyword_trend_answer(question, keyword):
 시간순으로 정리하여 트렌드를 명확하게 설명해주세요.
 """
         
-        completion = openai_client.chat.completions.create(
+        completion = chat_completion(
+            openai_client, "generate_keyword_trend_answer",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": f"당신은 '{keyword}' 분야의 트렌드 분석 전문가입니다. 최신 동향과 변화를 분석합니다. 마크다운 헤더(#) 사용 금지. 중간점(·)과 이모지만 사용하세요."},
@@ -651,7 +595,9 @@ async def generate_comparison_answer(question, keywords, perspective_role: Optio
 """
 
         completion = await asyncio.to_thread(
-            openai_client.chat.completions.create,
+            chat_completion,
+            openai_client,
+            "generate_comparison_answer",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": system_message_content},
@@ -691,7 +637,8 @@ async def generate_contextual_answer(question, current_keywords):
 명확하고 도움이 되는 답변을 제공해주세요.
 """
         
-        completion = openai_client.chat.completions.create(
+        completion = chat_completion(
+            openai_client, "generate_contextual_answer",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": f"당신은 뉴스 분석 전문가입니다. 현재 주간 핵심 키워드({', '.join(current_keywords)})를 고려하여 질문에 답변합니다."},
@@ -727,7 +674,8 @@ def analyze_keyword_dynamically(request: dict):
 마크다운 헤더(#) 사용 금지. 중간점(·)과 이모지만 사용하세요.
 """
         
-        completion = openai_client.chat.completions.create(
+        completion = chat_completion(
+            openai_client, "analyze_keyword_dynamically",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": "당신은 다양한 관점에서 키워드를 분석하는 전문가입니다. 마크다운 헤더(#) 사용 금지. 중간점(·)과 이모지로 구분하세요."},
@@ -787,7 +735,8 @@ async def generate_weekly_insight(keywords_data):
         전체 분량: 1000자 내외로 작성해주세요.
         """
 
-        completion = openai_client.chat.completions.create(
+        completion = chat_completion(
+            openai_client, "generate_weekly_insight",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": "당신은 AI 뉴스 분석 전문가입니다. 주간 인사이트를 구독자들에게 제공합니다. 마크다운 헤더(#) 절대 사용 금지. 대신 이모지와 중간점(·)만 사용하여 구분하세요."},
@@ -824,6 +773,46 @@ async def generate_weekly_insight(keywords_data):
         """
 
 
+async def generate_segment_insight(segment_title: str, focus: str, keywords_data) -> str:
+    """주간 다이제스트의 관심 분야별 섹션 생성 (실패 시 예외 - 호출 측에서 캐시하지 않도록)"""
+    def format_keywords(keywords):
+        return ", ".join(
+            f"{k['keyword']} ({k.get('count', '-')}건)" if isinstance(k, dict) else str(k) for k in keywords
+        )
+
+    prompt = f"""
+    AI 뉴스 구독자들을 위한 주간 인사이트 중 '{segment_title}' 섹션을 작성해주세요.
+
+    📊 이번 주 분석 데이터:
+    · 분석 기간: {keywords_data["period"]}
+    · 국내 TOP 키워드: {format_keywords(keywords_data["domestic_keywords"])}
+    · 해외 TOP 키워드: {format_keywords(keywords_data["global_keywords"])}
+
+    섹션 초점: {focus}
+
+    다음 구조로 작성해주세요:
+    · 이 분야에서 주목할 키워드와 그 배경
+    · 관련 기업/실무에 미치는 영향
+    · 다음 주 실행 포인트
+
+    ⚠️ 중요: 마크다운 헤더 기호 절대 사용하지 말고, 이모지와 중간점만 사용해서 구분해주세요.
+    섹션 분량: 400자 내외로 작성해주세요.
+    """
+
+    completion = await asyncio.to_thread(
+        chat_completion,
+        openai_client,
+        "generate_segment_insight",
+        model=AZURE_OPENAI_DEPLOYMENT,
+        messages=[
+            {"role": "system", "content": "당신은 AI 뉴스 분석 전문가입니다. 주간 인사이트를 구독자들에게 제공합니다. 마크다운 헤더(#) 절대 사용 금지. 대신 이모지와 중간점(·)만 사용하여 구분하세요."},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=700,
+        temperature=0.3
+    )
+    return completion.choices[0].message.content
+
 async def get_gpt_commentary(trend_request):
     """GPT를 사용하여 트렌드에 대한 해설 생성"""
     try:
@@ -844,7 +833,8 @@ async def get_gpt_commentary(trend_request):
             "- In that case, please add the following sentence at the end of the paragraph:\n"
             "  ※ 기사 제목만으로는 유의미한 검색 원인을 찾기 어려워, 추가 정보를 참고했습니다."
         )
-        response = openai_keyword_explainer_client.chat.completions.create(
+        response = chat_completion(
+            openai_keyword_explainer_client, "get_gpt_commentary",
             model=AZURE_OPENAI_KEYWORD_EXPLAINER_DEPLOYMENT,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
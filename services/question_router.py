@@ -0,0 +1,232 @@
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDUSTRY_KEYWORDS = {
+    "사회": ["사회", "교육", "일자리", "복지", "정책", "제도", "시민", "공공"],
+    "경제": ["경제", "시장", "투자", "금융", "주가", "비용", "수익", "매출", "기업"],
+    "IT/과학": ["기술", "개발", "혁신", "연구", "과학", "IT", "소프트웨어", "하드웨어", "플랫폼", "인공지능", "반도체", "클라우드", "메타버스", "블록체인", "AI", "ChatGPT", "머신러닝", "딥러닝", "로봇", "데이터 과학"],
+    "생활/문화": ["생활", "문화", "라이프스타일", "소비", "트렌드", "일상", "여가", "엔터테인먼트", "영화", "음악", "게임"],
+    "세계": ["글로벌", "국제", "세계", "해외", "수출", "협력", "경쟁", "표준"]
+}
+
+COMPARISON_TRIGGERS = ["vs", "비교", "차이"]
+
+# 키워드 바로 앞에 오는 맥락 단어 (질문 앞부분의 끝에 매칭)
+REASON_PREFIX_PATTERN = re.compile(r"(최근|새로운|발전|증가|하락|인해|따라|관련하여|대해)\s*$")
+COMPARISON_PATTERN = re.compile(r'(.+?)\s*(?:와|와도)\s*(.+?)\s*비교')
+
+# 영문/숫자 용어는 단어 경계에서만 매칭 ("IT", "AI"가 with, said, email 안에서 잡히지 않도록)
+_ASCII_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
+
+KIND_INDUSTRY = 0
+KIND_KEYWORD = 1
+KIND_COMPARISON = 2
+
+
+class AhoCorasick:
+    """여러 패턴을 한 번의 텍스트 스캔으로 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pattern_id)
+
+        # BFS로 실패 링크 구성 및 출력 병합
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(시작 인덱스, 패턴 ID) 쌍을 텍스트 순서대로 반환"""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern_id in out[node]:
+                yield i - len(patterns[pattern_id]) + 1, pattern_id
+
+
+class QuestionRouter:
+    """산업 용어, 현재 키워드, 비교 트리거를 하나의 오토마톤으로 분류하는 라우터"""
+
+    def __init__(self, current_keywords: Sequence[str]):
+        self.current_keywords = list(current_keywords)
+        self.industries = list(INDUSTRY_KEYWORDS.keys())
+
+        entries: Dict[str, List[Tuple[int, int]]] = {}
+        for priority, terms in enumerate(INDUSTRY_KEYWORDS.values()):
+            for term in terms:
+                entries.setdefault(term.lower(), []).append((KIND_INDUSTRY, priority))
+        for order, keyword in enumerate(self.current_keywords):
+            if keyword:
+                entries.setdefault(keyword.lower(), []).append((KIND_KEYWORD, order))
+        for trigger in COMPARISON_TRIGGERS:
+            entries.setdefault(trigger, []).append((KIND_COMPARISON, 0))
+
+        self._tags = list(entries.values())
+        self._automaton = AhoCorasick(list(entries.keys()))
+        # 패턴별 (앞쪽 경계 확인 여부, 뒤쪽 경계 확인 여부, 길이)
+        self._bounds = [
+            (pattern[0] in _ASCII_WORD_CHARS, pattern[-1] in _ASCII_WORD_CHARS, len(pattern)) if pattern else (False, False, 0)
+            for pattern in self._automaton.patterns
+        ]
+
+    def _at_word_boundary(self, text: str, start: int, pattern_id: int) -> bool:
+        check_left, check_right, length = self._bounds[pattern_id]
+        if check_left and start > 0 and text[start - 1] in _ASCII_WORD_CHARS:
+            return False
+        end = start + length
+        if check_right and end < len(text) and text[end] in _ASCII_WORD_CHARS:
+            return False
+        return True
+
+    def classify(self, question: str) -> Dict[str, Any]:
+        """질문을 한 번 스캔하여 키워드, 산업 분류, 선정 이유를 추출"""
+        question_lower = question.lower()
+        same_length = len(question_lower) == len(question)
+
+        industry_priority: Optional[int] = None
+        keyword_hits: Dict[int, List[int]] = {}
+        is_comparison = False
+
+        for start, pattern_id in self._automaton.iter(question_lower):
+            if not self._at_word_boundary(question_lower, start, pattern_id):
+                continue
+            for kind, value in self._tags[pattern_id]:
+                if kind == KIND_INDUSTRY:
+                    if industry_priority is None or value < industry_priority:
+                        industry_priority = value
+                elif kind == KIND_KEYWORD:
+                    keyword_hits.setdefault(value, []).append(start)
+                else:
+                    is_comparison = True
+
+        detected_industry = self.industries[industry_priority] if industry_priority is not None else None
+
+        detected_keyword = None
+        detected_keyword_reason = None
+        if keyword_hits:
+            order = min(keyword_hits)
+            keyword = self.current_keywords[order]
+            detected_keyword = keyword
+            if same_length:
+                exact_starts = [s for s in keyword_hits[order] if question.startswith(keyword, s)]
+            else:
+                exact_starts = [question.find(keyword)] if keyword in question else []
+
+            if exact_starts:
+                detected_keyword_reason = "질문 내 명시된 이유 없음"
+                for start in exact_starts:
+                    match_reason = REASON_PREFIX_PATTERN.search(question, 0, start)
+                    if match_reason:
+                        context_word = match_reason.group(1).strip()
+                        trailing_text = question[start + len(keyword):].strip()
+                        if trailing_text:
+                            detected_keyword_reason = f"{context_word} {trailing_text}"[:50].strip()
+                        else:
+                            detected_keyword_reason = f"{context_word} 언급"
+                        break
+            else:
+                detected_keyword_reason = "질문 내 간접적으로 언급됨"
+
+        question_type = "general"
+
+        comparison_keywords = []
+        if is_comparison:
+            question_type = "comparison"
+            comparison_keywords = [self.current_keywords[order] for order in sorted(keyword_hits)]
+            if not comparison_keywords and detected_keyword:
+                comparison_keywords = [detected_keyword]
+
+            if not comparison_keywords:
+                match = COMPARISON_PATTERN.search(question_lower)
+                if match:
+                    comparison_keywords = [match.group(1).strip(), match.group(2).strip()]
+                else:
+                    comparison_keywords = self.current_keywords[:2]
+
+        elif detected_industry and detected_keyword:
+            question_type = "industry_analysis"
+        elif detected_keyword:
+            question_type = "keyword_trend"
+
+        return {
+            "type": question_type,
+            "keyword": detected_keyword,
+            "keywords": comparison_keywords,
+            "industry": detected_industry or "사회",
+            "reason": detected_keyword_reason
+        }
+
+
+_router: Optional[QuestionRouter] = None
+_router_key: Optional[Tuple[str, ...]] = None
+_router_lock = threading.Lock()
+
+
+def get_question_router(current_keywords: Sequence[str]) -> QuestionRouter:
+    """현재 키워드 집합에 맞는 라우터 반환 (키워드가 바뀔 때만 재구성)"""
+    global _router, _router_key
+    key = tuple(current_keywords)
+    router = _router
+    if router is not None and _router_key == key:
+        return router
+
+    with _router_lock:
+        if _router is None or _router_key != key:
+            _router = QuestionRouter(key)
+            _router_key = key
+            logger.info(f"🔁 질문 라우터 재구성: 키워드 {len(key)}개")
+        return _router
+
+
+if __name__ == "__main__":
+    import time
+
+    for size in (10, 1000, 10000):
+        keywords = [f"키워드{i}" for i in range(size)]
+        question = f"최근 키워드{size - 1} 관련하여 반도체 시장 전망은?"
+
+        started = time.perf_counter()
+        router = QuestionRouter(keywords)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        runs = 1000
+        started = time.perf_counter()
+        for _ in range(runs):
+            router.classify(question)
+        classify_us = (time.perf_counter() - started) / runs * 1_000_000
+
+        print(f"keywords={size:>6} build={build_ms:8.1f}ms classify={classify_us:8.1f}us")
@@ -0,0 +1,255 @@
+import asyncio
+import atexit
+import logging
+import smtplib
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from core.config import (
+    EMAIL_HOST, EMAIL_PORT, EMAIL_USER, EMAIL_PASSWORD, EMAIL_SMTP_REQUIRE_TLS,
+    EMAIL_SMTP_POOL_SIZE, EMAIL_SMTP_TIMEOUT_SECONDS, EMAIL_MAX_MESSAGES_PER_CONNECTION,
+    EMAIL_SEND_MAX_RETRIES, EMAIL_PACING_MAX_DELAY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# 서버가 속도 제한/일시적 거부로 응답하는 코드 (잠시 후 재시도)
+TRANSIENT_SMTP_CODES = {421, 450, 451, 452, 454}
+
+
+class TransientSmtpError(Exception):
+    """일시적 SMTP 오류 (속도 제한 등) - 재시도 대상"""
+
+    def __init__(self, code: Optional[int], message: str):
+        super().__init__(f"{code} {message}" if code else message)
+        self.code = code
+
+
+def _classify_smtp_error(error: Exception) -> Exception:
+    """smtplib 예외를 일시적(TransientSmtpError) / 영구 오류로 분류"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        if codes and all(code in TRANSIENT_SMTP_CODES for code in codes):
+            return TransientSmtpError(codes[0], str(error.recipients))
+        return error
+    if isinstance(error, smtplib.SMTPResponseException):
+        if error.smtp_code in TRANSIENT_SMTP_CODES:
+            return TransientSmtpError(error.smtp_code, str(error.smtp_error))
+        return error
+    if isinstance(error, (smtplib.SMTPServerDisconnected, OSError)):
+        return TransientSmtpError(None, str(error))
+    return error
+
+
+class AdaptivePacer:
+    """서버 응답에 맞춰 발송 간격을 조절 (속도 제한 시 두 배로 늘리고, 성공하면 천천히 줄임)"""
+
+    def __init__(self, max_delay: float, base_delay: float = 0.5):
+        self.max_delay = max_delay
+        self.base_delay = base_delay
+        self.delay = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    async def wait(self):
+        if self.delay <= 0:
+            return
+        # 동시 발송자들이 같은 간격을 공유하도록 다음 발송 시각을 예약
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+        await asyncio.sleep(slot - now)
+
+    def on_success(self):
+        if self.delay:
+            self.delay = self.delay * 0.8 if self.delay > 0.05 else 0.0
+
+    def on_throttle(self):
+        self.delay = min(self.max_delay, max(self.base_delay, self.delay * 2))
+        logger.warning(f"🐢 SMTP 속도 제한 감지, 발송 간격 {self.delay:.2f}초로 조정")
+
+
+class SmtpConnectionPool:
+    """인증된 SMTP 연결을 재사용하는 풀 (필요할 때 생성, 오류나 발송 한도 도달 시 교체)
+
+    풀이 가득 차면 다른 스레드가 연결을 반납하거나 폐기할 때까지 기다립니다.
+    (폐기되면 빈 자리에 새 연결을 만들고, 풀이 닫히면 대기 중인 스레드도 깨어나 오류를 받음)
+    """
+
+    def __init__(self, host: str, port: int, user: Optional[str], password: Optional[str], size: int,
+                 timeout: float = EMAIL_SMTP_TIMEOUT_SECONDS, max_messages: int = EMAIL_MAX_MESSAGES_PER_CONNECTION,
+                 require_tls: bool = EMAIL_SMTP_REQUIRE_TLS):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.require_tls = require_tls
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_messages = max(1, max_messages)
+        self._idle: List[list] = []  # LIFO: 최근에 쓴 연결부터 재사용
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.require_tls or (self.user and self.password):
+                # 계정 정보가 평문으로 나가지 않도록 STARTTLS 필수 (서버가 지원하지 않으면 SMTPNotSupportedError)
+                server.starttls()  # TLS 암호화
+                server.ehlo()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        logger.info(f"📮 SMTP 연결 생성: {self.host}:{self.port}")
+        return server
+
+    def _take(self) -> list:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("SMTP 연결 풀이 종료되었습니다.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self._cond.wait()
+
+        try:
+            return [self._connect(), 0]
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self):
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _discard(self, slot: list):
+        self._release_slot()
+        try:
+            slot[0].quit()
+        except Exception:
+            try:
+                slot[0].close()
+            except Exception:
+                pass
+
+    def _give_back(self, slot: list):
+        with self._cond:
+            if not self._closed and slot[1] < self.max_messages:
+                self._idle.append(slot)
+                self._cond.notify()
+                return
+        self._discard(slot)
+
+    def send(self, msg):
+        """풀의 연결로 메시지 한 건 발송 (동기, 스레드에서 호출)"""
+        slot = self._take()
+        try:
+            slot[0].send_message(msg)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError):
+            # 메시지 단위 거부 - 연결은 계속 사용 가능
+            slot[1] += 1
+            self._give_back(slot)
+            raise
+        except Exception:
+            self._discard(slot)
+            raise
+        slot[1] += 1
+        self._give_back(slot)
+
+    def close(self):
+        """풀의 모든 연결 종료 (사용 중인 연결은 반납될 때 종료)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for slot in idle:
+            self._discard(slot)
+
+
+class SmtpSender:
+    """연결 풀 + 동시 발송 제한 + 적응형 간격 조절을 묶은 비동기 발송기"""
+
+    def __init__(self, pool: SmtpConnectionPool, concurrency: Optional[int] = None,
+                 max_retries: int = EMAIL_SEND_MAX_RETRIES, max_delay: float = EMAIL_PACING_MAX_DELAY_SECONDS):
+        self.pool = pool
+        self.concurrency = concurrency or pool.size
+        self.max_retries = max_retries
+        self.pacer = AdaptivePacer(max_delay)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def send(self, msg):
+        """메시지 한 건 발송 - 일시적 오류는 간격을 늘려 재시도, 영구 오류는 예외로 전달"""
+        async with self._get_semaphore():
+            for attempt in range(self.max_retries + 1):
+                await self.pacer.wait()
+                try:
+                    await asyncio.to_thread(self.pool.send, msg)
+                    self.pacer.on_success()
+                    return
+                except Exception as e:
+                    error = _classify_smtp_error(e)
+                    if not isinstance(error, TransientSmtpError) or attempt == self.max_retries:
+                        if error is e:
+                            raise
+                        raise error from e
+                    self.pacer.on_throttle()
+                    logger.warning(f"⚡ SMTP 일시적 오류, 재시도 {attempt + 1}/{self.max_retries} ({msg['To']}): {error}")
+
+    async def send_many(self, messages: Iterable) -> Dict[str, Optional[str]]:
+        """여러 메시지를 동시에 발송하고 수신자별 결과 반환 (성공: None, 실패: 오류 메시지)"""
+        async def send_one(msg):
+            try:
+                await self.send(msg)
+                return msg["To"], None
+            except Exception as e:
+                logger.error(f"❌ 이메일 발송 실패 ({msg['To']}): {e}")
+                return msg["To"], str(e)
+
+        results = await asyncio.gather(*[send_one(msg) for msg in messages])
+        return dict(results)
+
+    def close(self):
+        self.pool.close()
+
+
+_sender: Optional[SmtpSender] = None
+_sender_lock = threading.Lock()
+
+
+def get_smtp_sender() -> SmtpSender:
+    """프로세스 전역 SMTP 발송기 반환"""
+    global _sender
+    with _sender_lock:
+        if _sender is None:
+            pool = SmtpConnectionPool(EMAIL_HOST, EMAIL_PORT, EMAIL_USER, EMAIL_PASSWORD, EMAIL_SMTP_POOL_SIZE)
+            _sender = SmtpSender(pool)
+        return _sender
+
+
+def close_smtp_sender():
+    global _sender
+    with _sender_lock:
+        if _sender is not None:
+            _sender.close()
+            _sender = None
+            logger.info("🧹 SMTP 연결 풀 종료")
+
+
+atexit.register(close_smtp_sender)
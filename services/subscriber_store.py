@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.config import SUBSCRIBERS_FILE
+from core.database import ensure_column, ensure_schema, get_connection, transaction
+from services.digest_service import DEFAULT_DIGEST_SEGMENTS, normalize_segments
+
+logger = logging.getLogger(__name__)
+
+# email은 정규화(공백 제거, 소문자)해서 저장하고 unique 인덱스로 중복 구독을 막음
+# segments: 관심 분야(digest_service.DIGEST_SEGMENTS 키)를 쉼표로 연결, NULL이면 기본 분야
+SUBSCRIBERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscribers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL,
+    subscribed_at TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    segments TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_subscribers_email ON subscribers (email);
+CREATE TABLE IF NOT EXISTS subscriber_migrations (
+    name TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+"""
+
+SUBSCRIBERS_PAGE_MAX = 1000
+JSON_MIGRATION_NAME = "subscribers_json"
+
+_migration_lock = threading.Lock()
+_migrated = False
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def _row_to_subscriber(row) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "email": row["email"],
+        "subscribed_at": row["subscribed_at"],
+        "active": bool(row["active"]),
+        "segments": row["segments"].split(",") if row["segments"] else list(DEFAULT_DIGEST_SEGMENTS),
+    }
+
+
+def _json_migration_done(conn) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM subscriber_migrations WHERE name = ?", (JSON_MIGRATION_NAME,)
+    ).fetchone() is not None
+
+
+def _migrate_json_subscribers():
+    """예전 subscribers.json을 한 번만 DB로 옮기고 완료 여부는 DB에 기록
+
+    저장소에 포함된 파일이므로 이름을 바꾸거나 지우지 않습니다. (배포 때마다 작업 트리가 바뀌지 않도록)
+    완료 기록과 구독자 추가를 한 트랜잭션으로 처리하므로 여러 워커가 동시에 실행해도 한 번만 옮겨집니다.
+    """
+    if not os.path.exists(SUBSCRIBERS_FILE):
+        return
+    with get_connection() as conn:
+        if _json_migration_done(conn):
+            return
+    try:
+        with open(SUBSCRIBERS_FILE, 'r', encoding='utf-8') as f:
+            subscribers = json.load(f)
+    except Exception as e:
+        logger.error(f"❌ 구독자 파일 읽기 오류, 마이그레이션 건너뜀: {e}")
+        return
+
+    rows = [
+        (normalize_email(s["email"]), s.get("subscribed_at") or datetime.now().isoformat(), int(bool(s.get("active", True))))
+        for s in subscribers
+        if isinstance(s, dict) and s.get("email")
+    ]
+    with get_connection() as conn, transaction(conn, immediate=True):
+        if _json_migration_done(conn):
+            return  # 다른 워커가 먼저 옮김
+        conn.executemany("INSERT OR IGNORE INTO subscribers (email, subscribed_at, active) VALUES (?, ?, ?)", rows)
+        conn.execute(
+            "INSERT INTO subscriber_migrations (name, migrated_at, count) VALUES (?, ?, ?)",
+            (JSON_MIGRATION_NAME, datetime.now().isoformat(), len(rows)),
+        )
+    logger.info(f"📦 구독자 {len(rows)}명을 {SUBSCRIBERS_FILE}에서 데이터베이스로 이전")
+
+
+def _init_store():
+    global _migrated
+    if _migrated:
+        return
+    with _migration_lock:
+        if not _migrated:
+            ensure_schema("subscribers", SUBSCRIBERS_SCHEMA)
+            ensure_column("subscribers", "segments", "TEXT")  # 분야 선택 도입 전에 만들어진 DB
+            _migrate_json_subscribers()
+            _migrated = True
+
+
+def add_subscriber(email: str, segments: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+    """구독자 추가 (이미 구독된 이메일이면 None, 알 수 없는 분야면 ValueError)"""
+    _init_store()
+    email = normalize_email(email)
+    segments = normalize_segments(segments) if segments else list(DEFAULT_DIGEST_SEGMENTS)
+    subscribed_at = datetime.now().isoformat()
+    with get_connection() as conn:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO subscribers (email, subscribed_at, active, segments) VALUES (?, ?, 1, ?)",
+            (email, subscribed_at, ",".join(segments)),
+        )
+        if cur.rowcount == 0:
+            return None
+        return {"id": cur.lastrowid, "email": email, "subscribed_at": subscribed_at, "active": True, "segments": segments}
+
+
+def update_subscriber_segments(email: str, segments: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """구독자의 관심 분야 변경 (구독자가 없으면 None, 알 수 없는 분야면 ValueError)"""
+    _init_store()
+    segments = normalize_segments(segments)
+    with get_connection() as conn:
+        cur = conn.execute(
+            "UPDATE subscribers SET segments = ? WHERE email = ?", (",".join(segments), normalize_email(email))
+        )
+    if cur.rowcount == 0:
+        return None
+    return get_subscriber(email)
+
+
+def get_subscriber(email: str) -> Optional[Dict[str, Any]]:
+    _init_store()
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT id, email, subscribed_at, active, segments FROM subscribers WHERE email = ?", (normalize_email(email),)
+        ).fetchone()
+    return _row_to_subscriber(row) if row else None
+
+
+def list_subscribers(limit: int = 100, after_id: int = 0,
+                     active_only: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """id 순으로 한 페이지 조회 (다음 페이지 커서는 마지막 id, 더 없으면 None)"""
+    _init_store()
+    limit = max(1, min(limit, SUBSCRIBERS_PAGE_MAX))
+    query = "SELECT id, email, subscribed_at, active, segments FROM subscribers WHERE id > ?"
+    if active_only:
+        query += " AND active = 1"
+    with get_connection() as conn:
+        rows = conn.execute(query + " ORDER BY id LIMIT ?", (after_id, limit + 1)).fetchall()
+
+    subscribers = [_row_to_subscriber(row) for row in rows[:limit]]
+    next_cursor = subscribers[-1]["id"] if len(rows) > limit else None
+    return subscribers, next_cursor
+
+
+def iter_subscribers(batch_size: int = SUBSCRIBERS_PAGE_MAX, active_only: bool = False) -> Iterator[Dict[str, Any]]:
+    """구독자를 페이지 단위로 읽어 하나씩 반환 (전체 목록을 메모리에 올리지 않음)"""
+    after_id = 0
+    while True:
+        page, next_cursor = list_subscribers(batch_size, after_id, active_only=active_only)
+        yield from page
+        if next_cursor is None:
+            return
+        after_id = next_cursor
+
+
+def iter_active_subscribers(batch_size: int = SUBSCRIBERS_PAGE_MAX) -> Iterator[Dict[str, Any]]:
+    """활성 구독자를 페이지 단위로 읽어 하나씩 반환"""
+    return iter_subscribers(batch_size, active_only=True)
+
+
+def count_subscribers(active_only: bool = False) -> int:
+    _init_store()
+    query = "SELECT COUNT(*) FROM subscribers" + (" WHERE active = 1" if active_only else "")
+    with get_connection() as conn:
+        return conn.execute(query).fetchone()[0]
@@ -1,73 +1,316 @@
+import asyncio
 import logging
-import time
 import feedparser
-import urllib.parse
+import httpx
 import json
+import re
+import threading
+import time
+import unicodedata
+import numpy as np
+
+from lxml import etree
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from dateutil import parser as date_parser
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.config import openai_client, AZURE_OPENAI_DEPLOYMENT
-from utils.helpers import set_cache
+from core.config import (
+    openai_client, AZURE_OPENAI_DEPLOYMENT, TRENDING_PAGE_TIMEOUT_SECONDS, TRENDING_FETCH_MODE, TRENDING_RSS_URL, TRENDING_STALE_SECONDS,
+    TRENDING_COUNTRY_CODES, TRENDING_SHARD_SIZE,
+    SHARED_KEYWORD_ACCEPT_THRESHOLD, SHARED_KEYWORD_REVIEW_THRESHOLD, SHARED_KEYWORD_MAX_LLM_PAIRS,
+    NEWS_CACHE_TTL_SECONDS, NEWS_CACHE_MAX_ENTRIES, NEWS_FETCH_TIMEOUT_SECONDS, NEWS_PREFETCH_CONCURRENCY,
+)
+from utils.helpers import get_cache, get_cache_entry, set_cache, cache_update_lock, register_persistent_cache_key, run_coroutine_sync
+from utils.llm_usage import chat_completion
+from utils.lazy_import import lazy_import
+from services.browser_pool import get_browser_pool
+from services.embedding_service import encode_texts, cluster_by_similarity, similar_pairs, label_components
 
 logger = logging.getLogger(__name__)
 
+# selenium은 브라우저 수집 모드에서 처음 쓸 때 로드 (RSS 모드에서는 로드하지 않음)
+selenium_exceptions = lazy_import("selenium.common.exceptions")
+selenium_by = lazy_import("selenium.webdriver.common.by")
+selenium_ec = lazy_import("selenium.webdriver.support.expected_conditions")
+selenium_ui = lazy_import("selenium.webdriver.support.ui")
+
 TRENDING_CACHE_KEY = "google_trending_keywords"
+# 마지막으로 키워드를 수집한 시각 (변경이 없으면 스냅샷은 다시 쓰지 않으므로 따로 기록, 재시작 후 stale 판단에 사용)
+TRENDING_REFRESHED_CACHE_KEY = "google_trending_refreshed"
+PAIR_DECISIONS_CACHE_KEY = "google_trending_pair_decisions"
+PAIR_KEY_SEPARATOR = "\t"
 
-def cache_google_tranding(country_codes):
-    def fetch_keywords(geo):
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
+# 스냅샷과 쌍 판정 결과는 만료 없이 유지 (변경이 있을 때만 다시 씀, 모든 노드가 같은 캐시 백엔드를 공유)
+register_persistent_cache_key(TRENDING_CACHE_KEY)
+register_persistent_cache_key(TRENDING_REFRESHED_CACHE_KEY)
+register_persistent_cache_key(PAIR_DECISIONS_CACHE_KEY)
 
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        keywords = []
+TRENDING_KEYWORDS_PER_COUNTRY = 10
+
+# 이 프로세스의 트렌딩 갱신 상태 (서버 시작 후 첫 갱신 전에는 이전 스냅샷을 stale로 제공)
+_refresh_lock = threading.Lock()
+_snapshot_lock = threading.Lock()
+_in_progress = set()
+_refresh_state = {"running": 0, "last_started": None, "last_success": None, "last_error": None}
+
+# 영문 접미어는 띄어쓴 경우만 제거 (Woodstock, Livestock, Timeshares 는 그대로), 한글은 붙여 써도 제거
+_STOCK_SUFFIX_PATTERN = re.compile(r"(?:\s+(?:stock|stocks|shares|share price)|\s*(?:주가|주식))$")
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+# 예전 버전이 수집 실패 시 스냅샷에 저장하던 자리표시 키워드 (이전 데이터로 취급하지 않음)
+_SAMPLE_KEYWORD_PATTERN = re.compile(r"^Sample keyword \d+ for [A-Z]{2}$")
+
+_RSS_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=False)
+
+def parse_trending_rss(payload: bytes):
+    """Google Trends RSS 응답에서 트렌딩 키워드 목록 추출"""
+    root = etree.fromstring(payload, parser=_RSS_PARSER)
+    titles = root.xpath("/rss/channel/item/title/text()")
+    keywords = []
+    for title in titles:
+        title = title.strip()
+        if title and title not in keywords:
+            keywords.append(title)
+        if len(keywords) >= TRENDING_KEYWORDS_PER_COUNTRY:
+            break
+    return keywords
+
+async def fetch_trending_keywords_over_http(country_codes, timeout=None, rss_url=None):
+    """브라우저 없이 RSS 피드로 모든 국가의 트렌딩 키워드를 동시에 수집 (실패한 국가는 제외)"""
+    timeout = timeout or TRENDING_PAGE_TIMEOUT_SECONDS
+    rss_url = rss_url or TRENDING_RSS_URL
+
+    async def fetch(client, geo):
         try:
+            response = await client.get(rss_url, params={"geo": geo})
+            response.raise_for_status()
+            keywords = parse_trending_rss(response.content)
+            if not keywords:
+                logger.warning(f"⚠️ {geo} RSS 트렌드 결과 없음")
+            return geo, keywords
+        except Exception as e:
+            logger.warning(f"⚠️ {geo} RSS 트렌드 수집 실패: {e}")
+            return geo, []
+
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits, follow_redirects=True) as client:
+        results = await asyncio.gather(*(fetch(client, geo) for geo in country_codes))
+
+    return {geo: keywords for geo, keywords in results if keywords}
+
+def fetch_trending_keywords_with_browser(geo, timeout=None):
+    """풀링된 headless Chrome으로 Google Trends 페이지에서 국가별 키워드 수집"""
+    timeout = timeout or TRENDING_PAGE_TIMEOUT_SECONDS
+    keywords = []
+    try:
+        with get_browser_pool().browser() as driver:
+            driver.set_page_load_timeout(timeout)
             url = f"https://trends.google.com/trending?geo={geo}&hl=en&category=3&hours=24&sort=search-volume"
             driver.get(url)
-            time.sleep(4)
-            elems = driver.find_elements(By.CLASS_NAME, 'mZ3RIc') or driver.find_elements(By.CSS_SELECTOR, '[data-ved]')
+            try:
+                elems = selenium_ui.WebDriverWait(driver, timeout).until(
+                    selenium_ec.presence_of_all_elements_located((selenium_by.By.CLASS_NAME, 'mZ3RIc'))
+                )
+            except selenium_exceptions.TimeoutException:
+                logger.warning(f"⏱️ {geo} 트렌드 요소 대기 시간 초과 ({timeout}s), 대체 선택자 사용")
+                elems = driver.find_elements(selenium_by.By.CSS_SELECTOR, '[data-ved]')
             keywords = [e.text.strip() for e in elems if e.text.strip()][:10]
-        except Exception as e:
-            logger.error(f"Error fetching trends for {geo}: {e}")
-            keywords = [f"Sample keyword {i} for {geo}" for i in range(1, 6)]
-        finally:
-            driver.quit()
-        return [{"country": geo, "keyword": kw} for kw in keywords]
+    except Exception as e:
+        logger.error(f"Error fetching trends for {geo}: {e}")
+        keywords = []
+    return [{"country": geo, "keyword": kw} for kw in keywords]
 
-    with ThreadPoolExecutor(max_workers=min(len(country_codes), 5)) as executor:
-        results = list(executor.map(fetch_keywords, country_codes))
+def get_country_shards(country_codes=None, shard_size=None):
+    """국가 목록을 갱신 단위(shard)로 분할"""
+    country_codes = list(country_codes or TRENDING_COUNTRY_CODES)
+    shard_size = max(1, shard_size or TRENDING_SHARD_SIZE)
+    return [country_codes[i:i + shard_size] for i in range(0, len(country_codes), shard_size)]
 
-    raw_keywords = [item for sublist in results for item in sublist]
-            
-    shared_indices = find_shared_keywords_with_llm(raw_keywords)
+def cache_google_tranding(country_codes, time_budget=None):
+    """지정한 국가들의 트렌딩 키워드를 갱신해 스냅샷에 국가별로 병합 (진행 상태는 get_trending_status로 조회)
+
+    time_budget(초)이 주어지면 그 안에 수집하지 못한 국가는 이전 데이터를 유지합니다.
+    """
+    with _refresh_lock:
+        country_codes = [geo for geo in country_codes if geo not in _in_progress]
+        if not country_codes:
+            logger.info("⏭️ 요청한 국가의 트렌딩 갱신이 이미 진행 중이라 건너뜁니다.")
+            return
+        _in_progress.update(country_codes)
+        _refresh_state["running"] += 1
+        _refresh_state["last_started"] = time.time()
+
+    try:
+        deadline = time.monotonic() + time_budget if time_budget else None
+        keywords_by_country = _fetch_trending_keywords(country_codes, deadline)
+        # 여러 워커가 같은 스냅샷 파일을 병합하므로 프로세스 간에도 직렬화
+        with _snapshot_lock, cache_update_lock(TRENDING_CACHE_KEY):
+            _refresh_google_trending(keywords_by_country, country_codes)
+        if keywords_by_country:
+            set_cache(TRENDING_REFRESHED_CACHE_KEY, sorted(keywords_by_country))
+        _refresh_state["last_success"] = time.time()
+        _refresh_state["last_error"] = None
+        prefetch_trending_news(country_codes)
+    except Exception as e:
+        _refresh_state["last_error"] = str(e)
+        logger.error(f"❌ 트렌딩 갱신 실패 ({', '.join(country_codes)}): {e}", exc_info=True)
+    finally:
+        with _refresh_lock:
+            _in_progress.difference_update(country_codes)
+            _refresh_state["running"] -= 1
+
+def _snapshot_refreshed_at(snapshot):
+    """모든 워커/노드가 공유하는 마지막 수집 시각 (기록이 없으면 스냅샷 저장 시각, 둘 다 없으면 None)"""
+    entry = get_cache_entry(TRENDING_REFRESHED_CACHE_KEY)
+    if entry is not None:
+        return time.time() - entry[1]
+    try:
+        return datetime.strptime(snapshot["timestamp"], '%Y-%m-%d %H:%M:%S').timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def get_trending_status():
+    """트렌딩 스냅샷 상태: 스냅샷 유무, stale 여부, 갱신 진행 상태
 
-    for i, item in enumerate(raw_keywords):
-        item["shared"] = i in shared_indices
+    stale은 저장된 스냅샷의 마지막 수집 시각으로 판단하므로, 재시작 직후에도 스냅샷이 최신이면 stale이 아닙니다.
+    """
+    snapshot = get_cache(TRENDING_CACHE_KEY, expiry_seconds=None)
+    has_snapshot = snapshot is not None
+    last_success = _snapshot_refreshed_at(snapshot) if has_snapshot else None
+    if _refresh_state["last_success"] is not None:
+        last_success = max(last_success or 0, _refresh_state["last_success"])
+    stale = last_success is None or time.time() - last_success > TRENDING_STALE_SECONDS
+    return {
+        "has_snapshot": has_snapshot,
+        "stale": stale,
+        "refreshing": _refresh_state["running"] > 0,
+        "last_success": last_success,
+        "last_error": _refresh_state["last_error"],
+    }
+
+def _remaining(deadline):
+    return None if deadline is None else deadline - time.monotonic()
+
+def _fetch_trending_keywords(country_codes, deadline=None):
+    """RSS 우선, 실패한 국가만 브라우저로 수집 (deadline 초과 시 해당 국가는 결과에서 제외)"""
+    keywords_by_country = {}
+    if TRENDING_FETCH_MODE == "http":
+        remaining = _remaining(deadline)
+        timeout = TRENDING_PAGE_TIMEOUT_SECONDS if remaining is None else max(1, min(TRENDING_PAGE_TIMEOUT_SECONDS, remaining))
+        keywords_by_country = run_coroutine_sync(fetch_trending_keywords_over_http(country_codes, timeout=timeout))
+        logger.info(f"📡 RSS 트렌드 수집: {len(keywords_by_country)}/{len(country_codes)}개 국가 성공")
+
+    fallback_codes = [geo for geo in country_codes if geo not in keywords_by_country]
+    remaining = _remaining(deadline)
+    if fallback_codes and (remaining is None or remaining > 0):
+        pool = get_browser_pool()
+        executor = ThreadPoolExecutor(max_workers=min(len(fallback_codes), pool.size))
+        futures = {executor.submit(fetch_trending_keywords_with_browser, geo): geo for geo in fallback_codes}
+        done, not_done = wait(futures, timeout=remaining)
+        executor.shutdown(wait=False, cancel_futures=True)
+        for future in done:
+            keywords = [item["keyword"] for item in future.result()]
+            if keywords:
+                keywords_by_country[futures[future]] = keywords
+        if not_done:
+            logger.warning(f"⏱️ 시간 예산 초과로 이전 데이터 유지: {', '.join(futures[f] for f in not_done)}")
+
+    return keywords_by_country
+
+def _refresh_google_trending(keywords_by_country, country_codes):
+    """수집 결과를 이전 스냅샷에 국가별로 병합하고, 변경이 있을 때만 공유 판정 후 저장"""
+    previous = get_cache(TRENDING_CACHE_KEY, expiry_seconds=None)
+    stored_items = previous.get("data", []) if isinstance(previous, dict) else []
+    previous_countries = previous.get("countries", {}) if isinstance(previous, dict) else {}
+
+    previous_items = [item for item in stored_items if not _SAMPLE_KEYWORD_PATTERN.match(item["keyword"])]
+    previous_by_country = {}
+    for item in previous_items:
+        previous_by_country.setdefault(item["country"], []).append(item["keyword"])
+
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    merged = {}
+    countries = {}
+    for geo in dict.fromkeys(TRENDING_COUNTRY_CODES + list(country_codes)):
+        if geo in keywords_by_country:
+            merged[geo] = keywords_by_country[geo]
+        elif geo in previous_by_country:
+            # 수집 실패/시간 초과 국가는 이전 데이터를 그대로 유지
+            merged[geo] = previous_by_country[geo]
+        else:
+            # 자리표시 키워드를 저장하면 공유 키워드 판정에도 섞이므로 스냅샷에서 제외하고 다음 갱신 때 다시 시도
+            if geo in country_codes:
+                logger.warning(f"⚠️ {geo} 트렌드 수집 실패, 이전 데이터도 없어 이번 스냅샷에서 제외")
+            continue
+
+        previous_meta = previous_countries.get(geo, {})
+        if merged[geo] == previous_by_country.get(geo) and previous_meta:
+            countries[geo] = previous_meta
+        else:
+            countries[geo] = {"updated_at": now}
+
+    raw_keywords = [{"country": geo, "keyword": kw} for geo, keywords in merged.items() for kw in keywords]
+
+    previous_pairs = [(item["country"], item["keyword"]) for item in stored_items]
+    current_pairs = [(item["country"], item["keyword"]) for item in raw_keywords]
+
+    if current_pairs == previous_pairs:
+        logger.info("♻️ 트렌딩 키워드 변경 없음: 캐시 파일 유지")
+        return
+
+    added = set(current_pairs) - set(previous_pairs)
+    removed = set(previous_pairs) - set(current_pairs)
+    logger.info(f"🔀 트렌딩 키워드 변경: 추가 {len(added)}개, 제거 {len(removed)}개")
+
+    if not added and not removed:
+        # 순위만 바뀐 경우 이전 공유 판정을 그대로 재사용
+        previous_shared = {(item["country"], item["keyword"]): item.get("shared", False) for item in previous_items}
+        for item, key in zip(raw_keywords, current_pairs):
+            item["shared"] = previous_shared[key]
+    else:
+        pair_decisions = dict(get_cache(PAIR_DECISIONS_CACHE_KEY, expiry_seconds=None) or {})
+        shared_indices = set(find_shared_keywords_hybrid(raw_keywords, pair_decisions))
+
+        for i, item in enumerate(raw_keywords):
+            item["shared"] = i in shared_indices
+
+        # 현재 키워드 사이의 판정만 남겨 판정 캐시가 무한히 커지지 않도록 정리
+        current_keywords = {item["keyword"] for item in raw_keywords}
+        pair_decisions = {
+            key: same for key, same in pair_decisions.items()
+            if all(kw in current_keywords for kw in key.split(PAIR_KEY_SEPARATOR))
+        }
+        set_cache(PAIR_DECISIONS_CACHE_KEY, pair_decisions)
 
     cache_data = {
-        "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "timestamp": now,
         "data": raw_keywords,
+        "countries": countries,
         "status": "success"
     }
     
     set_cache(TRENDING_CACHE_KEY, cache_data)
-    logger.info(f"Cached Google Trending Keywords to file: {cache_data}")
+    logger.info(f"Cached Google Trending Keywords to file: {len(raw_keywords)}개 키워드, {len(countries)}개 국가")
+
+def parse_llm_json(response_text):
+    """LLM 응답에서 JSON 객체 추출 (코드 블록/앞뒤 설명 문장 허용)"""
+    text = response_text.strip()
+    if "```" in text:
+        text = text.split("```")[1]
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return json.loads(text[start:end + 1])
 
 def find_shared_keywords_with_llm(raw_keywords):
     """LLM을 사용하여 공유 키워드 찾기"""
@@ -100,7 +343,8 @@ def find_shared_keywords_with_llm(raw_keywords):
         {{"shared_groups": [[0, 5, 12], [3, 8]]}}
         """
 
-        response = openai_client.chat.completions.create(
+        response = chat_completion(
+            openai_client, "find_shared_keywords_with_llm",
             model=AZURE_OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": "You are an AI assistant that identifies shared trending keywords across multiple countries."},
@@ -111,15 +355,9 @@ def find_shared_keywords_with_llm(raw_keywords):
         )
 
         response_text = response.choices[0].message.content or "{}"
-        
-        # LLM 응답에서 JSON 코드 블록 정리 (e.g., ```json ... ```)
-        if "```" in response_text:
-            response_text = response_text.split('```')[1]
-            if response_text.startswith('json'):
-                response_text = response_text[4:]
 
         try:
-            data = json.loads(response_text.strip())
+            data = parse_llm_json(response_text)
             shared_groups = data.get("shared_groups", [])
             
             # 모든 그룹의 인덱스를 하나의 set으로 통합
@@ -128,98 +366,281 @@ def find_shared_keywords_with_llm(raw_keywords):
                 shared_indices.update(group)
                 
             return list(shared_indices)
-        except (json.JSONDecodeError, IndexError) as e:
+        except (ValueError, AttributeError) as e:
             logger.error(f"Failed to parse JSON from LLM response: '{response_text}', error: {e}")
             return []
     except Exception as e:
         logger.error(f"Error finding shared keywords with LLM: {e}")
         return []
 
-def find_shared_keywords_with_embedding(raw_keywords):
+def find_shared_keywords_with_embedding(raw_keywords, threshold=0.8, min_countries=3):
     """임베딩을 사용하여 공유 키워드 찾기"""
     try:
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # 키워드 그룹핑
-        keyword_groups = {}
-        for i, item in enumerate(raw_keywords):
-            kw = item['keyword']
-            if kw not in keyword_groups:
-                keyword_groups[kw] = []
-            keyword_groups[kw].append(i)
-
-        # 고유 키워드 및 임베딩
-        unique_keywords = list(keyword_groups.keys())
-        embeddings = model.encode(unique_keywords)
-        
-        # 코사인 유사도 계산
-        cosine_matrix = cosine_similarity(embeddings)
-        
-        # 유사도 기반 클러스터링
-        threshold = 0.8
-        clusters = []
-        visited = [False] * len(unique_keywords)
-        
-        for i in range(len(unique_keywords)):
-            if not visited[i]:
-                cluster = [i]
-                visited[i] = True
-                for j in range(i + 1, len(unique_keywords)):
-                    if not visited[j] and cosine_matrix[i][j] > threshold:
-                        cluster.append(j)
-                        visited[j] = True
-                clusters.append(cluster)
-
-        # 3개국 이상 공유 클러스터 필터링
-        shared_indices = set()
-        for cluster in clusters:
-            countries = set()
-            indices_in_cluster = []
-            for keyword_index in cluster:
-                keyword = unique_keywords[keyword_index]
-                for original_index in keyword_groups[keyword]:
-                    countries.add(raw_keywords[original_index]['country'])
-                    indices_in_cluster.append(original_index)
-            
-            if len(countries) >= 3:
-                shared_indices.update(indices_in_cluster)
-                
-        return list(shared_indices)
+        if not raw_keywords:
+            return []
+
+        # 고유 키워드 및 원본 인덱스 → 고유 키워드 인덱스 매핑
+        unique_keywords = list(dict.fromkeys(item['keyword'] for item in raw_keywords))
+        keyword_index = {kw: i for i, kw in enumerate(unique_keywords)}
+        item_keyword = np.fromiter((keyword_index[item['keyword']] for item in raw_keywords), dtype=np.int64, count=len(raw_keywords))
+
+        # 유사도 기반 클러스터링 (연결 요소)
+        embeddings = encode_texts(unique_keywords)
+        item_cluster = cluster_by_similarity(embeddings, threshold)[item_keyword]
+
+        # 클러스터별 국가 수 계산 후 3개국 이상 공유 클러스터 필터링
+        country_codes = {}
+        item_country = np.fromiter((country_codes.setdefault(item['country'], len(country_codes)) for item in raw_keywords), dtype=np.int64, count=len(raw_keywords))
+        pairs = np.unique(np.stack([item_cluster, item_country], axis=1), axis=0)
+        country_counts = np.bincount(pairs[:, 0], minlength=int(item_cluster.max()) + 1)
+        shared_mask = country_counts[item_cluster] >= min_countries
+
+        return np.flatnonzero(shared_mask).tolist()
     except Exception as e:
         logger.error(f"Error finding shared keywords with embedding: {e}")
         return []
 
-def get_news(country: str, keyword: str):
-    """Google News RSS 피드를 사용하여 특정 국가 및 키워드에 대한 뉴스 가져오기"""
+def normalize_keyword(keyword):
+    """로컬 매칭용 키워드 정규화 (유니코드 정규화, 악센트/구두점 제거, 주가 관련 접미어 제거)"""
+    text = unicodedata.normalize("NFKD", keyword.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = unicodedata.normalize("NFC", text)
+    text = _STOCK_SUFFIX_PATTERN.sub("", text)
+    return _NON_WORD_PATTERN.sub("", text)
+
+def adjudicate_pairs_with_llm(pairs):
+    """애매한 후보 쌍만 LLM에 보내 같은 대상인지 판정 (반환: 같은 대상으로 판정된 쌍 인덱스 set)"""
+    if not pairs:
+        return set()
+
+    pairs_text = "\n".join(
+        f"{i}: '{a['keyword']}' ({a['country']}) <-> '{b['keyword']}' ({b['country']})"
+        for i, (a, b) in enumerate(pairs)
+    )
+    prompt = f"""
+        Each line below is a candidate pair of trending keywords from two different countries.
+        Decide for each pair whether both keywords refer to the EXACT same entity
+        (brand, company, person, product, event), even across languages or spellings.
+        A company name combined with 'stock', 'shares' or '주가' is the same entity as the company.
+        Thematically related but different targets are NOT the same.
+
+        Pairs:
+        {pairs_text}
+
+        Respond ONLY in JSON format like this:
+        {{"same": [0, 3]}}
+        """
+
+    response = chat_completion(
+        openai_client, "adjudicate_pairs_with_llm",
+        model=AZURE_OPENAI_DEPLOYMENT,
+        messages=[
+            {"role": "system", "content": "You are an AI assistant that decides whether two trending keywords refer to the same entity."},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=300,
+        temperature=0,
+        response_format={"type": "json_object"}
+    )
+    data = parse_llm_json(response.choices[0].message.content or "{}")
+    return {int(i) for i in data.get("same", []) if 0 <= int(i) < len(pairs)}
+
+def pair_decision_key(keyword_a, keyword_b):
+    """LLM 판정 캐시 키 (키워드 순서와 무관)"""
+    return PAIR_KEY_SEPARATOR.join(sorted((keyword_a, keyword_b)))
+
+def find_shared_keywords_hybrid(raw_keywords, pair_decisions=None):
+    """단계별 공유 키워드 탐지: 로컬 정규화 매칭 → 임베딩 유사도 → 애매한 쌍만 LLM 판정
+
+    pair_decisions 가 주어지면 이전 LLM 판정을 재사용하고, 새로 판정한 결과를 기록합니다.
+    """
+    if pair_decisions is None:
+        pair_decisions = {}
+    if not raw_keywords:
+        return []
+
     try:
-        encoded_kw = urllib.parse.quote(keyword)
-        hl_map = {'US': 'en', 'GB': 'en-GB', 'MX': 'es-419', 'KR': 'ko', 'IN': 'en-IN', 'ZA': 'en-ZA', 'AU': 'en-AU'}
-        
-        hl = hl_map.get(country, 'en')
-        ceid = f"{country}:{hl}"
-        url = f"https://news.google.com/rss/search?q={encoded_kw}&hl={hl}&gl={country}&ceid={ceid}"
-        
-        feed = feedparser.parse(url)
-        
-        articles = []
-        for entry in feed.entries[:5]:  # 상위 5개 기사
-            title = entry.title
-            link = entry.link
-            published_str = getattr(entry, 'published', '')
-            published_date = date_parser.parse(entry.published).strftime('%Y-%m-%d')
-            
-            articles.append({
-                "title": title,
-                "link": link,
-                "published": published_str,
-                "published_dt": published_date
-            })
-            
+        # 1단계: 정규화 키가 같은 키워드끼리 로컬에서 묶음
+        normalized = [normalize_keyword(item["keyword"]) or item["keyword"] for item in raw_keywords]
+        unique_keys = list(dict.fromkeys(normalized))
+        key_index = {key: i for i, key in enumerate(unique_keys)}
+        item_key = np.fromiter((key_index[key] for key in normalized), dtype=np.int64, count=len(raw_keywords))
+        representative = {}
+        for i, key in enumerate(item_key.tolist()):
+            representative.setdefault(key, raw_keywords[i])
+        key_countries = [set() for _ in unique_keys]
+        for key, item in zip(item_key.tolist(), raw_keywords):
+            key_countries[key].add(item["country"])
+
+        # 2단계: 임베딩 유사도로 명확한 쌍은 자동 병합, 애매한 구간만 후보로
+        embeddings = encode_texts([representative[i]["keyword"] for i in range(len(unique_keys))])
+        rows, cols, scores = similar_pairs(embeddings, SHARED_KEYWORD_REVIEW_THRESHOLD)
+        cross_country = np.fromiter(
+            (key_countries[r] != key_countries[c] or len(key_countries[r]) > 1 for r, c in zip(rows.tolist(), cols.tolist())),
+            dtype=bool, count=len(rows)
+        )
+        rows, cols, scores = rows[cross_country], cols[cross_country], scores[cross_country]
+
+        accepted = scores > SHARED_KEYWORD_ACCEPT_THRESHOLD
+        edge_rows, edge_cols = [rows[accepted]], [cols[accepted]]
+
+        # 3단계: 이미 같은 클러스터가 아닌 애매한 쌍만 유사도 순으로 LLM에 판정 요청
+        labels = label_components(len(unique_keys), rows[accepted], cols[accepted])
+        review = np.flatnonzero(~accepted)
+        review = review[labels[rows[review]] != labels[cols[review]]]
+        review = review[np.argsort(-scores[review], kind="stable")]
+        review_keys = [
+            pair_decision_key(representative[int(rows[k])]["keyword"], representative[int(cols[k])]["keyword"])
+            for k in review
+        ]
+        confirmed = [k for k, key in zip(review.tolist(), review_keys) if pair_decisions.get(key) is True]
+        undecided = [(k, key) for k, key in zip(review.tolist(), review_keys) if key not in pair_decisions]
+        reused_count = len(review) - len(undecided)
+        undecided = undecided[:SHARED_KEYWORD_MAX_LLM_PAIRS]
+        if undecided:
+            candidate_pairs = [(representative[int(rows[k])], representative[int(cols[k])]) for k, _ in undecided]
+            same = adjudicate_pairs_with_llm(candidate_pairs)
+            for position, (k, key) in enumerate(undecided):
+                pair_decisions[key] = position in same
+                if position in same:
+                    confirmed.append(k)
+            logger.info(f"🤖 LLM 판정: 신규 후보 {len(undecided)}쌍 중 {len(same)}쌍 동일 대상 (기존 판정 재사용 {reused_count}쌍)")
+        if confirmed:
+            confirmed = np.asarray(confirmed, dtype=np.int64)
+            edge_rows.append(rows[confirmed])
+            edge_cols.append(cols[confirmed])
+
+        labels = label_components(len(unique_keys), np.concatenate(edge_rows), np.concatenate(edge_cols))
+        item_cluster = labels[item_key]
+
+        # 서로 다른 2개국 이상에 걸친 클러스터만 공유 키워드로 판정
+        cluster_countries = {}
+        for cluster, item in zip(item_cluster.tolist(), raw_keywords):
+            cluster_countries.setdefault(cluster, set()).add(item["country"])
+        return [i for i, cluster in enumerate(item_cluster.tolist()) if len(cluster_countries[cluster]) >= 2]
+    except Exception as e:
+        logger.error(f"Error in hybrid shared keyword detection, falling back to LLM: {e}", exc_info=True)
+        return find_shared_keywords_with_llm(raw_keywords)
+
+NEWS_HL_MAP = {'US': 'en', 'GB': 'en-GB', 'MX': 'es-419', 'KR': 'ko', 'IN': 'en-IN', 'ZA': 'en-ZA', 'AU': 'en-AU'}
+
+# (country, keyword) → (만료 시각, 기사 목록) LRU 캐시
+_news_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_news_cache_lock = threading.Lock()
+_news_client = None
+_news_client_loop = None
+
+def _get_news_client():
+    """현재 이벤트 루프에 묶인 공유 httpx 클라이언트 (루프가 바뀌면 새로 생성)"""
+    global _news_client, _news_client_loop
+    loop = asyncio.get_running_loop()
+    if _news_client is None or _news_client_loop is not loop:
+        _news_client = httpx.AsyncClient(
+            timeout=NEWS_FETCH_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            follow_redirects=True,
+        )
+        _news_client_loop = loop
+    return _news_client
+
+def _get_cached_news(key):
+    with _news_cache_lock:
+        entry = _news_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, articles = entry
+        if expires_at < time.time():
+            del _news_cache[key]
+            return None
+        _news_cache.move_to_end(key)
+        return articles
+
+def _set_cached_news(key, articles):
+    with _news_cache_lock:
+        _news_cache[key] = (time.time() + NEWS_CACHE_TTL_SECONDS, articles)
+        _news_cache.move_to_end(key)
+        while len(_news_cache) > NEWS_CACHE_MAX_ENTRIES:
+            _news_cache.popitem(last=False)
+
+def _parse_news_feed(payload: bytes):
+    feed = feedparser.parse(payload)
+
+    articles = []
+    for entry in feed.entries[:5]:  # 상위 5개 기사
+        published_str = entry.get('published', '')
+        published_parsed = entry.get('published_parsed')
+        if published_parsed:
+            published_date = time.strftime('%Y-%m-%d', published_parsed)
+        elif published_str:
+            published_date = date_parser.parse(published_str).strftime('%Y-%m-%d')
+        else:
+            published_date = ''
+
+        articles.append({
+            "title": entry.get('title', ''),
+            "link": entry.get('link', ''),
+            "published": published_str,
+            "published_dt": published_date
+        })
+    return articles
+
+async def get_news(country: str, keyword: str, client=None, refresh=False):
+    """Google News RSS 피드를 사용하여 특정 국가 및 키워드에 대한 뉴스 가져오기 (TTL 캐시)
+
+    refresh=True면 캐시를 건너뛰고 새로 받아 덮어씁니다. (실패 시 기존 캐시 유지)
+    """
+    key = (country, keyword)
+    cached = _get_cached_news(key)
+    if cached is not None and not refresh:
+        return cached
+
+    try:
+        hl = NEWS_HL_MAP.get(country, 'en')
+        params = {"q": keyword, "hl": hl, "gl": country, "ceid": f"{country}:{hl}"}
+
+        response = await (client or _get_news_client()).get("https://news.google.com/rss/search", params=params)
+        response.raise_for_status()
+        articles = _parse_news_feed(response.content)
+        _set_cached_news(key, articles)
         return articles
     except Exception as e:
         logger.error(f"Error fetching news for {keyword} in {country}: {e}", exc_info=True)
-        return [] 
-    
+        return cached or []
+
+async def prefetch_news(items, concurrency=None):
+    """트렌딩 키워드 목록의 뉴스를 동시에 새로 가져와 캐시를 갱신 (만료 전에 교체되므로 사용자 요청은 캐시 적중)"""
+    semaphore = asyncio.Semaphore(concurrency or NEWS_PREFETCH_CONCURRENCY)
+    limits = httpx.Limits(max_connections=concurrency or NEWS_PREFETCH_CONCURRENCY)
+
+    async with httpx.AsyncClient(timeout=NEWS_FETCH_TIMEOUT_SECONDS, limits=limits, follow_redirects=True) as client:
+        async def fetch(country, keyword):
+            async with semaphore:
+                return await get_news(country, keyword, client=client, refresh=True)
+
+        results = await asyncio.gather(*(fetch(item["country"], item["keyword"]) for item in items))
+    logger.info(f"📰 트렌딩 뉴스 미리 가져오기 완료: {sum(1 for r in results if r)}/{len(items)}건")
+
+def prefetch_trending_news(country_codes=None):
+    """현재 트렌딩 스냅샷에 표시되는 키워드의 뉴스를 미리 캐시 (country_codes 지정 시 해당 국가만)"""
+    snapshot = get_cache(TRENDING_CACHE_KEY, expiry_seconds=None)
+    items = snapshot.get("data", []) if isinstance(snapshot, dict) else []
+    if country_codes is not None:
+        items = [item for item in items if item["country"] in country_codes]
+    if not items:
+        return
+    try:
+        run_coroutine_sync(prefetch_news(items))
+    except Exception as e:
+        logger.error(f"❌ 트렌딩 뉴스 미리 가져오기 실패: {e}", exc_info=True)
+
+async def close_news_client():
+    """공유 뉴스 httpx 클라이언트 종료"""
+    global _news_client, _news_client_loop
+    if _news_client is not None:
+        await _news_client.aclose()
+        _news_client = None
+        _news_client_loop = None
+
 if __name__ == "__main__":
-    cache_google_tranding(["US", "GB", "MX", "KR", "IN", "ZA", "AU"])
+    cache_google_tranding(TRENDING_COUNTRY_CODES)
     
\ No newline at end of file
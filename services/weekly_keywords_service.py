@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from core.config import CACHE_MAX_STALE_SECONDS, WEEKLY_KEYWORDS_MAX_WEEKS, WEEK_BUCKET_MIN_OVERLAP_DAYS
+from services.deepsearch_service import fetch_tech_articles, fetch_global_tech_articles
+from services.openai_service import extract_keywords_with_gpt, extract_global_keywords_with_gpt
+from services.sample_service import get_sample_keywords_by_date, get_global_sample_keywords_by_date
+from utils.helpers import get_or_fill_cache, CACHE_HIT, CACHE_STALE, CACHE_MISS
+
+logger = logging.getLogger(__name__)
+
+WEEKLY_KEYWORDS_LIMIT = 5
+
+REGION_SOURCES = {
+    "domestic": (fetch_tech_articles, extract_keywords_with_gpt, get_sample_keywords_by_date),
+    "global": (fetch_global_tech_articles, extract_global_keywords_with_gpt, get_global_sample_keywords_by_date),
+}
+
+
+class InvalidDateRange(ValueError):
+    """요청한 조회 기간이 잘못됨 (날짜 형식, 순서, 최대 주 수) - 클라이언트 오류"""
+
+
+class WeekBucket(NamedTuple):
+    """ISO 주 단위 캐시 버킷 (월요일 ~ 일요일)"""
+    label: str  # 예: "2025-W29"
+    start: str
+    end: str
+    overlap_days: int  # 요청 기간과 겹치는 일수
+
+
+def iso_week_buckets(start_date: str, end_date: str) -> List[WeekBucket]:
+    """요청 기간과 겹치는 ISO 주 목록 반환"""
+    try:
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    except ValueError as e:
+        raise InvalidDateRange(f"날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {start_date} ~ {end_date}") from e
+    if start > end:
+        raise InvalidDateRange(f"시작일이 종료일보다 늦습니다: {start_date} ~ {end_date}")
+
+    buckets = []
+    monday = start - timedelta(days=start.weekday())
+    while monday <= end:
+        sunday = monday + timedelta(days=6)
+        year, week, _ = monday.isocalendar()
+        overlap = (min(sunday, end) - max(monday, start)).days + 1
+        buckets.append(WeekBucket(f"{year}-W{week:02d}", monday.isoformat(), sunday.isoformat(), overlap))
+        monday += timedelta(days=7)
+    return buckets
+
+
+def previous_iso_week(today: Optional[date] = None) -> WeekBucket:
+    """지난주(월~일) ISO 주 버킷 - 주간 다이제스트 기본 기간"""
+    today = today or date.today()
+    monday = today - timedelta(days=today.weekday() + 7)
+    return iso_week_buckets(monday.isoformat(), (monday + timedelta(days=6)).isoformat())[0]
+
+
+def canonical_week_buckets(start_date: str, end_date: str) -> List[WeekBucket]:
+    """요청 기간을 캐시 키로 쓸 ISO 주 버킷으로 정규화
+
+    가장자리에 하루 정도만 걸친 주는 버려서 "월~금", "월~다음 주 월", "일~일" 같은
+    비슷한 요청이 같은 주 버킷을 공유하도록 합니다.
+    """
+    buckets = iso_week_buckets(start_date, end_date)
+    canonical = [b for b in buckets if b.overlap_days >= WEEK_BUCKET_MIN_OVERLAP_DAYS]
+    if not canonical:
+        canonical = [max(buckets, key=lambda b: b.overlap_days)]
+    if len(canonical) > WEEKLY_KEYWORDS_MAX_WEEKS:
+        raise InvalidDateRange(f"조회 기간은 최대 {WEEKLY_KEYWORDS_MAX_WEEKS}주까지 가능합니다: {start_date} ~ {end_date}")
+    return canonical
+
+
+def _keyword_entry(item: Any, position: int, size: int):
+    if isinstance(item, dict):
+        return item.get("keyword"), item.get("count") or size - position, item
+    return item, size - position, None
+
+
+def merge_weekly_keywords(weekly_keywords: List[List[Any]], limit: int = WEEKLY_KEYWORDS_LIMIT) -> List[Any]:
+    """주별 키워드 목록을 count 합계 기준으로 합쳐 상위 limit개 반환 (count가 없으면 순위로 가중치)"""
+    if len(weekly_keywords) == 1:
+        return weekly_keywords[0][:limit]
+
+    totals: Dict[str, Dict[str, Any]] = {}
+    has_details = False
+    for keywords in weekly_keywords:
+        for position, item in enumerate(keywords):
+            name, count, details = _keyword_entry(item, position, len(keywords))
+            if not name:
+                continue
+            has_details = has_details or details is not None
+            total = totals.setdefault(name, {"keyword": name, "count": 0, "best": 0, "details": None})
+            total["count"] += count
+            # 선정 이유 등은 해당 키워드가 가장 강했던 주의 값을 사용
+            if details is not None and count > total["best"]:
+                total["best"], total["details"] = count, details
+
+    ranked = sorted(totals.values(), key=lambda t: t["count"], reverse=True)[:limit]
+    if not has_details:
+        return [t["keyword"] for t in ranked]
+    return [
+        {**(t["details"] or {}), "keyword": t["keyword"], "count": t["count"], "rank": rank}
+        for rank, t in enumerate(ranked, 1)
+    ]
+
+
+class WeekKeywordsUnavailable(Exception):
+    """주간 키워드를 계산하지 못함 (기사 없음, GPT 추출 실패) - 샘플 데이터는 캐시하지 않기 위해 사용"""
+
+
+async def _get_week_keywords(region: str, bucket: WeekBucket, stats: Dict[str, Any]):
+    fetch_articles, extract_keywords, get_samples = REGION_SOURCES[region]
+
+    async def fill_keywords():
+        logger.info(f"📅 {region} 주간 키워드 계산 (DeepSearch & GPT): {bucket.label} ({bucket.start} ~ {bucket.end})")
+        articles = await fetch_articles(bucket.start, bucket.end)
+        stats["articles_count"] += len(articles)
+
+        if not articles:
+            raise WeekKeywordsUnavailable(f"{region} Tech 기사 없음: {bucket.label}")
+        extracted_keywords = await extract_keywords(articles)
+        if extracted_keywords:
+            return extracted_keywords[:WEEKLY_KEYWORDS_LIMIT]
+        raise WeekKeywordsUnavailable(f"{region} GPT 키워드 추출 실패: {bucket.label}")
+
+    # 같은 주를 동시에 요청하면 진행 중인 계산(다른 워커 포함)을 기다렸다가 결과를 공유하고,
+    # TTL이 지난 값은 최대 stale 시간까지 즉시 제공하면서 백그라운드에서 한 번만 갱신
+    try:
+        return await get_or_fill_cache(f"{region}_week_{bucket.label}", fill_keywords, max_stale_seconds=CACHE_MAX_STALE_SECONDS)
+    except WeekKeywordsUnavailable as e:
+        # 샘플은 이번 응답에만 사용하고 캐시하지 않음 (다음 요청에서 다시 계산)
+        logger.warning(f"❌ {e}, 샘플 데이터 사용")
+        stats["sample_weeks"].append(bucket.label)
+        return get_samples(bucket.start, bucket.end), CACHE_MISS
+
+
+async def get_weekly_keywords(region: str, start_date: str, end_date: str) -> Dict[str, Any]:
+    """요청 기간을 ISO 주 버킷으로 정규화해 주별 캐시에서 키워드를 조합
+
+    반환: keywords, canonical_range, weeks, cache_state(hit/stale/miss), articles_count,
+    sample_weeks(계산에 실패해 샘플 데이터로 대체한 주)
+    """
+    buckets = canonical_week_buckets(start_date, end_date)
+    stats = {"articles_count": 0, "sample_weeks": []}
+    results = await asyncio.gather(*[_get_week_keywords(region, b, stats) for b in buckets])
+
+    states = {state for _, state in results}
+    if CACHE_MISS in states:
+        cache_state = CACHE_MISS
+    elif CACHE_STALE in states:
+        cache_state = CACHE_STALE
+    else:
+        cache_state = CACHE_HIT
+
+    return {
+        "keywords": merge_weekly_keywords([keywords for keywords, _ in results]),
+        "canonical_range": f"{buckets[0].start} ~ {buckets[-1].end}",
+        "weeks": [b.label for b in buckets],
+        "cache_state": cache_state,
+        "articles_count": stats["articles_count"],
+        "sample_weeks": sorted(stats["sample_weeks"]),
+    }
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from utils import helpers  # noqa: E402
+from utils.cache_backend import CACHE_LOCK_DIR  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_workdir(tmp_path, monkeypatch):
+    """테스트마다 빈 작업 디렉터리 사용 (cache_data/, SQLite DB 등 상대 경로 파일이 여기에 생성됨)"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(CACHE_LOCK_DIR, exist_ok=True)
+    helpers._memory_cache.clear()
+    helpers._last_touched.clear()
+    yield tmp_path
+    helpers._memory_cache.clear()
+    helpers._last_touched.clear()
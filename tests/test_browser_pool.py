@@ -0,0 +1,104 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from services import browser_pool
+from services.browser_pool import BrowserPool
+
+
+class FakeWebDriverException(Exception):
+    pass
+
+
+class FakeTimeoutException(FakeWebDriverException):
+    pass
+
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number = number
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def fake_selenium(monkeypatch):
+    """selenium 없이 풀 동작만 확인 (WebDriver 예외 클래스를 대체)"""
+    monkeypatch.setattr(browser_pool, "selenium_exceptions", SimpleNamespace(
+        TimeoutException=FakeTimeoutException, WebDriverException=FakeWebDriverException
+    ))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = BrowserPool(1)
+    created = []
+
+    def create():
+        created.append(FakeDriver(len(created) + 1))
+        return created[-1]
+
+    monkeypatch.setattr(pool, "_create", create)
+    pool.created = created
+    return pool
+
+
+def _borrow_in_thread(pool, result):
+    def run():
+        try:
+            with pool.browser() as driver:
+                result["driver"] = driver
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_healthy_browser_is_reused(pool):
+    with pool.browser() as first:
+        pass
+    with pool.browser() as second:
+        pass
+    assert second is first
+    assert len(pool.created) == 1
+
+
+def test_timeout_keeps_browser(pool):
+    with pytest.raises(FakeTimeoutException):
+        with pool.browser():
+            raise FakeTimeoutException()
+    with pool.browser() as driver:
+        assert driver.number == 1
+
+
+def test_waiter_wakes_when_leased_browser_is_discarded(pool):
+    result = {}
+    with pytest.raises(FakeWebDriverException):
+        with pool.browser() as broken:
+            waiter = _borrow_in_thread(pool, result)
+            waiter.join(0.2)
+            assert waiter.is_alive()  # 풀이 가득 차서 대기 중
+            raise FakeWebDriverException("chrome crashed")
+
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert broken.quit_called
+    assert result["driver"].number == 2  # 폐기된 자리에 새로 생성
+
+
+def test_waiter_wakes_when_pool_closes(pool):
+    result = {}
+    with pool.browser():
+        waiter = _borrow_in_thread(pool, result)
+        waiter.join(0.2)
+        assert waiter.is_alive()
+        pool.close()
+        waiter.join(5)
+        assert not waiter.is_alive()
+        assert isinstance(result["error"], RuntimeError)
+    assert pool.created[0].quit_called  # 닫힌 뒤 반납된 브라우저는 종료
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from utils import cache_backend, helpers
+from utils.cache_backend import CacheBackend, CacheLock, FileCacheBackend, RedisCacheBackend
+
+
+@pytest.fixture
+def make_node(monkeypatch):
+    """같은 (in-process) Redis 서버를 공유하는 API 노드의 캐시 백엔드 생성"""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = pytest.importorskip("redis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url", classmethod(lambda cls, url: fakeredis.FakeRedis(server=server)))
+    return lambda: RedisCacheBackend("redis://localhost:6379/0", "test:")
+
+
+@pytest.fixture
+def node(make_node, monkeypatch):
+    backend = make_node()
+    monkeypatch.setattr(cache_backend, "_backend", backend)
+    return backend
+
+
+def _switch_node(monkeypatch, backend):
+    """다른 노드의 프로세스처럼 보이도록 백엔드와 프로세스 내 LRU를 교체"""
+    monkeypatch.setattr(cache_backend, "_backend", backend)
+    helpers._memory_cache.clear()
+
+
+def test_backend_interfaces_are_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+    with pytest.raises(TypeError):
+        CacheLock()
+
+    class PartialBackend(CacheBackend):
+        def signature(self, cache_key):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+@pytest.fixture
+def counted_stats(monkeypatch):
+    calls = []
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        calls.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(cache_backend.os, "stat", stat)
+    return calls
+
+
+def test_file_hit_stats_only_the_new_path(counted_stats):
+    backend = FileCacheBackend()
+    signature = backend.write("k", b"payload", retain_seconds=None)
+    counted_stats.clear()
+
+    assert backend.read("k") == (signature, b"payload")
+    assert backend.signature("k") == signature
+    assert counted_stats == [backend.filepath("k")] * 2
+
+
+def test_file_legacy_json_is_read_until_rewritten():
+    backend = FileCacheBackend()
+    legacy_path = backend.legacy_filepath("k")
+    with open(legacy_path, "w") as f:
+        json.dump({"timestamp": 0, "data": [1]}, f)
+
+    signature, payload = backend.read("k")
+    assert json.loads(payload) == {"timestamp": 0, "data": [1]}
+    assert backend.signature("k") == signature
+
+    backend.write("k", b"new", retain_seconds=None)
+    assert not os.path.exists(legacy_path)
+    assert backend.read("k")[1] == b"new"
+
+
+def test_file_delete_legacy_only_when_signature_matches():
+    backend = FileCacheBackend()
+    with open(backend.legacy_filepath("k"), "w") as f:
+        f.write("{}")
+
+    assert backend.delete("k", ("other", 0)) is False
+    assert backend.delete("k", backend.signature("k")) is True
+    assert backend.read("k") is None
+
+
+def test_write_read_and_versioned_signature(node):
+    assert node.read("k") is None
+    assert node.signature("k") is None
+
+    first = node.write("k", b"one", retain_seconds=60)
+    assert node.read("k") == (first, b"one")
+    second = node.write("k", b"two", retain_seconds=None)
+
+    assert second != first
+    assert node.signature("k") == second
+    assert node._client.ttl(node._data_key("k")) == -1  # 무기한 보관
+    assert node._client.ttl(node._version_key("k")) == -1
+
+
+def test_delete_only_when_signature_matches(node):
+    stale = node.write("k", b"one", retain_seconds=60)
+    current = node.write("k", b"two", retain_seconds=60)
+
+    assert node.delete("k", stale) is False
+    assert node.read("k") == (current, b"two")
+    assert node.delete("k", current) is True
+    assert node.read("k") is None
+
+
+def test_nodes_see_each_others_writes(make_node, monkeypatch):
+    node_a, node_b = make_node(), make_node()
+
+    _switch_node(monkeypatch, node_a)
+    helpers.set_cache("weekly", {"v": 1})
+    version_a = helpers.get_cache_version("weekly")
+
+    _switch_node(monkeypatch, node_b)
+    assert helpers.get_cache("weekly") == {"v": 1}
+    assert helpers.get_cache_version("weekly") == version_a
+    helpers.set_cache("weekly", {"v": 2})
+
+    _switch_node(monkeypatch, node_a)
+    assert helpers.get_cache("weekly") == {"v": 2}
+    assert helpers.get_cache_version("weekly") != version_a
+
+
+def test_expired_value_is_deleted_across_nodes(node, monkeypatch):
+    helpers.set_cache("old", {"v": 1})
+    monkeypatch.setattr(helpers.time, "time", lambda: 10 ** 10)
+
+    assert helpers.get_cache("old", expiry_seconds=60) is None
+    assert node.read("old") is None
+
+
+def test_lock_is_exclusive_across_nodes(make_node):
+    pytest.importorskip("lupa")  # redis-py 락 해제는 Lua 스크립트 사용
+    node_a, node_b = make_node(), make_node()
+    lock_a = node_a.lock("k", "fill", hold_seconds=30)
+    lock_b = node_b.lock("k", "fill", hold_seconds=30)
+
+    assert lock_a.acquire(timeout=0)
+    assert not lock_b.acquire(timeout=0)
+    lock_a.release()
+    assert lock_b.acquire(timeout=0)
+    lock_b.release()
+
+
+def test_fill_runs_once_across_nodes(make_node, monkeypatch):
+    pytest.importorskip("lupa")
+    node_a, node_b = make_node(), make_node()
+    calls = []
+
+    async def fill():
+        calls.append(1)
+        return {"v": len(calls)}
+
+    _switch_node(monkeypatch, node_a)
+    assert asyncio.run(helpers.get_or_fill_cache("shared", fill)) == ({"v": 1}, helpers.CACHE_MISS)
+    _switch_node(monkeypatch, node_b)
+    assert asyncio.run(helpers.get_or_fill_cache("shared", fill)) == ({"v": 1}, helpers.CACHE_HIT)
+    assert calls == [1]
@@ -0,0 +1,40 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import helpers
+
+
+def test_fill_lock_wait_does_not_hold_executor_threads():
+    other_worker = helpers._cache_lock("weekly", "fill")
+    assert other_worker.acquire(timeout=0)
+
+    async def fill():
+        return {"v": 1}
+
+    async def run():
+        # 기본 스레드 풀에 스레드 하나만 두고, 락을 기다리는 동안에도 다른 작업이 실행되는지 확인
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        waiter = asyncio.ensure_future(helpers.get_or_fill_cache("weekly", fill))
+        await asyncio.sleep(0.2)
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "free"), timeout=1) == "free"
+        assert not waiter.done()
+
+        other_worker.release()
+        return await asyncio.wait_for(waiter, timeout=5)
+
+    assert asyncio.run(run()) == ({"v": 1}, helpers.CACHE_MISS)
+
+
+def test_fill_lock_wait_times_out(monkeypatch):
+    monkeypatch.setattr(helpers, "CACHE_FILL_WAIT_SECONDS", 0.3)
+    other_worker = helpers._cache_lock("weekly", "fill")
+    assert other_worker.acquire(timeout=0)
+
+    async def fill():
+        return {"v": 1}
+
+    try:
+        # 대기 시간이 지나면 락 없이 직접 계산
+        assert asyncio.run(helpers.get_or_fill_cache("weekly", fill)) == ({"v": 1}, helpers.CACHE_MISS)
+    finally:
+        other_worker.release()
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+
+from services import embedding_service
+from utils import cache_manager
+from utils.cache_backend import EMBEDDING_CACHE_ROOT
+
+
+def _write_vector(model: str, name: str, last_used: float) -> str:
+    directory = os.path.join(EMBEDDING_CACHE_ROOT, model)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.npy")
+    np.save(path, np.zeros(256, dtype=np.float32))
+    os.utime(path, (last_used, last_used))
+    return path
+
+
+def test_sweep_evicts_least_recently_used_embeddings_across_model_dirs():
+    old_model = _write_vector("old-model", "a", 1_000)
+    stale = _write_vector("current-model", "b", 2_000)
+    fresh = _write_vector("current-model", "c", 3_000)
+    size = os.path.getsize(fresh)
+
+    evicted = cache_manager.sweep_embedding_cache(max_bytes=size)
+
+    assert evicted == 2
+    assert not os.path.exists(old_model)
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+    stats = cache_manager.get_cache_stats()
+    assert stats["embedding_files"] == 1
+    assert stats["embedding_bytes"] == size
+
+
+def test_sweep_removes_orphan_embedding_tmp_files():
+    directory = os.path.join(EMBEDDING_CACHE_ROOT, "model")
+    os.makedirs(directory)
+    orphan = os.path.join(directory, "a.npy.1.2.tmp")
+    open(orphan, "wb").close()
+    os.utime(orphan, (0, 0))
+
+    cache_manager.sweep_embedding_cache(max_bytes=1 << 20)
+
+    assert not os.path.exists(orphan)
+
+
+def test_memory_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(embedding_service, "EMBEDDING_MEMORY_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(embedding_service, "_memory_cache", type(embedding_service._memory_cache)())
+    for digest in ("a", "b"):
+        embedding_service._remember(digest, np.zeros(2))
+    assert embedding_service._load_cached("a") is not None  # a가 최근 사용
+
+    embedding_service._remember("c", np.zeros(2))
+
+    assert list(embedding_service._memory_cache) == ["a", "c"]
@@ -0,0 +1,76 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from services import digest_service
+from services.digest_service import DIGEST_SEGMENTS, DigestNotReady, get_weekly_digest, prepare_weekly_digest
+from services.weekly_keywords_service import previous_iso_week
+
+WEEK = previous_iso_week(date(2025, 7, 21))  # 2025-W29
+
+KEYWORDS_DATA = {
+    "domestic_keywords": [{"keyword": "반도체", "count": 30, "rank": 1}],
+    "global_keywords": [{"keyword": "Nvidia", "count": 25, "rank": 1}],
+    "period": f"{WEEK.start} ~ {WEEK.end}",
+    "weeks": [WEEK.label],
+    "is_sample": False,
+}
+
+
+@pytest.fixture
+def keywords_data(monkeypatch):
+    data = dict(KEYWORDS_DATA)
+
+    async def get_weekly_keywords_data(start_date, end_date):
+        return data
+
+    monkeypatch.setattr(digest_service, "get_weekly_keywords_data", get_weekly_keywords_data)
+    return data
+
+
+@pytest.fixture
+def insights(monkeypatch):
+    """분야별 LLM 섹션 생성 대체 (failing에 넣은 분야는 실패)"""
+    state = {"failing": set(), "calls": []}
+
+    async def generate_segment_insight(title, focus, data):
+        state["calls"].append(title)
+        if title in state["failing"]:
+            raise RuntimeError("LLM 일시 오류")
+        return f"{title} 분석"
+
+    monkeypatch.setattr(digest_service, "generate_segment_insight", generate_segment_insight)
+    return state
+
+
+def test_prepare_weekly_digest_stores_all_sections(keywords_data, insights):
+    digest = asyncio.run(prepare_weekly_digest(WEEK))
+
+    assert digest["week"] == WEEK.label
+    assert set(digest["sections"]) == set(DIGEST_SEGMENTS)
+    assert get_weekly_digest(WEEK.label)["generated_at"] == digest["generated_at"]
+
+
+def test_sample_keywords_are_not_persisted(keywords_data, insights):
+    keywords_data["is_sample"] = True
+
+    with pytest.raises(DigestNotReady):
+        asyncio.run(prepare_weekly_digest(WEEK))
+    assert get_weekly_digest(WEEK.label) is None
+    assert insights["calls"] == []
+
+
+def test_failed_section_is_not_persisted_and_retry_regenerates_only_it(keywords_data, insights):
+    failing_title = DIGEST_SEGMENTS["semiconductor"].title
+    insights["failing"].add(failing_title)
+
+    with pytest.raises(DigestNotReady):
+        asyncio.run(prepare_weekly_digest(WEEK))
+    assert get_weekly_digest(WEEK.label) is None
+
+    insights["failing"].clear()
+    insights["calls"].clear()
+    digest = asyncio.run(prepare_weekly_digest(WEEK))
+    assert insights["calls"] == [failing_title]
+    assert "반도체 분석" in digest["sections"]["semiconductor"]
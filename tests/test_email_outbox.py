@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from core import database
+from core.database import get_connection
+from services import email_outbox
+from services.email_outbox import create_email_job, get_email_job, start_email_job
+
+
+@pytest.fixture(autouse=True)
+def outbox_db(monkeypatch):
+    """테스트마다 새 SQLite 파일(작업 디렉터리)에 스키마 생성"""
+    monkeypatch.setattr(database, "_initialized_schemas", set())
+    monkeypatch.setattr(email_outbox, "_schema_ready", False)
+
+
+def _set_job_updated_at(job_id, updated_at):
+    with get_connection() as conn:
+        conn.execute("UPDATE email_jobs SET updated_at = ? WHERE id = ?", (updated_at, job_id))
+
+
+def test_worker_fails_job_abandoned_while_preparing(monkeypatch):
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(email_outbox, "EMAIL_USER", None)  # 발송 없이 복구만 확인
+
+    async def scenario():
+        worker = email_outbox.start_outbox_worker()
+        await asyncio.sleep(0.05)
+        # 워커가 이미 돌고 있는 중에 다른 프로세스가 준비하다 종료된 작업
+        abandoned = create_email_job("중단된 작업")
+        _set_job_updated_at(abandoned, time.time() - email_outbox.EMAIL_OUTBOX_LEASE_SECONDS - 1)
+        active = create_email_job("준비 중인 작업")
+        await asyncio.sleep(0.1)
+        await email_outbox.stop_outbox_worker()
+        assert worker.done()
+        return abandoned, active
+
+    abandoned, active = asyncio.run(scenario())
+    assert get_email_job(abandoned)["status"] == "failed"
+    assert get_email_job(active)["status"] == "preparing"
+
+
+def test_preparing_job_sends_heartbeat(monkeypatch):
+    monkeypatch.setattr(email_outbox, "HEARTBEAT_SECONDS", 0.01)
+    started = {}
+
+    async def slow_contents():
+        job = get_email_job(started["job_id"])
+        started["updated_at"] = job["updated_at"]
+        await asyncio.sleep(0.1)
+        started["heartbeat_at"] = get_email_job(started["job_id"])["updated_at"]
+        return {"": "본문"}
+
+    async def scenario():
+        started["job_id"] = start_email_job("제목", [("a@example.com", "")], slow_contents)
+        while get_email_job(started["job_id"])["status"] == "preparing" or "heartbeat_at" not in started:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert started["heartbeat_at"] > started["updated_at"]
+    assert get_email_job(started["job_id"])["status"] == "queued"
+
+
+def test_lease_is_renewed_while_batch_is_sending(monkeypatch):
+    monkeypatch.setattr(email_outbox, "EMAIL_USER", "sender@example.com")
+    monkeypatch.setattr(email_outbox, "EMAIL_PASSWORD", "secret")
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_LEASE_SECONDS", 0.2)
+    monkeypatch.setattr(email_outbox, "HEARTBEAT_SECONDS", 0.05)
+    reclaimed = []
+
+    class SlowSender:
+        """SMTP 재시도로 lease보다 오래 걸리는 발송"""
+
+        async def send(self, msg):
+            await asyncio.sleep(0.5)
+            # 같은 DB를 공유하는 다른 워커가 이 시점에 점유를 시도
+            reclaimed.extend(await asyncio.to_thread(email_outbox._claim_due_messages, 50))
+
+    monkeypatch.setattr(email_outbox, "get_smtp_sender", lambda: SlowSender())
+    job_id = create_email_job("제목")
+    email_outbox.enqueue_email_job(job_id, {"": "본문"}, [("a@example.com", ""), ("b@example.com", "")])
+
+    async def scenario():
+        email_outbox.start_outbox_worker()
+        while get_email_job(job_id)["status"] != "done":
+            await asyncio.sleep(0.02)
+        await email_outbox.stop_outbox_worker()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert reclaimed == []
+    assert get_email_job(job_id)["counts"]["sent"] == 2
+
+
+LEGACY_SCHEMA = """
+CREATE TABLE email_jobs (
+    id TEXT PRIMARY KEY, subject TEXT NOT NULL, content TEXT, status TEXT NOT NULL, error TEXT,
+    total INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, updated_at REAL NOT NULL
+);
+CREATE TABLE email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL REFERENCES email_jobs(id), recipient TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL,
+    claimed_by TEXT, claimed_at REAL, last_error TEXT, sent_at REAL, UNIQUE (job_id, recipient)
+);
+"""
+
+
+def test_jobs_queued_before_variants_still_deliver():
+    # variant 도입 전 스키마로 발송 대기 중이던 작업
+    now = time.time()
+    with get_connection() as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute(
+            "INSERT INTO email_jobs (id, subject, content, status, total, created_at, updated_at) "
+            "VALUES ('legacy', '제목', '<p>이전 본문</p>', 'queued', 1, ?, ?)", (now, now)
+        )
+        conn.execute("INSERT INTO email_outbox (job_id, recipient, next_attempt_at) VALUES ('legacy', 'a@example.com', ?)", (now,))
+
+    email_outbox._init_schema()
+    messages = email_outbox._claim_due_messages(10)
+
+    assert [(m["recipient"], m["content"]) for m in messages] == [("a@example.com", "<p>이전 본문</p>")]
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services import trending_service
+from utils.helpers import set_cache
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def _restart(monkeypatch):
+    """재시작 직후처럼 이 프로세스에서는 아직 갱신한 적이 없는 상태로 되돌림"""
+    monkeypatch.setattr(trending_service, "_refresh_state", {
+        "running": 0, "last_started": None, "last_success": None, "last_error": None,
+    })
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    _restart(monkeypatch)
+
+
+def _fake_refresh(monkeypatch):
+    monkeypatch.setattr(trending_service, "_fetch_trending_keywords", lambda codes, deadline=None: {"US": ["tesla"]})
+    monkeypatch.setattr(trending_service, "find_shared_keywords_hybrid", lambda raw, decisions=None: [])
+    monkeypatch.setattr(trending_service, "prefetch_trending_news", lambda codes=None: None)
+    trending_service.cache_google_tranding(["US"])
+
+
+def test_not_ready_without_snapshot(client):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+
+
+def test_fresh_snapshot_is_ready_after_restart(client, monkeypatch):
+    _fake_refresh(monkeypatch)
+    _restart(monkeypatch)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_snapshot_without_refresh_record_uses_its_timestamp(client):
+    set_cache(trending_service.TRENDING_CACHE_KEY, {
+        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'), "data": [], "countries": {}, "status": "success",
+    })
+
+    assert client.get("/health/ready").json()["status"] == "ready"
+
+
+def test_old_refresh_is_stale(client, monkeypatch):
+    _fake_refresh(monkeypatch)
+    _restart(monkeypatch)
+    later = time.time() + trending_service.TRENDING_STALE_SECONDS + 60
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "stale"
@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.config import NEWS_CACHE_TTL_SECONDS
+from services import trending_service
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>news</title>
+<item><title>{title}</title><link>https://example.com/{title}</link>
+<pubDate>Mon, 20 Oct 2025 09:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+@pytest.fixture(autouse=True)
+def empty_news_cache(monkeypatch):
+    monkeypatch.setattr(trending_service, "_news_cache", type(trending_service._news_cache)())
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _get_news(handler, refresh=False):
+    async with _client(handler) as client:
+        return await trending_service.get_news("US", "tesla", client=client, refresh=refresh)
+
+
+def _feed(title):
+    return lambda request: httpx.Response(200, text=FEED.format(title=title))
+
+
+def test_ttl_outlives_hourly_shard_refresh():
+    assert NEWS_CACHE_TTL_SECONDS >= 60 * 60
+
+
+def test_refresh_replaces_cached_articles():
+    assert asyncio.run(_get_news(_feed("old")))[0]["title"] == "old"
+    assert asyncio.run(_get_news(_feed("new")))[0]["title"] == "old"  # 일반 요청은 캐시 사용
+
+    assert asyncio.run(_get_news(_feed("new"), refresh=True))[0]["title"] == "new"
+    assert asyncio.run(_get_news(_feed("newer")))[0]["title"] == "new"
+
+
+def test_failed_refresh_keeps_cached_articles():
+    asyncio.run(_get_news(_feed("old")))
+
+    articles = asyncio.run(_get_news(lambda request: httpx.Response(503), refresh=True))
+
+    assert articles[0]["title"] == "old"
+    assert asyncio.run(_get_news(_feed("new")))[0]["title"] == "old"
@@ -0,0 +1,61 @@
+import pytest
+
+from services import question_router
+from services.question_router import AhoCorasick, QuestionRouter, get_question_router
+
+KEYWORDS = ["삼성전자", "테슬라", "Apple", "반도체 관세"]
+
+
+def test_aho_corasick_reports_overlapping_matches_in_order():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+
+    matches = [(start, automaton.patterns[pattern_id]) for start, pattern_id in automaton.iter("ushers")]
+
+    assert sorted(matches) == [(1, "she"), (2, "he"), (2, "hers")]
+
+
+def test_aho_corasick_handles_shared_prefixes_and_korean():
+    automaton = AhoCorasick(["반도체", "반도체 관세", "관세", ""])
+
+    matches = [automaton.patterns[pattern_id] for _, pattern_id in automaton.iter("미국 반도체 관세 전망")]
+
+    assert sorted(matches) == ["관세", "반도체", "반도체 관세"]
+
+
+@pytest.mark.parametrize("question, expected_type, expected_keyword, expected_industry", [
+    ("Show me the latest news with 삼성전자", "keyword_trend", "삼성전자", "사회"),
+    ("Did the email about 테슬라 say anything?", "keyword_trend", "테슬라", "사회"),
+    ("AI 시대에 삼성전자는 어떻게 되나요", "industry_analysis", "삼성전자", "IT/과학"),
+    ("IT 업계에서 삼성전자 위상은?", "industry_analysis", "삼성전자", "IT/과학"),
+    ("ai와 삼성전자", "industry_analysis", "삼성전자", "IT/과학"),
+    ("pineapple 가격은?", "general", None, "사회"),
+    ("apple 신제품 소식", "keyword_trend", "Apple", "사회"),
+    ("삼성전자 vs 테슬라", "comparison", "삼성전자", "사회"),
+    ("canvas 디자인 트렌드", "general", None, "생활/문화"),
+])
+def test_classify(question, expected_type, expected_keyword, expected_industry):
+    result = QuestionRouter(KEYWORDS).classify(question)
+
+    assert (result["type"], result["keyword"], result["industry"]) == (expected_type, expected_keyword, expected_industry)
+
+
+def test_classify_extracts_reason_and_comparison_keywords():
+    router = QuestionRouter(KEYWORDS)
+
+    assert router.classify("최근 삼성전자 실적 부진 이유는?")["reason"] == "최근 실적 부진 이유는?"
+    assert router.classify("삼성전자가 왜 화제야?")["reason"] == "질문 내 명시된 이유 없음"
+    assert router.classify("apple 소식")["reason"] == "질문 내 간접적으로 언급됨"
+    assert router.classify("테슬라와 삼성전자 비교")["keywords"] == ["삼성전자", "테슬라"]
+
+
+def test_router_is_rebuilt_only_when_keywords_change(monkeypatch):
+    monkeypatch.setattr(question_router, "_router", None)
+    monkeypatch.setattr(question_router, "_router_key", None)
+
+    first = get_question_router(["삼성전자", "테슬라"])
+    assert get_question_router(["삼성전자", "테슬라"]) is first
+
+    second = get_question_router(["삼성전자", "엔비디아"])
+    assert second is not first
+    assert second.classify("엔비디아 주가")["keyword"] == "엔비디아"
+    assert second.classify("테슬라 주가")["keyword"] is None
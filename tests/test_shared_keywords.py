@@ -0,0 +1,130 @@
+import itertools
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from core.config import SHARED_KEYWORD_REVIEW_THRESHOLD
+from services import trending_service
+from services.trending_service import find_shared_keywords_hybrid, normalize_keyword
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "shared_keywords.json")
+HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+with open(FIXTURE_PATH, encoding="utf-8") as f:
+    LABELLED_KEYWORDS = json.load(f)["keywords"]
+
+RAW_KEYWORDS = [{"country": item["country"], "keyword": item["keyword"]} for item in LABELLED_KEYWORDS]
+LABELS = {(item["country"], item["keyword"]): item["group"] for item in LABELLED_KEYWORDS}
+
+
+def gold_shared_indices():
+    """정답 라벨 기준 공유 키워드 (같은 그룹이 2개국 이상에 있음) - 전체 키워드를 LLM에 보내던 방식의 최선 결과"""
+    countries = {}
+    for item in LABELLED_KEYWORDS:
+        if item["group"] is not None:
+            countries.setdefault(item["group"], set()).add(item["country"])
+    return {i for i, item in enumerate(LABELLED_KEYWORDS) if item["group"] and len(countries[item["group"]]) >= 2}
+
+
+def same_target(a, b):
+    label = LABELS[(a["country"], a["keyword"])]
+    return label is not None and label == LABELS[(b["country"], b["keyword"])]
+
+
+@pytest.fixture
+def oracle_llm(monkeypatch):
+    """LLM 판정을 정답 라벨로 대체하고 판정 요청된 쌍을 기록"""
+    asked = []
+
+    def adjudicate(pairs):
+        asked.extend(pairs)
+        return {i for i, (a, b) in enumerate(pairs) if same_target(a, b)}
+
+    monkeypatch.setattr(trending_service, "adjudicate_pairs_with_llm", adjudicate)
+    return asked
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("Samsung stock", "samsung"),
+    ("Tesla Shares", "tesla"),
+    ("Apple share price", "apple"),
+    ("삼성전자 주가", "삼성전자"),
+    ("삼성전자주가", "삼성전자"),
+    ("Pokémon", "pokemon"),
+    ("Woodstock", "woodstock"),
+    ("Livestock", "livestock"),
+    ("Timeshares", "timeshares"),
+])
+def test_normalize_keyword(keyword, expected):
+    assert normalize_keyword(keyword) == expected
+
+
+def test_local_matching_never_merges_different_targets():
+    by_key = {}
+    for item in LABELLED_KEYWORDS:
+        by_key.setdefault(normalize_keyword(item["keyword"]), []).append(item)
+    for key, items in by_key.items():
+        for a, b in itertools.combinations(items, 2):
+            assert same_target(a, b), f"로컬 정규화가 다른 대상을 병합: {a['keyword']} / {b['keyword']} ({key})"
+
+
+def _unit(vector):
+    return vector / np.linalg.norm(vector)
+
+
+def _seeded_vector(seed_text, dim=64):
+    return _unit(np.random.default_rng(zlib.crc32(seed_text.encode("utf-8"))).standard_normal(dim))
+
+
+def fake_encode_texts(texts):
+    """라벨로 만든 결정적 임베딩: 같은 대상의 같은 표기 체계는 자동 병합 구간, 한글 음역은 LLM 판정 구간 유사도"""
+    groups = {item["keyword"]: item["group"] for item in LABELLED_KEYWORDS}
+    vectors = []
+    for text in texts:
+        group = groups[text]
+        if group is None:
+            vectors.append(_seeded_vector(f"unrelated:{text}"))
+        elif HANGUL_PATTERN.search(text):
+            vectors.append(_unit(0.75 * _seeded_vector(f"group:{group}") + 0.66 * _seeded_vector(f"hangul:{group}")))
+        else:
+            vectors.append(_unit(_seeded_vector(f"group:{group}") + 0.15 * _seeded_vector(f"latin:{text}")))
+    return np.vstack(vectors).astype(np.float32)
+
+
+def test_hybrid_grouping_matches_labelled_fixture(monkeypatch, oracle_llm):
+    monkeypatch.setattr(trending_service, "encode_texts", fake_encode_texts)
+
+    shared = set(find_shared_keywords_hybrid(RAW_KEYWORDS, {}))
+
+    assert shared == gold_shared_indices()
+    # 음역 쌍만 LLM 판정으로 가고, 전체 키워드 쌍 중 일부만 판정 요청
+    assert oracle_llm
+    assert all(HANGUL_PATTERN.search(a["keyword"] + b["keyword"]) for a, b in oracle_llm)
+    assert len(oracle_llm) < len(RAW_KEYWORDS) * (len(RAW_KEYWORDS) - 1) // 2
+
+
+def test_hybrid_grouping_with_configured_embedding_model(oracle_llm):
+    """실제 임베딩 모델로 라벨 데이터의 그룹핑 품질 확인 (음역 쌍이 LLM 판정 구간 이상에 들어와야 함)"""
+    pytest.importorskip("sentence_transformers")
+    from services.embedding_service import encode_texts, get_embedding_model
+    try:
+        get_embedding_model()
+    except Exception as e:
+        pytest.skip(f"임베딩 모델을 불러올 수 없음: {e}")
+
+    keywords = list(dict.fromkeys(item["keyword"] for item in LABELLED_KEYWORDS))
+    embeddings = encode_texts(keywords)
+    index = {keyword: i for i, keyword in enumerate(keywords)}
+    for a, b in itertools.combinations(LABELLED_KEYWORDS, 2):
+        if a["country"] == b["country"] or not same_target(a, b):
+            continue
+        if normalize_keyword(a["keyword"]) == normalize_keyword(b["keyword"]):
+            continue
+        similarity = float(embeddings[index[a["keyword"]]] @ embeddings[index[b["keyword"]]])
+        assert similarity > SHARED_KEYWORD_REVIEW_THRESHOLD, f"{a['keyword']} / {b['keyword']}: {similarity:.2f}"
+
+    assert set(find_shared_keywords_hybrid(RAW_KEYWORDS, {})) == gold_shared_indices()
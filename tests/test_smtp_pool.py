@@ -0,0 +1,132 @@
+import asyncio
+import smtplib
+import socket
+from email.message import EmailMessage
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from services.smtp_pool import SmtpConnectionPool, SmtpSender
+
+
+class RecordingHandler:
+    """수신자별로 정해진 응답을 돌려주고, 받은 메시지와 연결(peer)을 기록하는 SMTP 핸들러"""
+
+    def __init__(self):
+        self.delivered = []
+        self.peers = set()
+        self.rcpt_replies = {}  # 수신자 → 앞으로 돌려줄 RCPT 응답 목록 (비면 수락)
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        replies = self.rcpt_replies.get(address)
+        if replies:
+            return replies.pop(0)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.peers.add(session.peer)
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture
+def sender(smtp_server):
+    # 로컬 테스트 서버는 STARTTLS를 지원하지 않으므로 명시적으로 평문 허용
+    pool = SmtpConnectionPool(smtp_server.hostname, smtp_server.port, None, None, size=2, timeout=5, require_tls=False)
+    sender = SmtpSender(pool, max_retries=2, max_delay=0.01)
+    yield sender
+    sender.close()
+
+
+def _message(to: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "digest@example.com"
+    msg["To"] = to
+    msg["Subject"] = "weekly digest"
+    msg.set_content("hello")
+    return msg
+
+
+def test_connections_are_pooled(smtp_server, sender):
+    recipients = [f"user{i}@example.com" for i in range(10)]
+
+    results = asyncio.run(sender.send_many(_message(to) for to in recipients))
+
+    assert results == {to: None for to in recipients}
+    assert sorted(smtp_server.handler.delivered) == sorted(recipients)
+    assert len(smtp_server.handler.peers) <= sender.pool.size
+
+
+def test_transient_451_is_retried(smtp_server, sender):
+    smtp_server.handler.rcpt_replies["busy@example.com"] = ["451 4.7.1 Try again later"]
+
+    results = asyncio.run(sender.send_many([_message("busy@example.com")]))
+
+    assert results == {"busy@example.com": None}
+    assert smtp_server.handler.delivered == ["busy@example.com"]
+    assert smtp_server.handler.rcpt_replies["busy@example.com"] == []  # 451을 받은 뒤 재시도로 발송
+
+
+def test_permanent_5xx_fails_only_that_recipient(smtp_server, sender):
+    smtp_server.handler.rcpt_replies["gone@example.com"] = ["550 5.1.1 No such user"] * 5
+
+    results = asyncio.run(sender.send_many([_message("gone@example.com"), _message("ok@example.com")]))
+
+    assert results["ok@example.com"] is None
+    assert "550" in results["gone@example.com"]
+    assert smtp_server.handler.delivered == ["ok@example.com"]
+    assert smtp_server.handler.rcpt_replies["gone@example.com"] == ["550 5.1.1 No such user"] * 4  # 재시도 없음
+
+
+def test_waiter_gets_new_connection_when_one_is_discarded(smtp_server):
+    pool = SmtpConnectionPool(smtp_server.hostname, smtp_server.port, None, None, size=1, timeout=5, require_tls=False)
+    slot = pool._take()
+    taken = {}
+
+    async def wait_for_slot():
+        taken["slot"] = await asyncio.to_thread(pool._take)
+
+    async def run():
+        waiter = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0.1)
+        pool._discard(slot)
+        await asyncio.wait_for(waiter, timeout=5)
+
+    asyncio.run(run())
+    assert taken["slot"][0] is not slot[0]
+    pool._give_back(taken["slot"])
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool._take()
+
+
+@pytest.mark.parametrize("user, password, require_tls", [
+    (None, None, True),
+    ("digest@example.com", "secret", False),  # 계정 정보가 있으면 평문 허용 설정과 무관하게 TLS 필수
+])
+def test_refuses_to_connect_without_starttls(smtp_server, user, password, require_tls):
+    pool = SmtpConnectionPool(smtp_server.hostname, smtp_server.port, user, password, size=1, timeout=5,
+                              require_tls=require_tls)
+
+    with pytest.raises(smtplib.SMTPNotSupportedError):
+        pool.send(_message("user@example.com"))
+
+    assert smtp_server.handler.delivered == []
+    assert pool._created == 0
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+from utils.lazy_import import STARTUP_IMPORT_BUDGET_SECONDS
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+from utils.lazy_import import loaded_heavy_modules
+print(json.dumps({"elapsed": elapsed, "heavy": loaded_heavy_modules()}))
+"""
+
+
+def test_import_main_is_lazy_and_within_budget(tmp_path):
+    # 새 프로세스에서 측정해야 이미 로드된 모듈의 영향을 받지 않음
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=tmp_path, capture_output=True, text=True, timeout=60,
+        env={**os.environ, "PYTHONPATH": ROOT_DIR},
+    )
+    assert result.returncode == 0, result.stderr
+
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    assert probe["heavy"] == [], f"시작 시 로드된 무거운 모듈: {probe['heavy']}"
+    assert probe["elapsed"] < STARTUP_IMPORT_BUDGET_SECONDS
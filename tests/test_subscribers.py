@@ -0,0 +1,69 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from core import database
+from core.config import SUBSCRIBERS_FILE
+from services import subscriber_store
+from services.subscriber_store import add_subscriber, count_subscribers, get_subscriber
+
+
+@pytest.fixture(autouse=True)
+def subscriber_db(monkeypatch):
+    """테스트마다 새 SQLite 파일(작업 디렉터리)에 스키마 생성"""
+    monkeypatch.setattr(database, "_initialized_schemas", set())
+    monkeypatch.setattr(subscriber_store, "_migrated", False)
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def _restart(monkeypatch):
+    monkeypatch.setattr(database, "_initialized_schemas", set())
+    monkeypatch.setattr(subscriber_store, "_migrated", False)
+
+
+def _write_json_subscribers(emails):
+    with open(SUBSCRIBERS_FILE, "w", encoding="utf-8") as f:
+        json.dump([{"email": email, "subscribed_at": "2025-07-21T14:08:25", "active": True} for email in emails], f)
+
+
+def test_json_subscribers_are_migrated_once_without_touching_the_file(monkeypatch):
+    _write_json_subscribers(["A@example.com", "b@example.com"])
+
+    assert count_subscribers() == 2
+    assert get_subscriber("a@example.com")["subscribed_at"] == "2025-07-21T14:08:25"
+    assert os.path.exists(SUBSCRIBERS_FILE)
+
+    # 재시작 후에도 다시 옮기지 않음 (파일이 바뀌어도 DB가 기준)
+    _write_json_subscribers(["a@example.com", "b@example.com", "c@example.com"])
+    _restart(monkeypatch)
+    assert count_subscribers() == 2
+
+
+def test_subscribers_list_shape_is_kept_by_default(client):
+    add_subscriber("a@example.com")
+    add_subscriber("b@example.com")
+
+    body = client.get("/api/v1/subscribers").json()
+
+    assert [s["email"] for s in body] == ["a@example.com", "b@example.com"]
+    assert body[0]["active"] is True
+
+
+def test_subscribers_are_paged_when_requested(client):
+    for i in range(3):
+        add_subscriber(f"user{i}@example.com")
+
+    first = client.get("/api/v1/subscribers", params={"limit": 2}).json()
+    second = client.get("/api/v1/subscribers", params={"cursor": first["next_cursor"]}).json()
+
+    assert [s["email"] for s in first["subscribers"]] == ["user0@example.com", "user1@example.com"]
+    assert first["total"] == 3
+    assert [s["email"] for s in second["subscribers"]] == ["user2@example.com"]
+    assert second["next_cursor"] is None
@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from api.v1.endpoints import keywords
+from services import trending_service
+from utils.helpers import set_cache
+
+
+def _snapshot(keyword):
+    return {"timestamp": "2025-09-22 00:00:00", "data": [{"country": "US", "keyword": keyword, "shared": False}],
+            "countries": {"US": {"updated_at": "2025-09-22 00:00:00"}}, "status": "success"}
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def refresh_state(monkeypatch):
+    state = {"running": 0, "last_started": None, "last_success": None, "last_error": None}
+    monkeypatch.setattr(trending_service, "_refresh_state", state)
+    return state
+
+
+def test_etag_ignores_refreshing_flag(client, refresh_state):
+    set_cache(trending_service.TRENDING_CACHE_KEY, _snapshot("tesla"))
+    first = client.get("/api/v1/trending")
+    assert first.status_code == 200
+
+    refresh_state["running"] = 1  # shard 갱신 시작 - 데이터는 그대로
+    revalidated = client.get("/api/v1/trending", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert revalidated.status_code == 304
+    assert client.get("/api/v1/trending").json()["refreshing"] is True
+
+
+def test_etag_changes_when_snapshot_changes(client, refresh_state):
+    set_cache(trending_service.TRENDING_CACHE_KEY, _snapshot("tesla"))
+    etag = client.get("/api/v1/trending").headers["ETag"]
+
+    set_cache(trending_service.TRENDING_CACHE_KEY, _snapshot("nvidia"))
+    response = client.get("/api/v1/trending", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"][0]["keyword"] == "nvidia"
+
+
+def test_snapshot_gone_after_version_check(client, refresh_state, monkeypatch):
+    monkeypatch.setattr(keywords, "get_cache_version", lambda key: b"1")
+    monkeypatch.setattr(keywords, "get_cache", lambda key, expiry_seconds=None: None)
+
+    response = client.get("/api/v1/trending")
+
+    assert response.status_code == 202
+    assert response.json() == {"status": "caching", "data": []}
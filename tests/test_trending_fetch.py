@@ -0,0 +1,127 @@
+import asyncio
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from services import trending_service
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "trends_rss")
+
+
+def _recorded(geo: str) -> bytes:
+    with open(os.path.join(FIXTURE_DIR, f"{geo}.xml"), "rb") as f:
+        return f.read()
+
+
+US_KEYWORDS = ["charlie kirk", "jimmy kimmel", "ryder cup", "tesla stock", "nvidia", "taylor swift", "iphone 17",
+               "real madrid", "pokemon legends z-a", "fed rate cut"]
+
+# geo → (상태 코드, 본문): 기록해 둔 RSS 응답과 Google이 실제로 돌려주던 실패 응답
+RESPONSES = {
+    "US": (200, _recorded("US")),
+    "MX": (200, _recorded("MX")),  # 항목 없는 피드
+    "KR": (429, b"Too Many Requests"),
+    "GB": (200, _recorded("US")[:300]),  # 중간에 끊긴 응답
+}
+
+
+class RecordedTrendsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        geo = parse_qs(urlparse(self.path).query).get("geo", [""])[0]
+        status, body = RESPONSES.get(geo, (404, b"Not Found"))
+        self.server.requested.append(geo)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def trends_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedTrendsHandler)
+    server.requested = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.rss_url = f"http://127.0.0.1:{server.server_address[1]}/trending/rss"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def browser_calls(monkeypatch):
+    """Selenium 대신 호출된 국가만 기록하는 브라우저 수집기"""
+    calls = []
+
+    def fetch_with_browser(geo, timeout=None):
+        calls.append(geo)
+        return [{"country": geo, "keyword": f"browser {geo}"}]
+
+    monkeypatch.setattr(trending_service, "fetch_trending_keywords_with_browser", fetch_with_browser)
+    monkeypatch.setattr(trending_service, "get_browser_pool", lambda: SimpleNamespace(size=2))
+    return calls
+
+
+def test_parse_recorded_feed_keeps_first_unique_titles():
+    assert trending_service.parse_trending_rss(_recorded("US")) == US_KEYWORDS
+    assert trending_service.parse_trending_rss(_recorded("KR"))[:2] == ["손흥민", "삼성전자 주가"]
+    assert trending_service.parse_trending_rss(_recorded("MX")) == []
+
+
+def test_parse_does_not_expand_external_entities(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("leaked")
+    payload = (
+        f'<?xml version="1.0"?><!DOCTYPE rss [<!ENTITY x SYSTEM "file://{secret}">]>'
+        "<rss><channel><item><title>&x;safe</title></item></channel></rss>"
+    ).encode()
+
+    assert "leaked" not in "".join(trending_service.parse_trending_rss(payload))
+
+
+def test_http_fetch_drops_failed_countries(trends_server):
+    result = asyncio.run(trending_service.fetch_trending_keywords_over_http(
+        ["US", "MX", "KR", "GB"], timeout=5, rss_url=trends_server.rss_url
+    ))
+
+    assert result == {"US": US_KEYWORDS}
+    assert sorted(trends_server.requested) == ["GB", "KR", "MX", "US"]
+
+
+def test_browser_fallback_only_for_countries_rss_missed(trends_server, browser_calls, monkeypatch):
+    monkeypatch.setattr(trending_service, "TRENDING_FETCH_MODE", "http")
+    monkeypatch.setattr(trending_service, "TRENDING_RSS_URL", trends_server.rss_url)
+
+    result = trending_service._fetch_trending_keywords(["US", "MX", "KR"])
+
+    assert sorted(browser_calls) == ["KR", "MX"]
+    assert result == {"US": US_KEYWORDS, "MX": ["browser MX"], "KR": ["browser KR"]}
+
+
+def test_browser_mode_skips_rss(trends_server, browser_calls, monkeypatch):
+    monkeypatch.setattr(trending_service, "TRENDING_FETCH_MODE", "browser")
+    monkeypatch.setattr(trending_service, "TRENDING_RSS_URL", trends_server.rss_url)
+
+    result = trending_service._fetch_trending_keywords(["US"])
+
+    assert trends_server.requested == []
+    assert browser_calls == ["US"]
+    assert result == {"US": ["browser US"]}
+
+
+def test_no_browser_fallback_after_deadline(trends_server, browser_calls, monkeypatch):
+    monkeypatch.setattr(trending_service, "TRENDING_FETCH_MODE", "http")
+    monkeypatch.setattr(trending_service, "TRENDING_RSS_URL", trends_server.rss_url)
+
+    result = trending_service._fetch_trending_keywords(["US", "KR"], deadline=0)
+
+    assert browser_calls == []
+    assert result == {"US": US_KEYWORDS}
@@ -0,0 +1,56 @@
+import pytest
+
+from services import trending_service
+from utils.helpers import get_cache, set_cache
+
+
+@pytest.fixture
+def shared_pass(monkeypatch):
+    """공유 키워드 판정(LLM/임베딩) 대신 입력된 키워드만 기록"""
+    calls = []
+
+    def find_shared(raw_keywords, pair_decisions=None):
+        calls.append([item["keyword"] for item in raw_keywords])
+        return []
+
+    monkeypatch.setattr(trending_service, "find_shared_keywords_hybrid", find_shared)
+    monkeypatch.setattr(trending_service, "TRENDING_COUNTRY_CODES", ["US", "MX"])
+    return calls
+
+
+def _snapshot():
+    return get_cache(trending_service.TRENDING_CACHE_KEY, expiry_seconds=None)
+
+
+def test_country_without_any_data_is_left_out(shared_pass):
+    trending_service._refresh_google_trending({"US": ["tesla", "nvidia"]}, ["US", "MX"])
+
+    snapshot = _snapshot()
+    assert [item["keyword"] for item in snapshot["data"]] == ["tesla", "nvidia"]
+    assert set(snapshot["countries"]) == {"US"}
+    assert shared_pass == [["tesla", "nvidia"]]
+
+
+def test_failed_country_keeps_previous_keywords(shared_pass):
+    trending_service._refresh_google_trending({"US": ["tesla"], "MX": ["checo perez"]}, ["US", "MX"])
+
+    trending_service._refresh_google_trending({"US": ["nvidia"]}, ["US", "MX"])
+
+    assert [(item["country"], item["keyword"]) for item in _snapshot()["data"]] == [
+        ("US", "nvidia"), ("MX", "checo perez"),
+    ]
+
+
+def test_stored_placeholder_keywords_are_dropped(shared_pass):
+    set_cache(trending_service.TRENDING_CACHE_KEY, {
+        "timestamp": "2025-09-22 00:00:00",
+        "data": [{"country": "US", "keyword": "tesla", "shared": False}]
+                + [{"country": "MX", "keyword": f"Sample keyword {i} for MX", "shared": False} for i in range(1, 6)],
+        "countries": {"US": {"updated_at": "2025-09-22 00:00:00"}, "MX": {"updated_at": "2025-09-22 00:00:00"}},
+        "status": "success",
+    })
+
+    trending_service._refresh_google_trending({"US": ["tesla"]}, ["US", "MX"])
+
+    assert [item["keyword"] for item in _snapshot()["data"]] == ["tesla"]
+    assert shared_pass == [["tesla"]]
@@ -0,0 +1,132 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services import weekly_keywords_service
+
+WEEK_KEYWORDS = [
+    {"keyword": "반도체", "count": 30, "rank": 1, "reason": "테스트"},
+    {"keyword": "인공지능", "count": 20, "rank": 2, "reason": "테스트"},
+]
+
+
+@pytest.fixture
+def fake_sources(monkeypatch):
+    """DeepSearch/GPT 대신 고정 기사와 키워드를 반환하고 호출 기간을 기록"""
+    calls = []
+
+    async def fetch_articles(start_date, end_date):
+        calls.append((start_date, end_date))
+        return [{"title": "기사", "content": "내용"}]
+
+    async def extract_keywords(articles):
+        return WEEK_KEYWORDS
+
+    def get_samples(start_date, end_date):
+        return [{"keyword": f"샘플 {start_date}", "count": 1, "rank": 1}]
+
+    for region in ("domestic", "global"):
+        monkeypatch.setitem(weekly_keywords_service.REGION_SOURCES, region, (fetch_articles, extract_keywords, get_samples))
+    return calls
+
+
+@pytest.fixture
+def client():
+    # lifespan(스케줄러, outbox 워커)은 실행하지 않음
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/weekly-keywords-by-date", "/api/v1/global-weekly-keywords-by-date"])
+def test_weekly_keywords_by_date_returns_week_keywords(client, fake_sources, path):
+    response = client.get(path, params={"start_date": "2025-07-14", "end_date": "2025-07-18"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "success"
+    assert body["weeks"] == ["2025-W29"]
+    assert body["canonical_range"] == "2025-07-14 ~ 2025-07-20"
+    assert [k["keyword"] for k in body["keywords"]] == ["반도체", "인공지능"]
+    assert fake_sources == [("2025-07-14", "2025-07-20")]
+
+
+def test_weekly_keywords_by_date_reuses_week_cache(client, fake_sources):
+    params = {"start_date": "2025-07-14", "end_date": "2025-07-18"}
+    first = client.get("/api/v1/weekly-keywords-by-date", params=params).json()
+    # 같은 ISO 주에 걸친 다른 기간도 같은 주 버킷을 공유
+    second = client.get("/api/v1/weekly-keywords-by-date", params={"start_date": "2025-07-13", "end_date": "2025-07-20"}).json()
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["keywords"] == first["keywords"]
+    assert len(fake_sources) == 1
+
+
+def test_sample_fallback_uses_week_bucket_dates(client, fake_sources, monkeypatch):
+    async def no_articles(start_date, end_date):
+        return []
+
+    _, extract_keywords, get_samples = weekly_keywords_service.REGION_SOURCES["domestic"]
+    monkeypatch.setitem(weekly_keywords_service.REGION_SOURCES, "domestic", (no_articles, extract_keywords, get_samples))
+
+    # 주 중간부터 요청해도 요청 기간이 아닌 주 버킷 전체 기간의 샘플로 응답 (샘플은 캐시에 저장하지 않음)
+    body = client.get("/api/v1/weekly-keywords-by-date", params={"start_date": "2025-07-16", "end_date": "2025-07-20"}).json()
+    assert [k["keyword"] for k in body["keywords"]] == ["샘플 2025-07-14"]
+
+
+def test_sample_fallback_is_not_cached(client, fake_sources, monkeypatch):
+    attempts = []
+
+    async def no_articles(start_date, end_date):
+        attempts.append(start_date)
+        return []
+
+    sources = weekly_keywords_service.REGION_SOURCES["domestic"]
+    monkeypatch.setitem(weekly_keywords_service.REGION_SOURCES, "domestic", (no_articles, *sources[1:]))
+
+    params = {"start_date": "2025-07-14", "end_date": "2025-07-18"}
+    first = client.get("/api/v1/weekly-keywords-by-date", params=params)
+    assert first.json()["cached"] is False
+    assert "etag" not in first.headers
+
+    # 다음 요청은 샘플을 캐시에서 받지 않고 다시 계산
+    monkeypatch.setitem(weekly_keywords_service.REGION_SOURCES, "domestic", sources)
+    second = client.get("/api/v1/weekly-keywords-by-date", params=params).json()
+    assert attempts == ["2025-07-14"]
+    assert [k["keyword"] for k in second["keywords"]] == ["반도체", "인공지능"]
+
+
+def test_weekly_keywords_etag_revalidation(client, fake_sources):
+    from utils.helpers import set_cache
+
+    params = {"start_date": "2025-07-14", "end_date": "2025-07-18"}
+    first = client.get("/api/v1/weekly-keywords-by-date", params=params)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert "max-age" in first.headers["cache-control"]
+
+    second = client.get("/api/v1/weekly-keywords-by-date", params=params, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+    # 주 버킷이 다시 쓰이면 ETag가 바뀌고 새 본문을 받음
+    set_cache("domestic_week_2025-W29", [{"keyword": "양자컴퓨팅", "count": 9, "rank": 1}])
+    third = client.get("/api/v1/weekly-keywords-by-date", params=params, headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+    assert [k["keyword"] for k in third.json()["keywords"]] == ["양자컴퓨팅"]
+
+
+@pytest.mark.parametrize("path", ["/api/v1/weekly-keywords-by-date", "/api/v1/global-weekly-keywords-by-date"])
+@pytest.mark.parametrize("start_date, end_date", [
+    ("bad", "2025-07-20"),
+    ("2025-07-20", "2025-07-14"),
+    ("2025-01-06", "2025-06-22"),  # 24주
+])
+def test_invalid_date_range_is_client_error(client, fake_sources, path, start_date, end_date):
+    response = client.get(path, params={"start_date": start_date, "end_date": end_date})
+
+    assert response.status_code == 400
+    assert "keywords" not in response.json()
+    assert response.json()["detail"]
+    assert fake_sources == []
@@ -0,0 +1,292 @@
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Tuple
+
+from filelock import FileLock, Timeout
+
+from core.config import CACHE_BACKEND, CACHE_REDIS_URL, CACHE_REDIS_PREFIX
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "cache_data"
+# 여러 워커(uvicorn --workers N)가 같은 캐시 디렉터리를 공유하므로 키별 advisory lock 사용
+CACHE_LOCK_DIR = os.path.join(CACHE_DIR, ".locks")
+# 임베딩 벡터는 캐시 백엔드와 별도로 모델별 하위 디렉터리에 .npy로 저장 (용량 한도는 cache_manager가 따로 관리)
+EMBEDDING_CACHE_ROOT = os.path.join(CACHE_DIR, "embeddings")
+CACHE_FILE_EXTENSION = ".cache"
+LEGACY_CACHE_FILE_EXTENSION = ".json"  # cache_serializer 도입 전 JSON 텍스트 캐시
+
+os.makedirs(CACHE_LOCK_DIR, exist_ok=True)
+
+
+class CacheLock(ABC):
+    """백엔드별 락을 acquire(timeout) -> bool / release() 형태로 통일한 래퍼"""
+
+    @abstractmethod
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """timeout초 안에 획득하면 True (None이면 무기한 대기, 0이면 즉시 반환)"""
+
+    @abstractmethod
+    def release(self):
+        """락 해제"""
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class CacheBackend(ABC):
+    """캐시 저장소 인터페이스 - 직렬화된 바이트와 변경 감지용 시그니처를 다룸
+
+    시그니처는 값이 바뀔 때마다 달라지는 비교 가능한 값이며, 프로세스 내 LRU가 값을 다시
+    디코딩할지 판단하고 "읽은 값이 그대로일 때만 삭제"하는 데 사용합니다.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def signature(self, cache_key: str) -> Any:
+        """현재 저장된 값의 시그니처 (없으면 None)"""
+
+    @abstractmethod
+    def read(self, cache_key: str) -> Optional[Tuple[Any, bytes]]:
+        """(시그니처, 직렬화된 값) 반환 (없으면 None)"""
+
+    @abstractmethod
+    def write(self, cache_key: str, payload: bytes, retain_seconds: Optional[int]) -> Any:
+        """값을 원자적으로 교체하고 새 시그니처 반환 (retain_seconds=None 이면 무기한 보관)"""
+
+    @abstractmethod
+    def delete(self, cache_key: str, expected_signature: Any) -> bool:
+        """시그니처가 expected_signature와 같을 때만 삭제 (그 사이 다른 노드가 쓴 값은 유지)"""
+
+    def touch(self, cache_key: str):
+        """캐시 히트 기록 (LRU 정리용, 필요 없는 백엔드는 무시)"""
+
+    @abstractmethod
+    def lock(self, cache_key: str, purpose: str, hold_seconds: int) -> CacheLock:
+        """키별 노드/프로세스 간 락 (purpose: "write" 짧은 교체/삭제용, "fill" 캐시 채우기용)"""
+
+
+class _FileCacheLock(CacheLock):
+    def __init__(self, path: str):
+        # 스레드 간에 넘겨 쓸 수 있도록 thread_local=False, 같은 프로세스 안에서도 서로 배제되도록 매번 새 객체 생성
+        self._lock = FileLock(path, thread_local=False)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        try:
+            self._lock.acquire(timeout=-1 if timeout is None else timeout)
+            return True
+        except Timeout:
+            return False
+
+    def release(self):
+        self._lock.release()
+
+
+class FileCacheBackend(CacheBackend):
+    """cache_data/ 디렉터리에 키별 파일로 저장 (한 호스트의 여러 워커가 공유)"""
+
+    name = "file"
+
+    def filepath(self, cache_key: str) -> str:
+        return os.path.join(CACHE_DIR, f"{cache_key}{CACHE_FILE_EXTENSION}")
+
+    def legacy_filepath(self, cache_key: str) -> str:
+        return os.path.join(CACHE_DIR, f"{cache_key}{LEGACY_CACHE_FILE_EXTENSION}")
+
+    def _stat(self, cache_key: str) -> Optional[Tuple[str, os.stat_result]]:
+        """(경로, stat) 반환 - 새 포맷 파일을 한 번만 stat하고, 없을 때만 예전 JSON 캐시 파일 확인 (롤아웃 중 기존 캐시 재사용)"""
+        filepath = self.filepath(cache_key)
+        try:
+            return filepath, os.stat(filepath)
+        except FileNotFoundError:
+            pass
+        legacy_path = self.legacy_filepath(cache_key)
+        try:
+            return legacy_path, os.stat(legacy_path)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _stat_signature(st: os.stat_result):
+        return (st.st_mtime_ns, st.st_size)
+
+    @classmethod
+    def file_signature(cls, filepath: str):
+        try:
+            return cls._stat_signature(os.stat(filepath))
+        except FileNotFoundError:
+            return None
+
+    def signature(self, cache_key: str):
+        found = self._stat(cache_key)
+        return None if found is None else self._stat_signature(found[1])
+
+    def read(self, cache_key: str):
+        found = self._stat(cache_key)
+        if found is None:
+            return None
+        filepath, st = found
+        try:
+            with open(filepath, 'rb') as f:
+                return self._stat_signature(st), f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, cache_key: str, payload: bytes, retain_seconds: Optional[int]):
+        # 임시 파일에 쓴 뒤 rename으로 교체 → 다른 워커가 반쯤 쓰인 파일을 읽지 않음
+        # (보관 기간은 cache_manager의 sweeper가 처리)
+        filepath = self.filepath(cache_key)
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            with self.lock(cache_key, "write", 0):
+                os.replace(tmp_path, filepath)
+                signature = self.file_signature(filepath)
+                try:
+                    os.remove(self.legacy_filepath(cache_key))
+                except FileNotFoundError:
+                    pass
+            return signature
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, cache_key: str, expected_signature) -> bool:
+        with self.lock(cache_key, "write", 0):
+            found = self._stat(cache_key)
+            if found is None or self._stat_signature(found[1]) != expected_signature:
+                return False
+            try:
+                os.remove(found[0])
+            except FileNotFoundError:
+                return False
+            return True
+
+    def touch(self, cache_key: str):
+        # atime만 갱신하고 mtime은 유지하므로 시그니처는 바뀌지 않음
+        found = self._stat(cache_key)
+        if found is None:
+            return
+        filepath, st = found
+        try:
+            os.utime(filepath, ns=(time.time_ns(), st.st_mtime_ns))
+        except OSError:
+            pass
+
+    def lock(self, cache_key: str, purpose: str, hold_seconds: int) -> CacheLock:
+        # 파일 락은 프로세스가 죽으면 OS가 해제하므로 hold_seconds는 사용하지 않음
+        return _FileCacheLock(os.path.join(CACHE_LOCK_DIR, f"{cache_key}.{purpose}.lock"))
+
+
+class _RedisCacheLock(CacheLock):
+    def __init__(self, lock):
+        self._lock = lock
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        if timeout == 0:
+            return bool(self._lock.acquire(blocking=False))
+        return bool(self._lock.acquire(blocking=True, blocking_timeout=timeout))
+
+    def release(self):
+        try:
+            self._lock.release()
+        except Exception as e:  # 보유 시간이 지나 이미 만료된 락
+            logger.warning(f"⚠️ Redis 캐시 락 해제 실패: {e}")
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis 프로토콜 서버에 저장 (여러 API 노드가 하나의 캐시를 공유)
+
+    값과 함께 키별 버전 카운터를 두어 시그니처로 사용하므로, 각 노드는 작은 버전 값만
+    확인하고 바뀌었을 때만 값을 다시 읽습니다.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("CACHE_BACKEND=redis 를 사용하려면 redis 패키지를 설치하세요 (pip install redis)") from e
+        self._redis = redis
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def _data_key(self, cache_key: str) -> str:
+        return f"{self._prefix}cache:{cache_key}"
+
+    def _version_key(self, cache_key: str) -> str:
+        return f"{self._prefix}cache-version:{cache_key}"
+
+    def signature(self, cache_key: str):
+        return self._client.get(self._version_key(cache_key))
+
+    def read(self, cache_key: str):
+        version, payload = self._client.mget(self._version_key(cache_key), self._data_key(cache_key))
+        if payload is None:
+            return None
+        return version, payload
+
+    def write(self, cache_key: str, payload: bytes, retain_seconds: Optional[int]):
+        data_key, version_key = self._data_key(cache_key), self._version_key(cache_key)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.set(data_key, payload, ex=retain_seconds)
+        pipe.incr(version_key)
+        if retain_seconds:
+            pipe.expire(version_key, retain_seconds)
+        else:
+            pipe.persist(version_key)
+        version = pipe.execute()[1]
+        return str(version).encode()
+
+    def delete(self, cache_key: str, expected_signature) -> bool:
+        data_key, version_key = self._data_key(cache_key), self._version_key(cache_key)
+        with self._client.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(version_key)
+                if pipe.get(version_key) != expected_signature:
+                    return False
+                pipe.multi()
+                pipe.delete(data_key, version_key)
+                pipe.execute()
+                return True
+            except self._redis.WatchError:
+                return False
+
+    def lock(self, cache_key: str, purpose: str, hold_seconds: int) -> CacheLock:
+        # 노드가 죽어도 락이 남지 않도록 hold_seconds 뒤 자동 만료
+        lock = self._client.lock(f"{self._prefix}lock:{purpose}:{cache_key}", timeout=max(hold_seconds, 1),
+                                 sleep=0.1, thread_local=False)
+        return _RedisCacheLock(lock)
+
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_cache_backend() -> CacheBackend:
+    """CACHE_BACKEND 설정에 따른 프로세스 전역 캐시 백엔드 반환"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if CACHE_BACKEND == "redis":
+                    _backend = RedisCacheBackend(CACHE_REDIS_URL, CACHE_REDIS_PREFIX)
+                else:
+                    if CACHE_BACKEND != "file":
+                        logger.warning(f"⚠️ 알 수 없는 CACHE_BACKEND '{CACHE_BACKEND}', 파일 캐시 사용")
+                    _backend = FileCacheBackend()
+                logger.info(f"🗄️ 캐시 백엔드: {_backend.name}")
+    return _backend
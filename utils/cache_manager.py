@@ -0,0 +1,213 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from core.config import MAX_CACHE_SIZE, CACHE_MAX_BYTES, EMBEDDING_CACHE_MAX_BYTES
+from utils.cache_backend import (
+    CACHE_DIR,
+    EMBEDDING_CACHE_ROOT,
+    CACHE_FILE_EXTENSION,
+    LEGACY_CACHE_FILE_EXTENSION,
+    FileCacheBackend,
+    get_cache_backend,
+)
+from utils.helpers import CACHE_RETAIN_SECONDS, _cache_lock, _forget, _persistent_keys
+
+logger = logging.getLogger(__name__)
+
+# stale-while-revalidate로 만료 후에도 제공될 수 있는 동안은 파일을 남겨 둠
+SWEEP_EXPIRY_SECONDS = CACHE_RETAIN_SECONDS
+
+# 쓰다 중단된 임시 파일은 이 시간(초)이 지나면 정리
+ORPHAN_TMP_SECONDS = 10 * 60
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Any] = {
+    "sweeps": 0,
+    "skipped_sweeps": 0,
+    "evicted_expired": 0,
+    "evicted_lru": 0,
+    "removed_tmp": 0,
+    "last_sweep": None,
+    "last_sweep_duration": None,
+    "entries": None,
+    "total_bytes": None,
+    "evicted_embeddings": 0,
+    "embedding_files": None,
+    "embedding_bytes": None,
+}
+
+
+def _cache_key_from_filename(name: str):
+    for extension in (CACHE_FILE_EXTENSION, LEGACY_CACHE_FILE_EXTENSION):
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return None
+
+
+def _remove_orphan_tmp(path: str, st: os.stat_result, now: float):
+    if now - st.st_mtime > ORPHAN_TMP_SECONDS:
+        try:
+            os.remove(path)
+            with _stats_lock:
+                _stats["removed_tmp"] += 1
+        except OSError:
+            pass
+
+
+def _scan_cache_dir() -> List[Dict[str, Any]]:
+    entries = []
+    now = time.time()
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith(".tmp"):
+                _remove_orphan_tmp(entry.path, st, now)
+                continue
+            cache_key = _cache_key_from_filename(entry.name)
+            if cache_key is None:
+                continue
+            entries.append({
+                "key": cache_key,
+                "path": entry.path,
+                "signature": (st.st_mtime_ns, st.st_size),
+                "size": st.st_size,
+                "written_at": st.st_mtime,
+                "last_access": max(st.st_atime, st.st_mtime),
+            })
+    return entries
+
+
+def _scan_embedding_files() -> List[Tuple[float, int, str]]:
+    """모델별 하위 디렉터리까지 훑어 (마지막 사용 시각, 크기, 경로) 목록 반환"""
+    files = []
+    now = time.time()
+    for dirpath, _, filenames in os.walk(EMBEDDING_CACHE_ROOT):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.endswith(".tmp"):
+                _remove_orphan_tmp(path, st, now)
+            elif name.endswith(".npy"):
+                files.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+    return files
+
+
+def sweep_embedding_cache(max_bytes: int = EMBEDDING_CACHE_MAX_BYTES) -> int:
+    """임베딩 벡터 파일을 오래 안 쓴 것부터 지워 max_bytes 이하로 유지 (지운 벡터는 필요할 때 다시 계산)
+
+    임베딩은 캐시 백엔드 설정과 무관하게 로컬 디스크에 저장되므로 백엔드 종류와 상관없이 실행합니다.
+    더 이상 쓰지 않는 모델의 디렉터리는 사용 시각이 오래되어 먼저 지워집니다.
+    """
+    files = _scan_embedding_files()
+    total_bytes = sum(size for _, size, _ in files)
+    evicted = 0
+    for _, size, path in sorted(files):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            evicted += 1
+        except FileNotFoundError:
+            pass  # 다른 워커가 먼저 삭제
+        total_bytes -= size
+
+    with _stats_lock:
+        _stats["evicted_embeddings"] += evicted
+        _stats["embedding_files"] = len(files) - evicted
+        _stats["embedding_bytes"] = total_bytes
+    if evicted:
+        logger.info(f"🧹 임베딩 캐시 정리: {evicted}개 삭제 → {total_bytes / 1024 / 1024:.1f}MB")
+    return evicted
+
+
+def _evict(backend: FileCacheBackend, entry: Dict[str, Any]) -> bool:
+    """파일이 스캔 이후 바뀌지 않았을 때만 삭제 (다른 워커가 방금 쓴 캐시는 유지)"""
+    if not backend.delete(entry["key"], entry["signature"]):
+        return False
+    _forget(entry["key"])
+    return True
+
+
+def sweep_cache(max_entries: int = MAX_CACHE_SIZE, max_bytes: int = CACHE_MAX_BYTES,
+                expiry_seconds: int = SWEEP_EXPIRY_SECONDS,
+                embedding_max_bytes: int = EMBEDDING_CACHE_MAX_BYTES) -> Dict[str, Any]:
+    """만료된 캐시 파일을 먼저 지우고, 개수/용량 한도를 넘으면 가장 오래 안 쓰인 파일부터 삭제
+
+    캐시 파일 정리는 파일 캐시 백엔드에서만 동작합니다. (Redis는 키 TTL과 maxmemory 정책으로 정리)
+    임베딩 벡터 파일은 별도 한도(embedding_max_bytes)로 항상 정리합니다.
+    """
+    sweep_embedding_cache(embedding_max_bytes)
+    backend = get_cache_backend()
+    if not isinstance(backend, FileCacheBackend):
+        return get_cache_stats()
+
+    sweep_lock = _cache_lock("__sweeper__", "fill")
+    # 여러 워커가 같은 디렉터리를 동시에 훑지 않도록 한 번에 하나만 실행
+    if not sweep_lock.acquire(timeout=0):
+        with _stats_lock:
+            _stats["skipped_sweeps"] += 1
+        return get_cache_stats()
+
+    started = time.monotonic()
+    try:
+        entries = _scan_cache_dir()
+        cutoff = time.time() - expiry_seconds
+        kept, expired_count, lru_count = [], 0, 0
+
+        for entry in entries:
+            if entry["key"] not in _persistent_keys and entry["written_at"] < cutoff:
+                if _evict(backend, entry):
+                    expired_count += 1
+                    continue
+            kept.append(entry)
+
+        total_bytes = sum(entry["size"] for entry in kept)
+        candidates = sorted((e for e in kept if e["key"] not in _persistent_keys), key=lambda e: e["last_access"])
+        remaining = len(kept)
+        for entry in candidates:
+            if remaining <= max_entries and total_bytes <= max_bytes:
+                break
+            if _evict(backend, entry):
+                lru_count += 1
+                remaining -= 1
+                total_bytes -= entry["size"]
+    finally:
+        sweep_lock.release()
+
+    duration = time.monotonic() - started
+    with _stats_lock:
+        _stats["sweeps"] += 1
+        _stats["evicted_expired"] += expired_count
+        _stats["evicted_lru"] += lru_count
+        _stats["last_sweep"] = time.strftime('%Y-%m-%d %H:%M:%S')
+        _stats["last_sweep_duration"] = round(duration, 3)
+        _stats["entries"] = remaining
+        _stats["total_bytes"] = total_bytes
+
+    if expired_count or lru_count:
+        logger.info(f"🧹 캐시 정리: 만료 {expired_count}개, LRU {lru_count}개 삭제 → {remaining}개, {total_bytes / 1024 / 1024:.1f}MB")
+    return get_cache_stats()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """캐시 디렉터리 크기와 이 프로세스의 sweeper 삭제 통계"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["backend"] = get_cache_backend().name
+    stats["max_entries"] = MAX_CACHE_SIZE
+    stats["max_bytes"] = CACHE_MAX_BYTES
+    stats["embedding_max_bytes"] = EMBEDDING_CACHE_MAX_BYTES
+    stats["expiry_seconds"] = SWEEP_EXPIRY_SECONDS
+    stats["persistent_keys"] = sorted(_persistent_keys)
+    return stats
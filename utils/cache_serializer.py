@@ -0,0 +1,175 @@
+import gzip
+import json
+import logging
+from typing import Any, Callable, Dict, Tuple
+
+from core.config import CACHE_SERIALIZER, CACHE_COMPRESSION, CACHE_COMPRESSION_MIN_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 캐시 파일 헤더: MAGIC(3) + 포맷 버전(1) + 직렬화 방식(1) + 압축 방식(1)
+# 헤더가 없는 파일은 예전 json.dump(indent=4) 텍스트 포맷으로 읽음
+MAGIC = b"NGC"
+FORMAT_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 3
+
+CODEC_JSON = 1
+CODEC_MSGPACK = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_GZIP = 1
+COMPRESSION_ZSTD = 2
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(payload: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def _msgpack_loads(payload: bytes) -> Any:
+    if msgpack is None:
+        raise ValueError("msgpack 캐시 파일을 읽으려면 msgpack 패키지가 필요합니다")
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+def _zstd_compress(payload: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(payload)
+
+
+def _zstd_decompress(payload: bytes) -> bytes:
+    if zstandard is None:
+        raise ValueError("zstd 캐시 파일을 읽으려면 zstandard 패키지가 필요합니다")
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+
+_DECODERS: Dict[int, Callable[[bytes], Any]] = {
+    CODEC_JSON: _json_loads,
+    CODEC_MSGPACK: _msgpack_loads,
+}
+
+_DECOMPRESSORS: Dict[int, Callable[[bytes], bytes]] = {
+    COMPRESSION_NONE: lambda payload: payload,
+    COMPRESSION_GZIP: gzip.decompress,
+    COMPRESSION_ZSTD: _zstd_decompress,
+}
+
+
+def _resolve_codec(name: str) -> Tuple[int, Callable[[Any], bytes]]:
+    if name == "msgpack":
+        if msgpack is not None:
+            return CODEC_MSGPACK, _msgpack_dumps
+        logger.warning("⚠️ msgpack 패키지가 없어 JSON 캐시 포맷을 사용합니다")
+    elif name != "json":
+        logger.warning(f"⚠️ 알 수 없는 캐시 직렬화 방식 '{name}', JSON 사용")
+    return CODEC_JSON, _json_dumps
+
+
+def _resolve_compression(name: str) -> Tuple[int, Callable[[bytes], bytes]]:
+    if name == "zstd":
+        if zstandard is not None:
+            return COMPRESSION_ZSTD, _zstd_compress
+        logger.warning("⚠️ zstandard 패키지가 없어 gzip 압축을 사용합니다")
+        name = "gzip"
+    if name == "gzip":
+        return COMPRESSION_GZIP, lambda payload: gzip.compress(payload, compresslevel=5)
+    if name not in ("none", ""):
+        logger.warning(f"⚠️ 알 수 없는 캐시 압축 방식 '{name}', 압축하지 않음")
+    return COMPRESSION_NONE, None
+
+
+_codec_id, _encode = _resolve_codec(CACHE_SERIALIZER)
+_compression_id, _compress = _resolve_compression(CACHE_COMPRESSION)
+
+
+def dumps(obj: Any) -> bytes:
+    """설정된 직렬화 방식으로 인코딩 (CACHE_COMPRESSION_MIN_BYTES 이상일 때만 압축)"""
+    payload = _encode(obj)
+    compression_id = COMPRESSION_NONE
+    if _compress is not None and len(payload) >= CACHE_COMPRESSION_MIN_BYTES:
+        payload = _compress(payload)
+        compression_id = _compression_id
+    return MAGIC + bytes((FORMAT_VERSION, _codec_id, compression_id)) + payload
+
+
+def loads(data: bytes) -> Any:
+    """헤더를 보고 디코딩 (헤더가 없으면 예전 JSON 텍스트 포맷)"""
+    if not data.startswith(MAGIC):
+        return json.loads(data.decode("utf-8"))
+    if len(data) < HEADER_SIZE:
+        raise ValueError("캐시 파일 헤더가 손상되었습니다")
+    version, codec_id, compression_id = data[len(MAGIC):HEADER_SIZE]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 캐시 포맷 버전: {version}")
+    decoder = _DECODERS.get(codec_id)
+    decompress = _DECOMPRESSORS.get(compression_id)
+    if decoder is None or decompress is None:
+        raise ValueError(f"알 수 없는 캐시 인코딩: codec={codec_id}, compression={compression_id}")
+    try:
+        return decoder(decompress(data[HEADER_SIZE:]))
+    except ValueError:
+        raise
+    except Exception as e:  # 압축 라이브러리별 오류 타입을 ValueError로 통일
+        raise ValueError(f"캐시 파일 디코딩 실패: {e}") from e
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def bench(label, encode, decode, obj, runs=50):
+        started = time.perf_counter()
+        for _ in range(runs):
+            payload = encode(obj)
+        encode_ms = (time.perf_counter() - started) / runs * 1000
+        started = time.perf_counter()
+        for _ in range(runs):
+            decode(payload)
+        decode_ms = (time.perf_counter() - started) / runs * 1000
+        print(f"{label:<24} size={len(payload):>9,}B encode={encode_ms:7.2f}ms decode={decode_ms:7.2f}ms")
+
+    countries = ["KR", "US", "MX", "GB", "IN", "ZA", "AU"]
+    snapshot = {
+        "keywords": [
+            {"keyword": f"트렌딩 키워드 {i}", "country": random.choice(countries), "rank": i % 10 + 1, "is_shared": i % 7 == 0}
+            for i in range(5000)
+        ],
+        "updated_at": "2025-07-21 12:00:00",
+    }
+    cache_content = {"timestamp": time.time(), "data": snapshot}
+
+    def legacy_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=4).encode("utf-8")
+
+    bench("legacy json (indent=4)", legacy_dumps, lambda p: json.loads(p.decode("utf-8")), cache_content)
+    bench(f"json ({'orjson' if orjson else 'stdlib'})", lambda o: MAGIC + bytes((1, CODEC_JSON, 0)) + _json_dumps(o), loads, cache_content)
+    bench("json + gzip", lambda o: MAGIC + bytes((1, CODEC_JSON, COMPRESSION_GZIP)) + gzip.compress(_json_dumps(o), 5), loads, cache_content)
+    if msgpack is not None:
+        bench("msgpack", lambda o: MAGIC + bytes((1, CODEC_MSGPACK, 0)) + _msgpack_dumps(o), loads, cache_content)
+    if zstandard is not None:
+        bench("json + zstd", lambda o: MAGIC + bytes((1, CODEC_JSON, COMPRESSION_ZSTD)) + _zstd_compress(_json_dumps(o)), loads, cache_content)
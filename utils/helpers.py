@@ -1,11 +1,25 @@
 import asyncio
 import time
 import hashlib
+from contextlib import contextmanager
 from functools import wraps
 import logging
-from typing import Dict, Any
-import json
-import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import CACHE_EXPIRY_MINUTES, CACHE_MAX_STALE_SECONDS
+from utils import cache_serializer
+from utils.cache_backend import (
+    CACHE_DIR,
+    CACHE_LOCK_DIR,
+    CACHE_FILE_EXTENSION,
+    LEGACY_CACHE_FILE_EXTENSION,
+    CacheLock,
+    FileCacheBackend,
+    get_cache_backend,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -53,54 +67,293 @@ def retry_on_exception(max_retries=1, delay=0.1, backoff=1.2, allowed_exceptions
             return sync_wrapper
     return decorator
 
-# --- 파일 기반 캐시로 변경 ---
-CACHE_DIR = "cache_data"
-CACHE_EXPIRY_SECONDS = 30 * 60  # 30분
+def run_coroutine_sync(coro):
+    """동기 코드에서 코루틴 실행 (이벤트 루프 안에서 호출되면 별도 스레드에서 실행)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+# --- 캐시 (저장소는 utils.cache_backend: 기본 파일, 설정 시 Redis) ---
+CACHE_EXPIRY_SECONDS = CACHE_EXPIRY_MINUTES * 60  # 기본 30분
+# 만료 후 stale로 제공될 수 있는 기간까지 포함한 보관 기간 (sweeper / Redis TTL)
+CACHE_RETAIN_SECONDS = CACHE_EXPIRY_SECONDS + CACHE_MAX_STALE_SECONDS
+# 캐시 히트를 백엔드에 기록하는 최소 간격(초) - 파일 캐시 sweeper의 LRU 판단에 사용
+CACHE_ACCESS_TOUCH_INTERVAL = 60
+CACHE_FILL_WAIT_SECONDS = 180  # 다른 요청/워커의 캐시 채우기를 기다리는 최대 시간(초)
+CACHE_LOCK_POLL_SECONDS = (0.05, 0.5)  # 채우기 락 재시도 간격(초): 처음 → 최대 (두 배씩 증가)
+CACHE_LOCK_HOLD_SECONDS = {"write": 30, "fill": 10 * 60}  # Redis 락 자동 만료 시간(초)
 
-if not os.path.exists(CACHE_DIR):
-    os.makedirs(CACHE_DIR)
+# 만료/LRU 대상에서 제외할 캐시 키 (expiry_seconds=None 으로 읽는 스냅샷 등)
+_persistent_keys: Set[str] = set()
+
+def register_persistent_cache_key(cache_key: str):
+    """만료/용량 초과로 지우지 않을 캐시 키 등록 (sweeper 제외, Redis TTL 없음)"""
+    _persistent_keys.add(cache_key)
 
 def get_cache_filepath(cache_key: str) -> str:
-    """캐시 키에 해당하는 파일 경로를 반환합니다."""
-    return os.path.join(CACHE_DIR, f"{cache_key}.json")
+    """캐시 키에 해당하는 파일 경로를 반환합니다. (파일 캐시 백엔드 기준)"""
+    return FileCacheBackend().filepath(cache_key)
+
+def _cache_lock(cache_key: str, purpose: str) -> CacheLock:
+    """캐시 키별 프로세스/노드 간 락 (purpose: "write" 짧은 교체/삭제용, "fill" 캐시 채우기용)"""
+    return get_cache_backend().lock(cache_key, purpose, CACHE_LOCK_HOLD_SECONDS[purpose])
+
+# --- 캐시 백엔드 앞단의 프로세스 내 LRU (디코딩된 객체 보관, 백엔드 시그니처로 무효화) ---
+MEMORY_CACHE_MAX_ENTRIES = 256
+MEMORY_CACHE_STAT_INTERVAL = 1.0  # 이 간격(초) 안에서는 시그니처 확인 없이 메모리 값 사용
+
+# cache_key → (백엔드 시그니처, 마지막 확인 시각, 캐시 내용)
+_memory_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+def _remember(cache_key: str, signature, cache_content: Dict[str, Any]):
+    with _memory_cache_lock:
+        _memory_cache[cache_key] = (signature, time.monotonic(), cache_content)
+        _memory_cache.move_to_end(cache_key)
+        while len(_memory_cache) > MEMORY_CACHE_MAX_ENTRIES:
+            _memory_cache.popitem(last=False)
+
+def _forget(cache_key: str):
+    with _memory_cache_lock:
+        _memory_cache.pop(cache_key, None)
+
+def _load_cache_content(cache_key: str) -> Optional[Dict[str, Any]]:
+    """메모리 LRU → 캐시 백엔드 순서로 캐시 내용을 읽음 (값이 바뀌었으면 다시 디코딩)"""
+    backend = get_cache_backend()
+    with _memory_cache_lock:
+        entry = _memory_cache.get(cache_key)
+        if entry is not None:
+            _memory_cache.move_to_end(cache_key)
+
+    if entry is not None:
+        signature, checked_at, cache_content = entry
+        if time.monotonic() - checked_at < MEMORY_CACHE_STAT_INTERVAL:
+            return cache_content
+        current = backend.signature(cache_key)
+        if current is None:
+            _forget(cache_key)
+            return None
+        if current == signature:
+            _remember(cache_key, signature, cache_content)
+            return cache_content
+
+    stored = backend.read(cache_key)
+    if stored is None:
+        return None
+    signature, payload = stored
+    cache_content = cache_serializer.loads(payload)
+    _remember(cache_key, signature, cache_content)
+    return cache_content
+
+@contextmanager
+def cache_update_lock(cache_key: str):
+    """읽고-수정하고-쓰는 캐시 갱신을 워커/노드 간에 직렬화 (락 획득 후 메모리 값을 버려 최신 값을 읽게 함)"""
+    with _cache_lock(cache_key, "fill"):
+        _forget(cache_key)
+        yield
+
+_last_touched: Dict[str, float] = {}
+
+def _touch(cache_key: str):
+    """캐시 히트를 백엔드에 기록 (키별로 CACHE_ACCESS_TOUCH_INTERVAL에 한 번)"""
+    now = time.monotonic()
+    if now - _last_touched.get(cache_key, float("-inf")) < CACHE_ACCESS_TOUCH_INTERVAL:
+        return
+    if len(_last_touched) > MEMORY_CACHE_MAX_ENTRIES * 4:
+        _last_touched.clear()
+    _last_touched[cache_key] = now
+    get_cache_backend().touch(cache_key)
+
+def _memory_cache_signature(cache_key: str):
+    with _memory_cache_lock:
+        entry = _memory_cache.get(cache_key)
+    return entry[0] if entry is not None else None
 
 def set_cache(cache_key: str, data: Any):
-    """데이터를 JSON 파일로 캐시에 저장합니다."""
-    filepath = get_cache_filepath(cache_key)
+    """데이터를 캐시 백엔드에 저장합니다. (포맷은 utils.cache_serializer 설정을 따름)"""
     cache_content = {
         "timestamp": time.time(),
         "data": data
     }
+    retain_seconds = None if cache_key in _persistent_keys else CACHE_RETAIN_SECONDS
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(cache_content, f, ensure_ascii=False, indent=4)
+        signature = get_cache_backend().write(cache_key, cache_serializer.dumps(cache_content), retain_seconds)
+        _remember(cache_key, signature, cache_content)
         logger.info(f"💾 캐시 저장: {cache_key}")
     except Exception as e:
+        _forget(cache_key)
         logger.error(f"❌ 캐시 저장 실패 ({cache_key}): {e}")
 
-def get_cache(cache_key: str) -> Any:
-    """파일 캐시에서 데이터를 읽어옵니다."""
-    filepath = get_cache_filepath(cache_key)
-    if not os.path.exists(filepath):
-        return None
+def get_cache(cache_key: str, expiry_seconds: Optional[int] = CACHE_EXPIRY_SECONDS) -> Any:
+    """캐시에서 데이터를 읽어옵니다. (expiry_seconds=None 이면 만료 검사 생략)
 
+    반환값은 메모리 캐시와 공유되므로 수정하지 말고 필요하면 복사해서 사용하세요.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            cache_content = json.load(f)
+        cache_content = _load_cache_content(cache_key)
+        if cache_content is None:
+            return None
         
         # 캐시 유효기간 확인
         cache_age = time.time() - cache_content.get("timestamp", 0)
-        if cache_age > CACHE_EXPIRY_SECONDS:
+        if expiry_seconds is not None and cache_age > expiry_seconds:
             logger.info(f"⌛ 캐시 만료: {cache_key}")
-            os.remove(filepath)  # 만료된 캐시 파일 삭제
+            expired_signature = _memory_cache_signature(cache_key)
+            _forget(cache_key)
+            if expired_signature is not None:
+                # 그 사이 다른 워커/노드가 새로 쓴 값은 지우지 않음
+                get_cache_backend().delete(cache_key, expired_signature)
             return None
             
-        logger.info(f"⚡ 캐시 히트: {cache_key}")
+        logger.debug(f"⚡ 캐시 히트: {cache_key}")
+        _touch(cache_key)
         return cache_content.get("data")
-    except (IOError, json.JSONDecodeError) as e:
+    except (IOError, ValueError) as e:
+        _forget(cache_key)
         logger.error(f"❌ 캐시 읽기 실패 ({cache_key}): {e}")
         return None
 
+def get_cache_version(cache_key: str):
+    """현재 캐시 값의 버전(백엔드 시그니처) - 값이 바뀔 때만 달라지므로 응답 재사용/ETag 판단에 사용 (없으면 None)"""
+    try:
+        if _load_cache_content(cache_key) is None:
+            return None
+    except Exception as e:
+        logger.error(f"❌ 캐시 버전 확인 실패 ({cache_key}): {e}")
+        return None
+    return _memory_cache_signature(cache_key)
+
+def get_cache_entry(cache_key: str) -> Optional[Tuple[Any, float]]:
+    """만료 여부와 관계없이 (데이터, 경과 시간(초)) 반환 - 만료된 파일도 지우지 않음"""
+    try:
+        cache_content = _load_cache_content(cache_key)
+    except (IOError, ValueError) as e:
+        _forget(cache_key)
+        logger.error(f"❌ 캐시 읽기 실패 ({cache_key}): {e}")
+        return None
+    if cache_content is None:
+        return None
+    _touch(cache_key)
+    return cache_content.get("data"), time.time() - cache_content.get("timestamp", 0)
+
+# get_or_fill_cache 결과 상태
+CACHE_HIT = "hit"
+CACHE_STALE = "stale"  # 만료됐지만 최대 stale 시간 안이라 즉시 제공, 백그라운드 갱신 중
+CACHE_MISS = "miss"
+
+# 같은 프로세스 안에서 진행 중인 캐시 채우기 ((이벤트 루프, cache_key) → Task)
+_inflight_fills: Dict[tuple, "asyncio.Task"] = {}
+_background_refreshes: Dict[tuple, "asyncio.Task"] = {}
+
+def _fresh_cache_data(cache_key: str, expiry_seconds: Optional[int]):
+    _forget(cache_key)
+    entry = get_cache_entry(cache_key)
+    if entry is None or not entry[0]:
+        return None
+    data, age = entry
+    if expiry_seconds is not None and age > expiry_seconds:
+        return None
+    return data
+
+async def _acquire_lock(lock: CacheLock, timeout: float) -> bool:
+    """non-blocking 획득을 간격을 늘려가며 반복해 락 대기 (timeout 초과 시 False)
+
+    스레드에서 최대 timeout초 동안 블로킹하면 기다리는 요청 수만큼 기본 스레드 풀이 점유되므로,
+    스레드는 한 번의 시도에만 짧게 사용하고 대기는 이벤트 루프에서 합니다.
+    """
+    deadline = time.monotonic() + timeout
+    delay, max_delay = CACHE_LOCK_POLL_SECONDS
+    while True:
+        if await asyncio.to_thread(lock.acquire, 0):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+async def _fill_cache_exclusively(cache_key: str, fill: Callable[[], Awaitable[Any]], expiry_seconds: Optional[int],
+                                  background: bool = False) -> Optional[Tuple[Any, str]]:
+    lock = _cache_lock(cache_key, "fill")
+    # 백그라운드 갱신은 다른 워커가 이미 갱신 중이면 기다리지 않고 건너뜀
+    acquired = await _acquire_lock(lock, 0 if background else CACHE_FILL_WAIT_SECONDS)
+    if not acquired:
+        if background:
+            return None
+        logger.warning(f"⚠️ 캐시 채우기 대기 시간 초과, 직접 계산: {cache_key}")
+    try:
+        # 락을 기다리는 동안 다른 워커가 채웠을 수 있으므로 다시 확인
+        cached = _fresh_cache_data(cache_key, expiry_seconds)
+        if cached:
+            logger.info(f"⏳ 다른 워커가 채운 캐시 사용: {cache_key}")
+            return cached, CACHE_HIT
+        data = await fill()
+        set_cache(cache_key, data)
+        return data, CACHE_MISS
+    finally:
+        if acquired:
+            lock.release()
+
+def _log_background_refresh(cache_key: str, task: "asyncio.Task"):
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error(f"❌ 캐시 백그라운드 갱신 실패 ({cache_key}), 이전 값 유지: {error}")
+    elif task.result() is not None:
+        logger.info(f"🔄 캐시 백그라운드 갱신 완료: {cache_key}")
+
+def _revalidate_in_background(cache_key: str, fill: Callable[[], Awaitable[Any]], expiry_seconds: Optional[int]):
+    refresh_key = (asyncio.get_running_loop(), cache_key)
+    if refresh_key in _background_refreshes:
+        return
+    task = asyncio.ensure_future(_fill_cache_exclusively(cache_key, fill, expiry_seconds, background=True))
+    _background_refreshes[refresh_key] = task
+
+    def on_done(done: "asyncio.Task"):
+        _background_refreshes.pop(refresh_key, None)
+        _log_background_refresh(cache_key, done)
+
+    task.add_done_callback(on_done)
+
+async def get_or_fill_cache(cache_key: str, fill: Callable[[], Awaitable[Any]],
+                            expiry_seconds: Optional[int] = CACHE_EXPIRY_SECONDS,
+                            max_stale_seconds: Optional[int] = None) -> Tuple[Any, str]:
+    """캐시를 읽고, 없으면 fill()로 채워 저장 후 (데이터, CACHE_HIT/CACHE_STALE/CACHE_MISS) 반환
+
+    같은 키를 동시에 요청하면 프로세스 안에서는 하나의 Task를, 워커 간에는 파일 락을 기다려
+    비싼 계산(DeepSearch + GPT)을 한 번만 수행합니다. fill()이 예외를 던지면 기다리던 요청에도 전파됩니다.
+    max_stale_seconds를 주면 만료 후 그 시간까지는 이전 값을 바로 반환하고 백그라운드에서 한 번만 갱신합니다.
+    """
+    if max_stale_seconds is None:
+        cached = get_cache(cache_key, expiry_seconds)
+        if cached:
+            return cached, CACHE_HIT
+    else:
+        entry = get_cache_entry(cache_key)
+        if entry is not None and entry[0]:
+            data, age = entry
+            if expiry_seconds is None or age <= expiry_seconds:
+                return data, CACHE_HIT
+            if age <= expiry_seconds + max_stale_seconds:
+                _revalidate_in_background(cache_key, fill, expiry_seconds)
+                return data, CACHE_STALE
+            logger.info(f"⌛ 최대 stale 시간 초과, 새로 계산: {cache_key}")
+
+    inflight_key = (asyncio.get_running_loop(), cache_key)
+    task = _inflight_fills.get(inflight_key)
+    if task is None:
+        task = asyncio.ensure_future(_fill_cache_exclusively(cache_key, fill, expiry_seconds))
+        _inflight_fills[inflight_key] = task
+        task.add_done_callback(lambda _: _inflight_fills.pop(inflight_key, None))
+    else:
+        logger.info(f"⏳ 진행 중인 캐시 채우기 대기: {cache_key}")
+    # 한 요청이 끊겨도 다른 대기 요청을 위해 채우기는 계속 진행
+    return await asyncio.shield(task)
+
 # 기사 관련 유틸리티
 def generate_article_id(article: Dict[str, Any]) -> str:
     content = f"{article.get('title', '')}{article.get('url', '')}{article.get('published_at', '')}"
@@ -0,0 +1,43 @@
+import importlib
+import sys
+import threading
+from types import ModuleType
+
+# 앱 시작 시 로드되면 안 되는 무거운 의존성 (첫 사용 시점에 로드)
+HEAVY_MODULES = ("sentence_transformers", "torch", "transformers", "scipy", "sklearn", "selenium", "webdriver_manager")
+# `import main` 허용 시간 (tests/test_startup_budget.py에서 확인)
+STARTUP_IMPORT_BUDGET_SECONDS = 3.0
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 실제 모듈을 import 하는 대리 객체 (이후에는 캐시된 모듈 사용)"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """import 비용이 큰 모듈을 첫 사용 시점까지 미룸 (예: st = lazy_import("sentence_transformers"))"""
+    return LazyModule(name)
+
+
+def loaded_heavy_modules():
+    """현재 프로세스에 이미 로드된 무거운 의존성 목록"""
+    return sorted({name.split(".")[0] for name in sys.modules} & set(HEAVY_MODULES))
+
@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from core.config import (
+    LLM_USAGE_WINDOW_SECONDS,
+    LLM_USAGE_MAX_RECORDS,
+    LLM_PROMPT_COST_PER_1M,
+    LLM_CACHED_PROMPT_COST_PER_1M,
+    LLM_COMPLETION_COST_PER_1M,
+)
+
+logger = logging.getLogger(__name__)
+
+# 현재 요청의 ASGI scope (미들웨어에서 설정, 요청 밖에서는 None → background)
+current_request_scope: ContextVar[Optional[dict]] = ContextVar("current_request_scope", default=None)
+
+_records: deque = deque(maxlen=LLM_USAGE_MAX_RECORDS)
+_totals: Dict[tuple, Dict[str, Any]] = {}
+_lock = threading.Lock()
+_started_at = time.time()
+
+
+def get_current_endpoint() -> str:
+    """현재 요청의 라우트 경로 반환 (경로 파라미터는 템플릿 그대로)"""
+    scope = current_request_scope.get()
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> float:
+    """토큰 수를 기준으로 예상 비용(USD) 계산"""
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (
+        uncached * LLM_PROMPT_COST_PER_1M
+        + cached_tokens * LLM_CACHED_PROMPT_COST_PER_1M
+        + completion_tokens * LLM_COMPLETION_COST_PER_1M
+    ) / 1_000_000
+
+
+def record_usage(call_site: str, model: str, usage: Any, latency: float, success: bool = True):
+    """LLM 호출 한 건의 사용량을 기록"""
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) or 0
+
+    record = {
+        "timestamp": time.time(),
+        "endpoint": get_current_endpoint(),
+        "call_site": call_site,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
+        "latency": latency,
+        "cost": estimate_cost(prompt_tokens, completion_tokens, cached_tokens),
+        "success": success,
+    }
+
+    with _lock:
+        _records.append(record)
+        _accumulate(_totals, record)
+
+    logger.info(
+        f"🧾 LLM 사용량 [{record['endpoint']} / {call_site}] {model}: "
+        f"prompt={prompt_tokens} (cached={cached_tokens}), completion={completion_tokens}, {latency:.2f}s"
+    )
+
+
+def chat_completion(client, call_site: str, **kwargs):
+    """chat.completions.create 호출 래퍼 - 사용량/지연 시간을 call site별로 기록"""
+    model = kwargs.get("model") or ""
+    started = time.perf_counter()
+    try:
+        response = client.chat.completions.create(**kwargs)
+    except Exception:
+        record_usage(call_site, model, None, time.perf_counter() - started, success=False)
+        raise
+    record_usage(call_site, getattr(response, "model", None) or model, getattr(response, "usage", None), time.perf_counter() - started)
+    return response
+
+
+def _accumulate(bucket: Dict[tuple, Dict[str, Any]], record: Dict[str, Any]):
+    key = (record["endpoint"], record["call_site"])
+    entry = bucket.get(key)
+    if entry is None:
+        entry = bucket[key] = {
+            "endpoint": record["endpoint"],
+            "call_site": record["call_site"],
+            "models": set(),
+            "calls": 0,
+            "errors": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+            "cost": 0.0,
+        }
+    entry["models"].add(record["model"])
+    entry["calls"] += 1
+    entry["errors"] += 0 if record["success"] else 1
+    entry["prompt_tokens"] += record["prompt_tokens"]
+    entry["completion_tokens"] += record["completion_tokens"]
+    entry["cached_tokens"] += record["cached_tokens"]
+    entry["latency_total"] += record["latency"]
+    entry["latency_max"] = max(entry["latency_max"], record["latency"])
+    entry["cost"] += record["cost"]
+
+
+def _summarize(bucket: Dict[tuple, Dict[str, Any]]):
+    rows = []
+    for entry in bucket.values():
+        row = dict(entry)
+        row["models"] = sorted(m for m in entry["models"] if m)
+        row["avg_latency"] = round(entry["latency_total"] / entry["calls"], 3) if entry["calls"] else 0.0
+        row["latency_max"] = round(entry["latency_max"], 3)
+        row["cost"] = round(entry["cost"], 6)
+        del row["latency_total"]
+        rows.append(row)
+    rows.sort(key=lambda r: r["prompt_tokens"] + r["completion_tokens"], reverse=True)
+    return rows
+
+
+def get_usage_summary(window_seconds: Optional[int] = None) -> Dict[str, Any]:
+    """최근 구간(rolling window)과 서버 시작 이후 누적 사용량 집계"""
+    window = window_seconds or LLM_USAGE_WINDOW_SECONDS
+    cutoff = time.time() - window
+
+    with _lock:
+        recent: Dict[tuple, Dict[str, Any]] = {}
+        for record in _records:
+            if record["timestamp"] >= cutoff:
+                _accumulate(recent, record)
+        totals = _summarize(_totals)
+    recent_rows = _summarize(recent)
+
+    return {
+        "window_seconds": window,
+        "since": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(_started_at)),
+        "recent": recent_rows,
+        "totals": totals,
+    }
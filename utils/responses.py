@@ -0,0 +1,303 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+from core.config import (
+    RESPONSE_COMPRESSION_MIN_BYTES, RESPONSE_GZIP_LEVEL, RESPONSE_BROTLI_QUALITY,
+    PRECOMPRESSED_GZIP_LEVEL, PRECOMPRESSED_BROTLI_QUALITY,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# 압축해도 이득이 있는 텍스트 계열 Content-Type
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+PRECOMPRESSED_CACHE_MAX_ENTRIES = 64
+
+
+def dumps_json(content: Any) -> bytes:
+    """응답용 JSON 직렬화 (orjson 설치 시 사용, 표준 json과 같은 결과를 UTF-8 그대로 출력)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # orjson이 다루지 못하는 값(64비트 초과 정수 등)은 표준 json으로
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """프로젝트 기본 JSON 응답 (들여쓰기/ASCII 이스케이프 없이 빠르게 직렬화)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def choose_encoding(accept_encoding: str, available=("br", "gzip")) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (br 우선, q=0 은 제외)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = RESPONSE_GZIP_LEVEL,
+             brotli_quality: int = RESPONSE_BROTLI_QUALITY) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=RESPONSE_BROTLI_QUALITY)
+            self._process, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(RESPONSE_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip 헤더 포함
+            self._process, self._finish = self._compressor.compress, self._compressor.flush
+
+    def process(self, chunk: bytes) -> bytes:
+        return self._process(chunk)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """gzip/brotli 응답 압축 (ASGI 미들웨어)
+
+    minimum_size 미만의 본문, 이미 Content-Encoding이 있는 응답(미리 압축된 정적 페이지 등),
+    이미지 같은 비텍스트 응답은 그대로 보냅니다. 스트리밍 응답은 청크 단위로 압축합니다.
+    """
+
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if ("content-encoding" in headers or not _is_compressible(headers.get("content-type", ""))
+                        or (not more_body and len(body) < self.minimum_size)):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                compressor = _StreamCompressor(encoding)
+                await send(start_message)
+
+            chunk = compressor.process(body)
+            if not more_body:
+                chunk += compressor.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedBody:
+    """한 번 직렬화/압축해 둔 응답 본문 (요청마다 Accept-Encoding에 맞는 버전을 그대로 전송)
+
+    본문 해시로 강한 ETag를 만들고(압축 방식별로 구분), If-None-Match가 일치하면 본문 없이 304를 반환합니다.
+    weak_etag_seed를 주면 본문 대신 그 값으로 약한 ETag(W/)를 만듭니다 (캐시 적중 여부 같은 부가 필드만 다른 본문을 같은 표현으로 취급).
+    """
+
+    def __init__(self, body: bytes, media_type: str, weak_etag_seed: Optional[Hashable] = None):
+        self.media_type = media_type
+        self.weak = weak_etag_seed is not None
+        self.digest = hashlib.sha1(repr(weak_etag_seed).encode() if self.weak else body).hexdigest()[:20]
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+        if len(body) >= RESPONSE_COMPRESSION_MIN_BYTES:
+            self.variants["gzip"] = compress(body, "gzip", gzip_level=PRECOMPRESSED_GZIP_LEVEL)
+            if brotli is not None:
+                self.variants["br"] = compress(body, "br", brotli_quality=PRECOMPRESSED_BROTLI_QUALITY)
+
+    def etag(self, encoding: Optional[str]) -> str:
+        tag = f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+        return f"W/{tag}" if self.weak else tag
+
+    def response(self, request: Request, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""), available=self.variants)
+        etag = self.etag(encoding)
+        response_headers = {"Vary": "Accept-Encoding", **(headers or {}), "ETag": etag}
+        if status_code == 200 and etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=response_headers)
+        if encoding is not None:
+            response_headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], status_code=status_code, headers=response_headers,
+                        media_type=self.media_type)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (약한 비교: W/ 접두어 무시, "*"는 항상 일치)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+# 이름 → (버전, PrecompressedBody): 정적 페이지와 자주 조회되는 JSON을 메모리에서 바로 제공
+_precompressed: "OrderedDict[str, tuple]" = OrderedDict()
+_precompressed_lock = threading.Lock()
+
+
+def get_precompressed(name: str, version: Hashable, build: Callable[[], PrecompressedBody]) -> PrecompressedBody:
+    """version이 같으면 저장된 본문을 재사용하고, 바뀌었으면 build()로 다시 만듦"""
+    with _precompressed_lock:
+        entry = _precompressed.get(name)
+        if entry is not None and entry[0] == version:
+            _precompressed.move_to_end(name)
+            return entry[1]
+
+    body = build()
+    with _precompressed_lock:
+        _precompressed[name] = (version, body)
+        _precompressed.move_to_end(name)
+        while len(_precompressed) > PRECOMPRESSED_CACHE_MAX_ENTRIES:
+            _precompressed.popitem(last=False)
+    return body
+
+
+def cached_json_response(request: Request, name: str, version: Hashable, build_content: Callable[[], Any],
+                         status_code: int = 200, cache_control: Optional[str] = None,
+                         weak_etag_seed: Optional[Hashable] = None) -> Response:
+    """캐시 버전이 바뀔 때만 JSON 직렬화/압축을 수행하는 응답 (ETag 일치 시 304)"""
+    body = get_precompressed(
+        name, version, lambda: PrecompressedBody(dumps_json(build_content()), "application/json", weak_etag_seed)
+    )
+    headers = {"Cache-Control": cache_control} if cache_control else None
+    return body.response(request, status_code=status_code, headers=headers)
+
+
+def static_page_response(request: Request, path: str, media_type: str = "text/html; charset=utf-8") -> Response:
+    """정적 파일을 메모리에 압축해 두고 제공 (파일이 수정되면 다시 읽음)"""
+    stat = os.stat(path)
+
+    def build():
+        with open(path, "rb") as f:
+            return PrecompressedBody(f.read(), media_type)
+
+    body = get_precompressed(f"static:{path}", (stat.st_mtime_ns, stat.st_size), build)
+    return body.response(request, headers={"Cache-Control": "no-cache"})
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def bench(label, fn, runs=50):
+        started = time.perf_counter()
+        for _ in range(runs):
+            result = fn()
+        elapsed_ms = (time.perf_counter() - started) / runs * 1000
+        print(f"{label:<32} bytes={len(result):>9,} time={elapsed_ms:8.2f}ms")
+        return result
+
+    countries = ["KR", "US", "MX", "GB", "IN", "ZA", "AU"]
+    trending = {
+        "keywords": [
+            {"keyword": f"트렌딩 키워드 {i}", "country": random.choice(countries), "rank": i % 10 + 1, "is_shared": i % 7 == 0}
+            for i in range(5000)
+        ],
+        "updated_at": "2025-07-21 12:00:00",
+    }
+    articles = {
+        "articles": [
+            {"title": f"기사 제목 {i}", "url": f"https://news.example.com/{i}", "content": "인공지능 반도체 기술 동향 " * 80}
+            for i in range(100)
+        ]
+    }
+
+    for name, payload in (("trending", trending), ("articles", articles)):
+        print(f"--- {name}")
+        bench("stdlib JSONResponse", lambda: JSONResponse(payload).body)
+        raw = bench(f"FastJSONResponse ({'orjson' if orjson else 'stdlib'})", lambda: FastJSONResponse(payload).body)
+        bench(f"+ gzip (level {RESPONSE_GZIP_LEVEL})", lambda: compress(raw, "gzip"), runs=10)
+        if brotli is not None:
+            bench(f"+ br (quality {RESPONSE_BROTLI_QUALITY})", lambda: compress(raw, "br"), runs=10)
+        best = "br" if brotli is not None else "gzip"
+        get_precompressed(name, 1, lambda: PrecompressedBody(raw, "application/json"))
+        bench(f"precompressed {best} (memory hit)", lambda: get_precompressed(name, 1, None).variants[best])
+
+    if os.path.exists("analysis.html"):
+        print("--- analysis.html")
+        with open("analysis.html", "rb") as f:
+            page = f.read()
+        print(f"{'raw':<32} bytes={len(page):>9,}")
+        bench(f"gzip (level {PRECOMPRESSED_GZIP_LEVEL}, once)", lambda: compress(page, "gzip", gzip_level=PRECOMPRESSED_GZIP_LEVEL), runs=5)
+        if brotli is not None:
+            bench(f"br (quality {PRECOMPRESSED_BROTLI_QUALITY}, once)", lambda: compress(page, "br", brotli_quality=PRECOMPRESSED_BROTLI_QUALITY), runs=5)